@@ -19,6 +19,7 @@ from fastapi import Response
 from app.api.deps import get_current_user
 from datetime import datetime, timedelta, timezone
 from jose import jwt
+import asyncio
 import logging
 
 router = APIRouter()
@@ -57,7 +58,10 @@ async def signup(user_data: UserModel, db: AsyncSession = Depends(get_db)):
 
     new_user = User(
         email=user_data.email,
-        hashed_password=security.hash_password(user_data.password),
+        # bcrypt is deliberately slow; hash off the event loop
+        hashed_password=await asyncio.to_thread(
+            security.hash_password, user_data.password
+        ),
         full_name=user_data.full_name or "Unnamed User",
     )
     
@@ -81,8 +85,10 @@ async def login(user_data: UserModelForLogin, db: AsyncSession = Depends(get_db)
     # kinda like first() but async and returns None if not found
     user = result.scalar_one_or_none()
 
-    if not user or not security.verify_password(
-        user_data.password, user.hashed_password
+    # checkpw takes ~250ms at cost 12 and releases the GIL, so run it in a
+    # thread instead of stalling every other request on this worker
+    if not user or not await asyncio.to_thread(
+        security.verify_password, user_data.password, user.hashed_password
     ):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
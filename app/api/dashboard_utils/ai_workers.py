@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.deps import get_current_user
 from app.models.dashboard.ai_workers import AIWorkersResponse
@@ -10,7 +10,7 @@ import time
 
 from datetime import datetime, timezone, date
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 WORKER_ONLINE_THRESHOLD_SECONDS = 120
 
@@ -32,12 +32,32 @@ from app.api.dashboard_utils.utils.get_queue_depth import get_queue_depth
 async def get_worker_status(
     db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)  #  #
 ):
-    result = await db.execute(select(AIWorkerState))
-    worker_records = result.scalars().all()
+    # Project only the columns the response needs instead of hydrating ORM rows
+    result = await db.execute(
+        select(
+            AIWorkerState.name,
+            AIWorkerState.status,
+            AIWorkerState.tasks_processed_today,
+            AIWorkerState.last_ping,
+        )
+    )
+    worker_records = result.all()
+
+    # One query for every worker's in-flight task instead of one per worker
+    task_result = await db.execute(
+        select(Media.assigned_worker, Media.id, Media.status).where(
+            Media.assigned_worker.isnot(None),
+            Media.status.in_([MediaStatus.EXTRACTING, MediaStatus.PROCESSING]),
+        )
+    )
+    current_tasks = {}
+    for task in task_result.all():
+        current_tasks.setdefault(task.assigned_worker, task)
 
     nodes = []
     active_count = 0
     working_count = 0
+    now = datetime.now(timezone.utc)
 
     for worker in worker_records:
         last_ping = worker.last_ping
@@ -47,7 +67,7 @@ async def get_worker_status(
             if last_ping.tzinfo is None:
                 last_ping = last_ping.replace(tzinfo=timezone.utc)
             is_online = (
-                datetime.now(timezone.utc) - last_ping
+                now - last_ping
             ).total_seconds() < WORKER_ONLINE_THRESHOLD_SECONDS
         status_label = worker.status if is_online else "Offline"
 
@@ -56,13 +76,7 @@ async def get_worker_status(
         if status_label == "Working":
             working_count += 1
 
-        worker_tasks = await db.execute(
-            select(Media).where(
-                Media.assigned_worker == worker.name,
-                Media.status.in_([MediaStatus.EXTRACTING, MediaStatus.PROCESSING]),
-            )
-        )
-        current_task = worker_tasks.scalars().first()
+        current_task = current_tasks.get(worker.name)
 
         nodes.append(
             {
@@ -85,5 +99,5 @@ async def get_worker_status(
         ),
         "nodes": nodes,
         "queue_depth": await get_queue_depth(db),  #
-        "last_updated": datetime.now(timezone.utc).isoformat(),
+        "last_updated": now.isoformat(),
     }
@@ -5,7 +5,7 @@ import time
 
 import psutil
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.deps import get_current_user
 from app.models.dashboard.system_health import SystemHealthResponse
@@ -163,7 +163,7 @@ async def get_system_health(current_user=Depends(get_current_user)):
     else:
         system_status = "ACTIVE"
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "uptime": get_uptime_sla_percent(),
             "uptime_formatted": get_formatted_uptime(),
@@ -1,8 +1,11 @@
 from app.models.db.Media import Media
-from sqlalchemy import select
+from sqlalchemy import select, func
 
 
 async def get_queue_depth(db):
-    result = await db.execute(select(Media).where(Media.status == "UPLOADED"))
-    queue_depth = len(result.scalars().all())
-    return int(queue_depth)
\ No newline at end of file
+    # COUNT in SQL instead of hydrating (and selectin-loading) every queued Media
+    result = await db.execute(
+        select(func.count()).select_from(Media).where(Media.status == "UPLOADED")
+    )
+    queue_depth = result.scalar() or 0
+    return int(queue_depth)
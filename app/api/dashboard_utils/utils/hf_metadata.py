@@ -1,9 +1,27 @@
 import os
+import logging
 from huggingface_hub import hf_hub_download
 import asyncio
-from app.api.upload_utils.metadata_extractor import extract_media_metadata, get_address_from_coords
+from sqlalchemy import update, case, cast, func, literal_column, JSON, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.api.upload_utils.metadata_extractor import (
+    extract_media_metadata,
+    get_address_from_coords,
+    get_cached_address,
+)
+from app.database import AsyncSessionLocal
 from app.models.db.Media import Media
 
+logger = logging.getLogger(__name__)
+
+# Reverse geocoding runs in the background: Nominatim allows one request per
+# second, so awaiting it would hold the worker for at least that long per image.
+# Pending lookups are awaited on shutdown (drain_address_lookups).
+_address_tasks: set[asyncio.Task] = set()
+# How long shutdown waits for pending lookups
+ADDRESS_LOOKUP_DRAIN_SECONDS = 10
+
+
 async def extract_metadata_from_hf(media_task: Media) -> dict:
     hf_repo_id = os.getenv("HF_REPO_ID")
     hf_token = os.getenv("HF_TOKEN")
@@ -20,16 +38,89 @@ async def extract_metadata_from_hf(media_task: Media) -> dict:
         token=hf_token,
     )
     try:
-        with open(local_file_path, "rb") as file_handle:
-            file_bytes = file_handle.read()
-        technical_meta = await asyncio.to_thread(extract_media_metadata, file_bytes)
+        technical_meta = await asyncio.to_thread(
+            extract_media_metadata, local_file_path
+        )
         gps_data = technical_meta.get("gps")
         if isinstance(gps_data, dict):
             lat = gps_data.get("lat")
             lng = gps_data.get("lng")
             if lat is not None and lng is not None:
-                gps_data["address"] = await get_address_from_coords(lat, lng)
+                gps_data["address"] = get_cached_address(lat, lng)
         return technical_meta
     finally:
         if local_file_path and os.path.exists(local_file_path):
             os.remove(local_file_path)
+
+
+def schedule_address_lookup(media_id, technical_meta: dict) -> None:
+    """
+    Start a background reverse-geocode for media whose GPS address was not
+    cached. Call it after technical_meta is committed: the lookup patches
+    the stored gps.address in place rather than rewriting the metadata.
+    """
+    gps_data = technical_meta.get("gps")
+    if not isinstance(gps_data, dict) or gps_data.get("address") is not None:
+        return
+    lat = gps_data.get("lat")
+    lng = gps_data.get("lng")
+    if lat is None or lng is None:
+        return
+    task = asyncio.create_task(_store_address(media_id, lat, lng))
+    _address_tasks.add(task)
+    task.add_done_callback(_address_tasks.discard)
+
+
+async def drain_address_lookups(timeout: float = ADDRESS_LOOKUP_DRAIN_SECONDS) -> None:
+    """Wait (up to timeout) for pending lookups so shutdown doesn't drop them."""
+    if not _address_tasks:
+        return
+    _, pending = await asyncio.wait(set(_address_tasks), timeout=timeout)
+    if pending:
+        logger.warning(
+            "%d address lookups still pending at shutdown; cancelling", len(pending)
+        )
+        for task in pending:
+            task.cancel()
+
+
+# technical_metadata with gps.address set, when gps is an object
+def _with_gps_address(address: str):
+    metadata = cast(Media.technical_metadata, JSONB)
+    return case(
+        (
+            func.jsonb_typeof(metadata["gps"]) == "object",
+            cast(
+                func.jsonb_set(
+                    metadata,
+                    literal_column("'{gps,address}'"),
+                    func.to_jsonb(cast(address, Text)),
+                ),
+                JSON,
+            ),
+        ),
+        else_=Media.technical_metadata,
+    )
+
+
+async def _store_address(media_id, lat, lng) -> None:
+    """
+    Look up the address for a media's coordinates and write it to
+    Media.address and technical_metadata.gps.address.
+    """
+    try:
+        address = await get_address_from_coords(lat, lng)
+        if address is None:
+            return
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Media)
+                .where(Media.id == media_id)
+                .values(
+                    address=address,
+                    technical_metadata=_with_gps_address(address),
+                )
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning("Failed to store address for %s: %s", media_id, e)
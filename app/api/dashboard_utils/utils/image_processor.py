@@ -13,7 +13,7 @@ from app.models.upload.MediaStatus import MediaStatus
 from app.models.db.AIWorker import AIWorkerState
 from app.database import AsyncSessionLocal
 from sqlalchemy import update, select
-from .hf_metadata import extract_metadata_from_hf
+from .hf_metadata import extract_metadata_from_hf, schedule_address_lookup
 import asyncio
 from app.api.ai_client import get_real_detections
 
@@ -40,6 +40,7 @@ async def process_image_media(media_task, name, uploader_id):
                 "Extracted EXIF and GPS data",
             )
             await session.commit()
+        schedule_address_lookup(media_task_id, technical_meta)
     except Exception as e:
         print(f"Extraction Error for {media_task_id}: {e}")
         extraction_failed_reason = "Unable to read image metadata or GPS data. Please ensure the file is a valid image."
@@ -124,6 +125,11 @@ async def process_image_media(media_task, name, uploader_id):
             )
             return False
 
+        # Reload the metadata under a row lock before updating it: a
+        # background address lookup may have patched gps.address while the
+        # detections were running, and it now waits for this commit
+        await session.refresh(task, ["technical_metadata"], with_for_update=True)
+
         if detections:
             orig_w = task.initial_metadata.get("width")
             orig_h = task.initial_metadata.get("height")
@@ -179,6 +185,12 @@ async def process_image_media(media_task, name, uploader_id):
         add_status_log(session, task.id, MediaStatus.READY, name)
         await session.commit()
 
+    # READY media and its detections feed the footprint/MTTP KPIs and the summary.
+    # Imported here: stats_utils imports the worker fleet, which imports this module
+    from app.api.stats_utils.cache import invalidate_user_stats
+
+    await invalidate_user_stats(str(uploader_id))
+
     await manager.send_status(
         user_id=str(uploader_id),
         media_id=str(media_task_id),
@@ -51,11 +51,11 @@ def build_metadata_update(technical_meta):
             update_values["lat"] = lat
             update_values["lng"] = lng
             update_values["altitude"] = gps_data.get("altitude")
-            update_values["address"] = gps_data.get("address")
-            if lat is not None and lng is not None:
-                update_values["location"] = func.ST_SetSRID(
-                    func.ST_MakePoint(lng, lat), 4326
-                )
+            # Without a cached address the lookup finishes in the background
+            # and writes Media.address itself; don't overwrite it with None
+            if gps_data.get("address") is not None:
+                update_values["address"] = gps_data["address"]
+            # location follows lat/lng via the media_sync_location trigger
     return update_values
 
 
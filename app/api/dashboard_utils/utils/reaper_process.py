@@ -7,7 +7,7 @@ from app.models.db.Media import Media
 from app.models.db.MediaLog import MediaLog
 from app.models.db.AIWorker import AIWorkerState
 from app.models.upload.MediaStatus import MediaStatus
-from app.api.upload_utils.conn_manager import worker_signal, manager
+from app.api.upload_utils.conn_manager import wake_workers, manager
 
 REAPER_SLEEP_SECONDS = 600
 RATE_LIMIT_BACKOFF_SECONDS = 300
@@ -76,9 +76,7 @@ async def ai_reaper_process():
                     )
                 )
 
-                if stale_uploaded.scalars().first():
-                    async with worker_signal:
-                        worker_signal.notify_all()
+                await wake_workers(len(stale_uploaded.scalars().all()))
 
                 stale_pending_query = await session.execute(
                     select(Media).where(
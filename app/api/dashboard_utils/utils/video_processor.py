@@ -50,22 +50,20 @@ async def process_video_media(
     HF_TOKEN = os.getenv("HF_TOKEN")
 
     try:
-
-        def download_from_hf():
-            if HF_REPO_ID is None:
-                raise ValueError("HF_REPO_ID environment variable is not set.")
-            if not hf_full_video_path:
-                raise ValueError("hf_full_video_path is missing in tech_metadata.")
-            return hf_hub_download(
-                repo_id=HF_REPO_ID,
-                filename=hf_full_video_path,
-                repo_type="dataset",
-                token=HF_TOKEN,
-                local_dir=tempfile.gettempdir(),  # Saves to /tmp/media/user_id/...
-            )
+        if HF_REPO_ID is None:
+            raise ValueError("HF_REPO_ID environment variable is not set.")
+        if not hf_full_video_path:
+            raise ValueError("hf_full_video_path is missing in tech_metadata.")
 
         logger.info(f"Worker downloading video from HF: {hf_full_video_path}")
-        local_video_path = await asyncio.to_thread(download_from_hf)
+        local_video_path = await asyncio.to_thread(
+            hf_hub_download,
+            repo_id=HF_REPO_ID,
+            filename=hf_full_video_path,
+            repo_type="dataset",
+            token=HF_TOKEN,
+            local_dir=tempfile.gettempdir(),  # Saves to /tmp/media/user_id/...
+        )
 
         date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
@@ -270,7 +268,7 @@ async def process_video_media(
 
                 current_frame_idx += frame_step
 
-            await asyncio.to_thread(lambda c: c.release(), cap)
+            await asyncio.to_thread(cap.release)
 
             if frames_to_upload:
                 upload_success = await upload_video_frames_to_hf(
@@ -304,6 +302,12 @@ async def process_video_media(
             session.add(create_status_change_log(media.id, MediaStatus.READY))
             await session.commit()
 
+            # New video detections and a READY status change the user's stats
+            # (imported here to avoid a cycle via stats_utils -> worker fleet)
+            from app.api.stats_utils.cache import invalidate_user_stats
+
+            await invalidate_user_stats(str(user_id))
+
             await manager.send_status(user_id, str(media_id), "READY")
 
     except Exception as e:
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.deps import get_current_user
 from app.models.dashboard.ux import UXResponse
@@ -7,10 +7,12 @@ from app.database import AsyncSessionLocal
 from app.core.security import SECRET_KEY, ALGORITHM
 from app.models.db.User import User
 
+import asyncio
 import time
 from datetime import datetime, timezone
 
 from collections import deque
+from cachetools import TTLCache
 from fastapi import Request
 from jose import JWTError, jwt
 from sqlalchemy import select
@@ -31,6 +33,15 @@ current_day = datetime.now(timezone.utc).date()
 ACTIVE_USER_TTL_SECONDS = 300
 TREND_UPDATE_INTERVAL_SECONDS = 60
 
+# access_token cookie -> user id, so a user's repeat requests skip the JWT
+# decode and the users lookup; a token maps to one user for its lifetime
+USER_ID_CACHE_MAX_ENTRIES = 10_000
+_user_id_by_token: TTLCache = TTLCache(
+    maxsize=USER_ID_CACHE_MAX_ENTRIES, ttl=ACTIVE_USER_TTL_SECONDS
+)
+# Lookups started by the middleware; kept referenced until they finish
+_pending_lookups: set[asyncio.Task] = set()
+
 
 def update_metrics():
     """Update trend history and daily metrics."""
@@ -69,11 +80,7 @@ def update_active_users(user_id: str):
     update_metrics()
 
 
-async def get_user_id_from_request(request: Request) -> Optional[str]:
-    token = request.cookies.get("access_token")
-    if not token:
-        return None
-
+async def get_user_id_from_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(token, SECRET_KEY or "", algorithms=[ALGORITHM])
         email: str = payload.get("sub") or ""
@@ -87,18 +94,33 @@ async def get_user_id_from_request(request: Request) -> Optional[str]:
         return result.scalar_one_or_none()
 
 
-async def track_ux_metrics(request: Request, call_next):
-    start_time = time.time()
-
-    user_id = await get_user_id_from_request(request)
+async def _record_active_token(token: str):
+    user_id = await get_user_id_from_token(token)
     if user_id:
+        _user_id_by_token[token] = user_id
         update_active_users(user_id)
 
+
+async def track_ux_metrics(request: Request, call_next):
+    start_time = time.perf_counter()
+
     response = await call_next(request)
 
-    duration_ms = (time.time() - start_time) * 1000
+    duration_ms = (time.perf_counter() - start_time) * 1000
     response_times.append(duration_ms)
 
+    # Active-user tracking stays off the request path: known tokens are a
+    # dict hit, unknown ones are resolved by a task after the response
+    token = request.cookies.get("access_token")
+    if token:
+        user_id = _user_id_by_token.get(token)
+        if user_id:
+            update_active_users(user_id)
+        else:
+            task = asyncio.create_task(_record_active_token(token))
+            _pending_lookups.add(task)
+            task.add_done_callback(_pending_lookups.discard)
+
     return response
 
 
@@ -114,7 +136,7 @@ async def user_experience(current_user=Depends(get_current_user)):
     # Ensure metrics are up to date
     update_metrics()
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "active_now": len(active_users),
             "active_trend": list(active_trend_history),
@@ -38,7 +38,7 @@ def _serialize_media(media: Media) -> dict:
     return {
         "id": str(media.id),
         "uploader_id": media.uploader_id,
-        "status": media.status.value,
+        "status": media.status,
         "hf_path": media.hf_path,
         "initial_metadata": media.initial_metadata,
         "technical_metadata": media.technical_metadata,
@@ -270,13 +270,8 @@ async def patch_media(
             if should_refresh_address:
                 media.address = await get_address_from_coords(new_lat, new_lng)
 
-    # Keep PostGIS geometry in sync even when address is manually provided.
-    if (
-        (patch_data.lat is not None or patch_data.lng is not None)
-        and media.lat is not None
-        and media.lng is not None
-    ):
-        media.location = func.ST_SetSRID(func.ST_MakePoint(media.lng, media.lat), 4326)
+    # media.location is recomputed from lat/lng by the media_sync_location
+    # trigger and read back on flush
 
     if patch_data.detections is not None:
         # build a set of new detection signatures (label + bbox) for matching
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case, and_, desc
 from sqlalchemy.orm import selectinload
@@ -11,7 +11,8 @@ from geoalchemy2.functions import (
     ST_SnapToGrid,
 )
 from typing import Optional
-from time import monotonic
+import orjson
+from cachetools import TTLCache
 
 from app.database import get_db
 from app.api.deps import get_current_user
@@ -20,13 +21,26 @@ from app.models.db.VideoDetection import VideoDetection
 from app.models.db.MediaLog import MediaLog
 from app.models.db.Detection import Detection
 from app.models.map.MapResponse import MapLogsResponse, MapResponse, MapStatsResponse
+from app.api.stats_utils.cache import (
+    REDIS_URL,
+    get_cached_kpi,
+    cache_kpi_bytes,
+    stats_generation,
+)
 from collections import defaultdict
 
 
 router = APIRouter()
 
 STATS_CACHE_TTL_SECONDS = 60
-_map_stats_cache: dict[tuple, tuple[float, dict]] = {}
+STATS_CACHE_MAX_ENTRIES = 1000
+# Holds the encoded JSON body, so cache hits skip validation and encoding.
+# With REDIS_URL the per-KPI Redis cache is used instead (shared by every
+# app worker and dropped with the user's other stats on upload); this
+# bounded in-process cache is the fallback.
+_map_stats_cache: TTLCache = TTLCache(
+    maxsize=STATS_CACHE_MAX_ENTRIES, ttl=STATS_CACHE_TTL_SECONDS
+)
 
 
 @router.get(
@@ -95,7 +109,7 @@ async def get_map_data(
                 "id": str(v.id),
                 "media_id": str(v.media_id),
                 "filename": v.media.initial_metadata.get("filename"),
-                "status": v.media.status.value,
+                "status": v.media.status,
                 "worker_name": v.media.assigned_worker,
                 "lat": extract_coords(v)[0],
                 "lng": extract_coords(v)[1],
@@ -113,14 +127,14 @@ async def get_map_data(
             key=lambda x: x["timestamp_in_video"] if "timestamp_in_video" in x else 0
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "total": len(image_records) + len(video_records),
             "items": [
                 {
                     "id": str(m.id),
                     "filename": m.initial_metadata.get("filename"),
-                    "status": m.status.value,
+                    "status": m.status,
                     "worker_name": m.assigned_worker,
                     "lat": extract_coords(m)[0],
                     "lng": extract_coords(m)[1],
@@ -147,6 +161,33 @@ async def get_map_data(
     )
 
 
+def _map_stats_kind(cache_key: tuple) -> str:
+    # KPI cache kind for the bbox/resolution part of the key
+    return "map-stats:" + ":".join(str(part) for part in cache_key[1:])
+
+
+async def _get_map_stats(cache_key: tuple, generation: int) -> bytes | None:
+    if REDIS_URL:
+        return await get_cached_kpi(
+            _map_stats_kind(cache_key), cache_key[0], generation=generation
+        )
+    return _map_stats_cache.get((*cache_key, generation))
+
+
+async def _store_map_stats(
+    cache_key: tuple, generation: int, response_bytes: bytes
+) -> None:
+    if REDIS_URL:
+        await cache_kpi_bytes(
+            _map_stats_kind(cache_key),
+            cache_key[0],
+            response_bytes,
+            generation=generation,
+        )
+    else:
+        _map_stats_cache[(*cache_key, generation)] = response_bytes
+
+
 @router.get(
     "/map/stats",
     status_code=status.HTTP_200_OK,
@@ -178,10 +219,10 @@ async def get_map_stats(
         round(resolution, 6),
     )
 
-    cached = _map_stats_cache.get(cache_key)
-    now = monotonic()
-    if cached and now - cached[0] <= STATS_CACHE_TTL_SECONDS:
-        return cached[1]
+    generation = await stats_generation(cache_key[0])
+    cached = await _get_map_stats(cache_key, generation)
+    if cached:
+        return Response(content=cached, media_type="application/json")
 
     # Use ST_SnapToGrid for efficient grid cell bucketing with PostGIS
     # This snaps each point to a grid and extracts the cell coordinates
@@ -291,15 +332,14 @@ async def get_map_stats(
     # Shape API payload and normalize numeric values for stable frontend rendering.
     # density is report concentration per square-degree cell area:
     # count / (resolution^2). This remains meaningful after excluding non-trash media.
+    cell_area = resolution * resolution
     response_payload = {
         "total": len(rows),
         "items": [
             {
                 "lat": float(row.cell_lat),
                 "lng": float(row.cell_lng),
-                "density": round(
-                    float((row.total_reports or 0) / (resolution * resolution)), 2
-                ),
+                "density": round((row.total_reports or 0) / cell_area, 2),
                 "count": int(row.total_reports or 0),
                 "confidence": round(float(row.avg_confidence or 0.0), 2),
                 "label": row.label,
@@ -309,8 +349,9 @@ async def get_map_stats(
     }
 
     # Store in short-lived in-memory cache to reduce repeated aggregate scans.
-    _map_stats_cache[cache_key] = (now, response_payload)
-    return response_payload
+    response_bytes = orjson.dumps(response_payload)
+    await _store_map_stats(cache_key, generation, response_bytes)
+    return Response(content=response_bytes, media_type="application/json")
 
 
 @router.get(
@@ -336,26 +377,25 @@ async def get_map_item_logs(
             detail="Media not found",
         )
 
+    # Only the MapMediaLog columns; orjson writes the aware timestamps as
+    # ISO 8601 itself, so no per-row isoformat()
     logs_query = (
-        select(MediaLog)
+        select(
+            MediaLog.action,
+            MediaLog.message,
+            MediaLog.worker_name,
+            MediaLog.timestamp,
+        )
         .where(MediaLog.media_id == media_id)
         .order_by(MediaLog.timestamp)
     )
     logs_result = await db.execute(logs_query)
-    logs = logs_result.scalars().all()
+    history = [dict(row) for row in logs_result.mappings()]
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "media_id": str(media_id),
-            "total": len(logs),
-            "history": [
-                {
-                    "action": log.action,
-                    "message": log.message,
-                    "worker_name": log.worker_name,
-                    "timestamp": log.timestamp.isoformat(),
-                }
-                for log in logs
-            ],
+            "total": len(history),
+            "history": history,
         }
     )
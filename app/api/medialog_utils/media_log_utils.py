@@ -1,5 +1,4 @@
 import uuid
-from datetime import datetime, timezone
 
 from app.models.db.MediaLog import MediaLog
 from app.models.upload.MediaStatus import MediaStatus
@@ -18,20 +17,34 @@ def get_failed_reason_or_default(failed_reason: str | None) -> str:
     return DEFAULT_FAILED_REASON
 
 
-def create_status_change_log(
+def status_change_log_values(
     media_id: uuid.UUID,
     status: MediaStatus,
     worker_name: str | None = None,
     detail: str | None = None,
-) -> MediaLog:
+) -> dict:
+    """
+    Column values for a STATUS_CHANGE MediaLog row.
+    Use with a bulk insert(MediaLog) when logging many rows at once.
+    """
     message = f"Status changed to {status.value}"
     if detail:
         message = f"{message} ({detail})"
 
+    return {
+        "media_id": media_id,
+        "worker_name": worker_name,
+        "action": "STATUS_CHANGE",
+        "message": message,
+    }
+
+
+def create_status_change_log(
+    media_id: uuid.UUID,
+    status: MediaStatus,
+    worker_name: str | None = None,
+    detail: str | None = None,
+) -> MediaLog:
     return MediaLog(
-        media_id=media_id,
-        worker_name=worker_name,
-        action="STATUS_CHANGE",
-        message=message,
-        timestamp=datetime.now(timezone.utc),
+        **status_change_log_values(media_id, status, worker_name, detail)
     )
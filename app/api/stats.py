@@ -1,10 +1,11 @@
 import asyncio
+import logging
 
 from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db_ro, AsyncSessionLocalRO
 from app.api.deps import get_current_user
 from app.models.stats import (
     StatsSummaryResponse,
@@ -19,6 +20,9 @@ from app.models.stats import (
 from app.api.stats_utils import (
     get_cached_stats,
     cache_stats,
+    get_cached_kpi,
+    cache_kpi,
+    stats_generation,
     get_trash_composition,
     get_environmental_footprint,
     get_ai_fleet_efficiency,
@@ -30,21 +34,85 @@ from app.api.stats_utils import (
     create_excel_file,
     create_pdf_report,
 )
+from app.api.stats_utils.isolated_query import run_isolated
 
-router = APIRouter()
+# FastAPI serializes the declared response_model once, encoded with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
+
+logger = logging.getLogger(__name__)
+
+# Summary computations currently running, keyed by (user_id, days)
+_inflight_summaries: dict[tuple, asyncio.Task] = {}
+# KPI cache-miss computations currently running, keyed by (kind, user_id, days)
+_inflight_kpis: dict[tuple, asyncio.Task] = {}
+
+
+async def _single_flight(
+    inflight: dict[tuple, asyncio.Task], key: tuple, compute
+):
+    """
+    Run compute() once per key even under concurrent callers.
+
+    The computation runs in its own task, so it must not use a request's
+    session (callers pass builds that open their own). Every caller,
+    including the first, awaits it through shield: a client that
+    disconnects cancels only its own wait, never the shared computation
+    the other callers are waiting for.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(compute())
+        inflight[key] = task
+        task.add_done_callback(lambda done: _finish_flight(inflight, key, done))
+    return await asyncio.shield(task)
+
+
+def _finish_flight(inflight: dict[tuple, asyncio.Task], key: tuple, task) -> None:
+    if inflight.get(key) is task:
+        del inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved even if every waiter went away
 
 
 # ==============================================================================
 # INDIVIDUAL KPI ENDPOINTS
 # ==============================================================================
 
+async def _cached_kpi_response(kind: str, user_id, build, days: int | None = None):
+    """
+    Serve a KPI endpoint through the short-TTL per-KPI cache.
+
+    Cache hits return the stored JSON bytes as-is; on a miss `build()` runs
+    the KPI and its response model is cached and returned. Concurrent misses
+    for the same KPI (e.g. a second dashboard tab) share one `build()`,
+    which runs detached from the request and so queries on its own session.
+    """
+    generation = await stats_generation(str(user_id))
+    cached_response = await get_cached_kpi(
+        kind, str(user_id), days, generation=generation
+    )
+    if cached_response is not None:
+        return Response(content=cached_response, media_type="application/json")
+
+    async def build_and_cache():
+        response = await build()
+        await cache_kpi(kind, str(user_id), response, days, generation=generation)
+        return response
+
+    # Keyed by generation too: a miss after an upload must not join a build
+    # that started on the data from before it
+    return await _single_flight(
+        _inflight_kpis, (kind, str(user_id), days, generation), build_and_cache
+    )
+
+
 @router.get(
     "/stats/trash-composition",
     status_code=status.HTTP_200_OK,
     response_model=TrashCompositionResponse,
 )
 async def get_trash_composition_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -59,11 +127,12 @@ async def get_trash_composition_endpoint(
             "total_detections": 330
         }
     """
-    items = await get_trash_composition(db, current_user.id)
-    total = sum(item.count for item in items)
-    
-    response = TrashCompositionResponse(items=items, total_detections=total)
-    return JSONResponse(content=response.model_dump(mode='json'))
+    async def build():
+        items = await run_isolated(db, get_trash_composition, current_user.id)
+        total = sum(item.count for item in items)
+        return TrashCompositionResponse(items=items, total_detections=total)
+
+    return await _cached_kpi_response("composition", current_user.id, build)
 
 
 @router.get(
@@ -72,7 +141,7 @@ async def get_trash_composition_endpoint(
     response_model=EnvironmentalFootprint,
 )
 async def get_environmental_footprint_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -87,8 +156,11 @@ async def get_environmental_footprint_endpoint(
             "total_detections": 330
         }
     """
-    footprint = await get_environmental_footprint(db, current_user.id)
-    return JSONResponse(content=footprint.model_dump(mode='json'))
+    return await _cached_kpi_response(
+        "footprint",
+        current_user.id,
+        lambda: run_isolated(db, get_environmental_footprint, current_user.id),
+    )
 
 
 @router.get(
@@ -97,7 +169,7 @@ async def get_environmental_footprint_endpoint(
     response_model=AIFleetEfficiency,
 )
 async def get_ai_fleet_efficiency_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -114,8 +186,11 @@ async def get_ai_fleet_efficiency_endpoint(
             "total_failures": 23
         }
     """
-    efficiency = await get_ai_fleet_efficiency(db, current_user.id)
-    return JSONResponse(content=efficiency.model_dump(mode='json'))
+    return await _cached_kpi_response(
+        "fleet",
+        current_user.id,
+        lambda: run_isolated(db, get_ai_fleet_efficiency, current_user.id),
+    )
 
 
 @router.get(
@@ -125,7 +200,7 @@ async def get_ai_fleet_efficiency_endpoint(
 )
 async def get_temporal_trends_endpoint(
     days: int = Query(default=7, ge=1, le=365, description="Time window in days"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -143,9 +218,11 @@ async def get_temporal_trends_endpoint(
             "days_window": 7
         }
     """
-    trends = await get_temporal_trends(db, current_user.id, days)
-    response = TemporalTrendsResponse(trends=trends, days_window=days)
-    return JSONResponse(content=response.model_dump(mode='json'))
+    async def build():
+        trends = await run_isolated(db, get_temporal_trends, current_user.id, days)
+        return TemporalTrendsResponse(trends=trends, days_window=days)
+
+    return await _cached_kpi_response("trends", current_user.id, build, days)
 
 
 @router.get(
@@ -154,7 +231,7 @@ async def get_temporal_trends_endpoint(
     response_model=MeanTimeToProcess,
 )
 async def get_mean_time_to_process_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -169,8 +246,11 @@ async def get_mean_time_to_process_endpoint(
             "by_worker": [{"worker_name": "Helios", "avg_processing_seconds": 42.3, "task_count": 50}, ...]
         }
     """
-    mttp = await get_mean_time_to_process(db, current_user.id)
-    return JSONResponse(content=mttp.model_dump(mode='json'))
+    return await _cached_kpi_response(
+        "mttp",
+        current_user.id,
+        lambda: run_isolated(db, get_mean_time_to_process, current_user.id),
+    )
 
 
 @router.get(
@@ -179,7 +259,7 @@ async def get_mean_time_to_process_endpoint(
     response_model=HotspotDensity,
 )
 async def get_hotspot_density_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -194,8 +274,100 @@ async def get_hotspot_density_endpoint(
             "high_confidence_media_count": 45
         }
     """
-    density = await get_hotspot_density(db, current_user.id)
-    return JSONResponse(content=density.model_dump(mode='json'))
+    return await _cached_kpi_response(
+        "hotspot",
+        current_user.id,
+        lambda: run_isolated(db, get_hotspot_density, current_user.id),
+    )
+
+
+# ==============================================================================
+# SUMMARY HELPERS
+# ==============================================================================
+
+
+async def _build_summary_bytes(
+    db: AsyncSession, user_id: str, days: int, generation: int
+) -> bytes:
+    """
+    Run all 6 KPIs, cache the JSON-encoded summary and return the bytes.
+
+    Only db's engine is used (each KPI gets its own session), so this can
+    keep running after the request that started it has finished.
+    `generation` is the user's cache generation read before computing.
+    """
+    # ------------------------------------------------------------------
+    # FETCH ALL KPIs IN PARALLEL
+    # ------------------------------------------------------------------
+    # Run all KPI queries concurrently, each on its own session: one
+    # AsyncSession can't run concurrent execute() calls
+    (
+        trash_composition,        # KPI 1: Trash Composition
+        environmental_footprint,  # KPI 2: Environmental Footprint
+        ai_fleet_efficiency,      # KPI 3: AI Fleet Efficiency
+        temporal_trends,          # KPI 4: Temporal Trends
+        mean_time_to_process,     # KPI 5: Mean Time to Process
+        hotspot_density,          # KPI 6: Hotspot Density
+    ) = await asyncio.gather(
+        run_isolated(db, get_trash_composition, user_id),
+        run_isolated(db, get_environmental_footprint, user_id),
+        run_isolated(db, get_ai_fleet_efficiency, user_id),
+        run_isolated(db, get_temporal_trends, user_id, days),
+        run_isolated(db, get_mean_time_to_process, user_id),
+        run_isolated(db, get_hotspot_density, user_id),
+    )
+
+    # ------------------------------------------------------------------
+    # BUILD RESPONSE
+    # ------------------------------------------------------------------
+    # Every KPI above is already a built model; skip re-validating them
+    response = StatsSummaryResponse.model_construct(
+        trash_composition=trash_composition,
+        environmental_footprint=environmental_footprint,
+        ai_fleet_efficiency=ai_fleet_efficiency,
+        temporal_trends=temporal_trends,
+        mean_time_to_process=mean_time_to_process,
+        hotspot_density=hotspot_density,
+        days_window=days  # Echo the time window for frontend reference
+    )
+
+    # ------------------------------------------------------------------
+    # UPDATE CACHE
+    # ------------------------------------------------------------------
+    # Serialize straight to JSON bytes with Pydantic's Rust serializer (no
+    # intermediate dict) and cache them for cheap cache hits
+    response_bytes = response.model_dump_json().encode()
+    await cache_stats(str(user_id), days, response_bytes, generation=generation)
+
+    return response_bytes
+
+
+async def _single_flight_summary(
+    db: AsyncSession, user_id: str, days: int, generation: int
+) -> bytes:
+    """
+    Compute the summary once per (user_id, days, generation) even under
+    concurrent misses.
+    """
+    return await _single_flight(
+        _inflight_summaries,
+        (str(user_id), days, generation),
+        lambda: _build_summary_bytes(db, user_id, days, generation),
+    )
+
+
+async def _refresh_summary(user_id: str, days: int) -> None:
+    """Background recompute of a stale summary, on its own session.
+
+    Goes through the single-flight path so a refresh and a concurrent cache
+    miss for the same key share one computation.
+    """
+    async with AsyncSessionLocalRO() as session:
+        try:
+            generation = await stats_generation(str(user_id))
+            await _single_flight_summary(session, user_id, days, generation)
+        except Exception as e:
+            logger.warning("Stats summary refresh failed for %s: %s", user_id, e)
 
 
 # ==============================================================================
@@ -208,7 +380,7 @@ async def get_hotspot_density_endpoint(
 )
 async def get_stats_summary(
     days: int = Query(default=7, ge=1, le=365, description="Time window in days"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -227,10 +399,14 @@ async def get_stats_summary(
           all-time data for the user.
 
     Caching Strategy:
-        - Uses in-memory cache with 5-minute (300s) TTL
-        - Cache key: (user_id, days) tuple
+        - Uses Redis (REDIS_URL) or an in-memory fallback with 5-minute (300s) TTL
+        - Stale entries (up to 10 more minutes) are served immediately while
+          a background task recomputes them (stale-while-revalidate)
+        - Cache key: (user_id, days, generation); uploads, media turning
+          READY and vault deletes bump the user's generation, retiring
+          their cached entries
+        - Concurrent misses for the same key share one in-flight computation
         - Prevents expensive aggregation queries on repeated requests
-        - Uses monotonic() for TTL comparison (immune to system clock changes)
 
     Response Structure (StatsSummaryResponse):
         {
@@ -249,7 +425,7 @@ async def get_stats_summary(
 
     Performance Notes:
         - All queries are user-scoped (no cross-user data leakage)
-        - Queries run in parallel via asyncio.gather for performance
+        - Queries run in parallel via asyncio.gather, one session per KPI
         - Heavy aggregations benefit from database indexes on:
           - Media.uploader_id
           - Media.status
@@ -260,53 +436,23 @@ async def get_stats_summary(
     # ------------------------------------------------------------------
     # CACHE CHECK
     # ------------------------------------------------------------------
-    cached_response = get_cached_stats(str(current_user.id), days)
-    if cached_response:
-        return JSONResponse(content=cached_response)
-
-    # ------------------------------------------------------------------
-    # FETCH ALL KPIs IN PARALLEL
-    # ------------------------------------------------------------------
     user_id = current_user.id
-
-    # Run all KPI queries concurrently for improved performance
-    (
-        trash_composition,        # KPI 1: Trash Composition
-        environmental_footprint,  # KPI 2: Environmental Footprint
-        ai_fleet_efficiency,      # KPI 3: AI Fleet Efficiency
-        temporal_trends,          # KPI 4: Temporal Trends
-        mean_time_to_process,     # KPI 5: Mean Time to Process
-        hotspot_density,          # KPI 6: Hotspot Density
-    ) = await asyncio.gather(
-        get_trash_composition(db, user_id),
-        get_environmental_footprint(db, user_id),
-        get_ai_fleet_efficiency(db, user_id),
-        get_temporal_trends(db, user_id, days),
-        get_mean_time_to_process(db, user_id),
-        get_hotspot_density(db, user_id),
-    )
-
-    # ------------------------------------------------------------------
-    # BUILD RESPONSE
-    # ------------------------------------------------------------------
-    response = StatsSummaryResponse(
-        trash_composition=trash_composition,
-        environmental_footprint=environmental_footprint,
-        ai_fleet_efficiency=ai_fleet_efficiency,
-        temporal_trends=temporal_trends,
-        mean_time_to_process=mean_time_to_process,
-        hotspot_density=hotspot_density,
-        days_window=days  # Echo the time window for frontend reference
+    generation = await stats_generation(str(user_id))
+    cached_response = await get_cached_stats(
+        str(user_id),
+        days,
+        generation=generation,
+        refresh=lambda: _refresh_summary(user_id, days),
     )
+    if cached_response:
+        # Cached payload is already JSON-encoded, so skip re-serialization
+        return Response(content=cached_response, media_type="application/json")
 
     # ------------------------------------------------------------------
-    # UPDATE CACHE
+    # CACHE MISS: COMPUTE, CACHE AND RETURN
     # ------------------------------------------------------------------
-    # Serialize response to dict for caching (Pydantic model -> JSON-compatible dict)
-    response_dict = response.model_dump(mode='json')
-    cache_stats(str(user_id), days, response_dict)
-
-    return JSONResponse(content=response_dict)
+    response_bytes = await _single_flight_summary(db, user_id, days, generation)
+    return Response(content=response_bytes, media_type="application/json")
 
 
 @router.get(
@@ -319,7 +465,7 @@ async def get_fun_facts_endpoint(
         5, ge=1, le=5, description="Maximum number of fun facts to return"
     ),
     lang: str = Query("en", regex="^(en|hu)$", description="Language code: en or hu"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -379,7 +525,7 @@ async def get_cleanup_manifest_report(
         regex="^(en|hu)$",
         description="Language for the report: 'en' (English) or 'hu' (Hungarian)",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -470,7 +616,7 @@ async def get_statistics_pdf_report(
         regex="^(en|hu)$",
         description="Language for the report: 'en' (English) or 'hu' (Hungarian)",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user=Depends(get_current_user),
 ):
     """
@@ -537,12 +683,12 @@ async def get_statistics_pdf_report(
         mean_time_to_process,  # KPI 5
         hotspot_density,  # KPI 6
     ) = await asyncio.gather(
-        get_trash_composition(db, user_id),
-        get_environmental_footprint(db, user_id),
-        get_ai_fleet_efficiency(db, user_id),
-        get_temporal_trends(db, user_id, days),
-        get_mean_time_to_process(db, user_id),
-        get_hotspot_density(db, user_id),
+        run_isolated(db, get_trash_composition, user_id),
+        run_isolated(db, get_environmental_footprint, user_id),
+        run_isolated(db, get_ai_fleet_efficiency, user_id),
+        run_isolated(db, get_temporal_trends, user_id, days),
+        run_isolated(db, get_mean_time_to_process, user_id),
+        run_isolated(db, get_hotspot_density, user_id),
     )
 
     # ------------------------------------------------------------------
@@ -5,7 +5,15 @@ Re-exports cache and KPI functions for convenient importing.
 """
 
 # Cache
-from app.api.stats_utils.cache import get_cached_stats, cache_stats, clear_cache
+from app.api.stats_utils.cache import (
+    get_cached_stats,
+    cache_stats,
+    clear_cache,
+    get_cached_kpi,
+    cache_kpi,
+    invalidate_user_stats,
+    stats_generation,
+)
 
 # KPIs
 from app.api.stats_utils.kpi_trash_composition import get_trash_composition
@@ -28,6 +36,10 @@ __all__ = [
     "get_cached_stats",
     "cache_stats",
     "clear_cache",
+    "get_cached_kpi",
+    "cache_kpi",
+    "invalidate_user_stats",
+    "stats_generation",
     # KPIs
     "get_trash_composition",
     "get_environmental_footprint",
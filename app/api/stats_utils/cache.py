@@ -1,42 +1,290 @@
 """
-In-memory caching for stats endpoints.
+Caching for stats endpoints.
 
 Cache Configuration:
 - 5-minute TTL to reduce database load for expensive aggregation queries
-- Cache key is (user_id, days) tuple
-- Uses monotonic() for TTL comparison (immune to system clock changes)
+- 10-minute stale grace window: expired entries are still served while a
+  background task recomputes them (stale-while-revalidate)
+- Cache key is (user_id, days, generation) tuple
+- Stores JSON-encoded response bytes so cache hits skip serialization
+
+Backends:
+- Redis (when REDIS_URL is set): shared by all app workers, so a summary
+  computed by one worker is a cache hit for every other worker. Entries
+  expire at the hard expiry; an entry is stale once its remaining TTL is
+  inside the grace window.
+- In-process TTLCache (fallback): bounded to STATS_CACHE_MAX_ENTRIES with LRU
+  eviction (override with the STATS_CACHE_MAX_ENTRIES env var), using the
+  cache's monotonic timer (immune to clock changes)
+
+Individual KPI endpoints:
+- Read-through Redis cache with a short TTL (60s plus up to 15s jitter so
+  users' entries don't expire in lockstep), keyed by KPI kind, user_id and
+  days where relevant (/map/stats puts its bbox and resolution in the kind).
+  Redis only: without REDIS_URL these calls are no-ops.
+
+Invalidation:
+- Every KPI and summary key carries the user's cache generation (a Redis
+  counter, or an in-process one without Redis). invalidate_user_stats(),
+  e.g. after an upload, only bumps it: old entries stop being read and
+  expire on their TTL, so there is no keyspace scan on the upload path.
+- Callers read stats_generation() before computing and write under that
+  generation, so a result built from pre-invalidation data lands under
+  the old generation and is never served.
 """
 
-from time import monotonic
+import asyncio
+import logging
+import os
+import random
+from typing import Awaitable, Callable
+
+from cachetools import TTLCache
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
 
-# Cache structure: { (user_id, days): (timestamp_monotonic, response_dict) }
 STATS_CACHE_TTL_SECONDS = 300
-_stats_cache: dict[tuple, tuple[float, dict]] = {}
+STATS_CACHE_STALE_GRACE_SECONDS = 600
+STATS_CACHE_MAX_ENTRIES = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "10000"))
+STATS_CACHE_KEY_PREFIX = "hyperion:stats:summary"
+
+KPI_CACHE_TTL_SECONDS = 60
+KPI_CACHE_TTL_JITTER_SECONDS = 15
+KPI_CACHE_KEY_PREFIX = "hyperion:stats:kpi"
+STATS_GENERATION_KEY_PREFIX = "hyperion:stats:gen"
+# Outlives every entry written under a generation, so a counter that expires
+# (and restarts at 0) can't resurrect old entries
+STATS_GENERATION_TTL_SECONDS = 86400
+
+REDIS_URL = os.getenv("REDIS_URL")
+_redis = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+# Cache structure: { (user_id, days, generation): (soft_expiry, response_bytes) }
+# The TTLCache itself drops entries at the hard expiry (TTL + grace window).
+_stats_cache: TTLCache = TTLCache(
+    maxsize=STATS_CACHE_MAX_ENTRIES,
+    ttl=STATS_CACHE_TTL_SECONDS + STATS_CACHE_STALE_GRACE_SECONDS,
+)
+
+# In-flight background refreshes, one per cache key (coalesces concurrent misses)
+_inflight_refreshes: dict[tuple, asyncio.Task] = {}
+
+# Per-user cache generations when running without Redis
+_local_generations: dict[str, int] = {}
+
+
+def _generation_key(user_id: str) -> str:
+    return f"{STATS_GENERATION_KEY_PREFIX}:{user_id}"
 
 
-def get_cached_stats(user_id: str, days: int) -> dict | None:
+async def stats_generation(user_id: str) -> int:
+    """Current cache generation for one user's KPI and summary entries."""
+    if _redis is None:
+        return _local_generations.get(user_id, 0)
+    try:
+        return int(await _redis.get(_generation_key(user_id)) or 0)
+    except RedisError as e:
+        logger.warning("Stats cache generation read failed: %s", e)
+        return 0
+
+
+def _redis_key(cache_key: tuple) -> str:
+    user_id, days, generation = cache_key
+    return f"{STATS_CACHE_KEY_PREFIX}:{user_id}:g{generation}:{days}"
+
+
+async def get_cached_stats(
+    user_id: str,
+    days: int,
+    *,
+    generation: int,
+    refresh: Callable[[], Awaitable[None]] | None = None,
+) -> bytes | None:
     """
-    Retrieve cached stats if they exist and are within TTL.
-    
+    Retrieve cached stats if they exist and are within the hard expiry.
+
+    If the entry is past its TTL but still inside the stale grace window, the
+    stale bytes are returned and `refresh` (if given) is scheduled as a
+    background task, unless a refresh for the same key is already running.
+
     Returns:
-        Response dict if cache hit, None if miss or expired
+        Encoded JSON response bytes if cache hit, None if miss or expired
     """
-    cache_key = (user_id, days)
+    cache_key = (user_id, days, generation)
+    if _redis is not None:
+        cached = await _get_from_redis(cache_key)
+    else:
+        cached = _get_from_memory(cache_key)
+
+    if cached is None:
+        return None
+
+    response_bytes, is_stale = cached
+    if is_stale and refresh is not None:
+        _schedule_refresh(cache_key, refresh)
+    return response_bytes
+
+
+def _get_from_memory(cache_key: tuple) -> tuple[bytes, bool] | None:
     cached = _stats_cache.get(cache_key)
-    now = monotonic()
-    
-    if cached and now - cached[0] <= STATS_CACHE_TTL_SECONDS:
-        return cached[1]
-    return None
+    if not cached:
+        return None
+    return cached[1], _stats_cache.timer() >= cached[0]
+
+
+async def _get_from_redis(cache_key: tuple) -> tuple[bytes, bool] | None:
+    try:
+        # GET + PTTL in one round trip; remaining TTL tells us if it is stale
+        async with _redis.pipeline(transaction=False) as pipe:
+            response_bytes, ttl_ms = await (
+                pipe.get(_redis_key(cache_key)).pttl(_redis_key(cache_key)).execute()
+            )
+    except RedisError as e:
+        logger.warning("Stats cache read failed, treating as miss: %s", e)
+        return None
 
+    if response_bytes is None:
+        return None
+    return response_bytes, ttl_ms <= STATS_CACHE_STALE_GRACE_SECONDS * 1000
 
-def cache_stats(user_id: str, days: int, response_dict: dict) -> None:
-    """Store response in cache with current timestamp."""
-    cache_key = (user_id, days)
-    _stats_cache[cache_key] = (monotonic(), response_dict)
 
+def _schedule_refresh(
+    cache_key: tuple, refresh: Callable[[], Awaitable[None]]
+) -> None:
+    """Start a background refresh for cache_key unless one is already in flight."""
+    if cache_key in _inflight_refreshes:
+        return
 
-def clear_cache() -> None:
+    task = asyncio.create_task(refresh())
+    _inflight_refreshes[cache_key] = task
+    task.add_done_callback(lambda _: _inflight_refreshes.pop(cache_key, None))
+
+
+async def cache_stats(
+    user_id: str, days: int, response_bytes: bytes, *, generation: int
+) -> None:
+    """
+    Store encoded response in cache with its soft and hard expiry, under the
+    generation read before the summary was computed.
+    """
+    cache_key = (user_id, days, generation)
+    if _redis is not None:
+        try:
+            await _redis.set(
+                _redis_key(cache_key),
+                response_bytes,
+                ex=STATS_CACHE_TTL_SECONDS + STATS_CACHE_STALE_GRACE_SECONDS,
+            )
+        except RedisError as e:
+            logger.warning("Stats cache write failed: %s", e)
+        return
+
+    soft_expiry = _stats_cache.timer() + STATS_CACHE_TTL_SECONDS
+    _stats_cache[cache_key] = (soft_expiry, response_bytes)
+
+
+async def clear_cache() -> None:
     """Clear all cached stats."""
-    global _stats_cache
     _stats_cache.clear()
+    if _redis is not None:
+        async for key in _redis.scan_iter(match=f"{STATS_CACHE_KEY_PREFIX}:*"):
+            await _redis.delete(key)
+
+
+# ==============================================================================
+# PER-KPI CACHE (Redis only)
+# ==============================================================================
+
+
+def _kpi_key(kind: str, user_id: str, days: int | None, generation: int) -> str:
+    return (
+        f"{KPI_CACHE_KEY_PREFIX}:{user_id}:g{generation}:{kind}:"
+        f"{days if days is not None else '-'}"
+    )
+
+
+async def get_cached_kpi(
+    kind: str, user_id: str, days: int | None = None, *, generation: int
+) -> bytes | None:
+    """Return the cached JSON bytes for one KPI endpoint, or None on a miss."""
+    if _redis is None:
+        return None
+    try:
+        return await _redis.get(_kpi_key(kind, user_id, days, generation))
+    except RedisError as e:
+        logger.warning("KPI cache read failed, treating as miss: %s", e)
+        return None
+
+
+async def cache_kpi(
+    kind: str,
+    user_id: str,
+    response: BaseModel,
+    days: int | None = None,
+    *,
+    generation: int,
+) -> None:
+    """
+    Store one KPI endpoint's response as JSON bytes with a jittered short TTL,
+    under the generation read before the KPI was computed.
+    """
+    if _redis is None:
+        return
+    await cache_kpi_bytes(
+        kind,
+        user_id,
+        response.model_dump_json().encode(),
+        days,
+        generation=generation,
+    )
+
+
+async def cache_kpi_bytes(
+    kind: str,
+    user_id: str,
+    response_bytes: bytes,
+    days: int | None = None,
+    *,
+    generation: int,
+) -> None:
+    """cache_kpi for a response that is already encoded (e.g. /map/stats)."""
+    if _redis is None:
+        return
+    try:
+        # NX: when several misses race, the first result wins and the rest
+        # don't rewrite the key
+        await _redis.set(
+            _kpi_key(kind, user_id, days, generation),
+            response_bytes,
+            ex=KPI_CACHE_TTL_SECONDS + random.randint(0, KPI_CACHE_TTL_JITTER_SECONDS),
+            nx=True,
+        )
+    except RedisError as e:
+        logger.warning("KPI cache write failed: %s", e)
+
+
+async def invalidate_user_stats(user_id: str) -> None:
+    """
+    Retire every cached KPI and summary entry for one user by bumping the
+    user's cache generation (a single INCR, independent of cache size).
+    """
+    # Retired in-process entries are never read again and age out of the TTLCache
+    _local_generations[user_id] = _local_generations.get(user_id, 0) + 1
+
+    if _redis is None:
+        return
+    try:
+        async with _redis.pipeline(transaction=False) as pipe:
+            await (
+                pipe.incr(_generation_key(user_id))
+                .expire(_generation_key(user_id), STATS_GENERATION_TTL_SECONDS)
+                .execute()
+            )
+    except RedisError as e:
+        logger.warning("Stats cache invalidation failed: %s", e)
@@ -3,14 +3,17 @@ Fun Facts KPI - Personalized statistics with bilingual support.
 Generates entertaining, user-specific trash report insights.
 """
 
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, union_all
 
+from app.api.stats_utils.isolated_query import execute_isolated
 from app.models.stats import FunFact
 from app.models.db.Media import Media
 from app.models.db.Detection import Detection
 from app.models.db.VideoDetection import VideoDetection
-from app.models.upload.MediaStatus import MediaStatus
+from app.models.db.UserMediaStats import UserMediaStats
 
 
 # ==============================================================================
@@ -70,6 +73,16 @@ FUN_FACT_TEMPLATES = {
     },
 }
 
+# Per-language (title, text) lookup tables, built once at import so each fact
+# needs a single dict lookup instead of three nested ones
+FUN_FACT_TEMPLATES_BY_LANG = {
+    lang: {
+        key: (value[lang]["title"], value[lang]["text"])
+        for key, value in FUN_FACT_TEMPLATES.items()
+    }
+    for lang in ("en", "hu")
+}
+
 
 async def get_fun_facts(
     db: AsyncSession, user_id: str, lang: str = "en", limit: int = 5
@@ -95,10 +108,13 @@ async def get_fun_facts(
     """
     results = []
 
-    # Helper to get correct language (fallback to English)
-    l = lang if lang in ["en", "hu"] else "en"
+    # Templates for the requested language (fallback to English)
+    templates = FUN_FACT_TEMPLATES_BY_LANG.get(lang, FUN_FACT_TEMPLATES_BY_LANG["en"])
+
+    # Build every fact query up front; they are independent, so each wave
+    # below runs concurrently (each query on its own connection)
 
-    # --- FACT 1: Most Active Worker (Titan Affinity) ---
+    # FACT 1: Most Active Worker (Titan Affinity)
     worker_q = (
         select(Media.assigned_worker, func.count(Media.id))
         .where(Media.uploader_id == user_id, Media.assigned_worker.isnot(None))
@@ -106,124 +122,161 @@ async def get_fun_facts(
         .order_by(desc(func.count(Media.id)))
         .limit(1)
     )
-    worker_res = (await db.execute(worker_q)).first()
-    if worker_res:
-        results.append(
-            FunFact(
-                title=FUN_FACT_TEMPLATES["titan"][l]["title"],
-                fact=FUN_FACT_TEMPLATES["titan"][l]["text"].format(
-                    name=worker_res[0], count=worker_res[1]
-                ),
-                icon="cpu",
-            )
-        )
 
-    # --- FACT 2: Area Conversion (1 smartphone screen ~ 0.007 m²) ---
-    area_detection_q = (
-        select(func.coalesce(func.sum(Detection.area_sqm), 0))
+    # FACTS 2 + 3: Area Conversion and Dominant Label share one aggregate.
+    # ROLLUP(label) yields one row per label plus a NULL-label grand total row,
+    # so total area and per-label counts come from a single scan of the join.
+    detection_items = union_all(
+        select(Detection.label.label("label"), Detection.area_sqm.label("area_sqm"))
         .join(Media)
-        .where(Media.uploader_id == user_id)
-    )
-    area_video_detection_q = (
-        select(func.coalesce(func.sum(VideoDetection.area_sqm), 0))
+        .where(Media.uploader_id == user_id),
+        select(
+            VideoDetection.label.label("label"),
+            VideoDetection.area_sqm.label("area_sqm"),
+        )
         .join(Media)
-        .where(Media.uploader_id == user_id)
+        .where(Media.uploader_id == user_id),
+    ).subquery()
+    label_area_q = select(
+        detection_items.c.label,
+        func.count().label("count"),
+        func.coalesce(func.sum(detection_items.c.area_sqm), 0).label("area"),
+    ).group_by(func.rollup(detection_items.c.label))
+
+    # FACT 4: Northernmost Location (Arctic Explorer)
+    northernmost_q = (
+        select(Media.lat)
+        .where(Media.uploader_id == user_id, Media.lat.isnot(None))
+        .order_by(desc(Media.lat))
+        .limit(1)
     )
-    total_area_detection = (await db.execute(area_detection_q)).scalar() or 0
-    total_area_video_detection = (
-        await db.execute(area_video_detection_q)
-    ).scalar() or 0
-    total_area = total_area_detection + total_area_video_detection
+
+    # FACT 5: Success Rate (Processing Champion)
+    # READY and total counts are trigger-maintained, so this is a PK lookup
+    success_q = select(UserMediaStats.ready, UserMediaStats.total).where(
+        UserMediaStats.uploader_id == user_id
+    )
+
+    # (query, fact builder, max facts it can yield) in fact order. Queries are
+    # issued in waves of just enough sources to fill the remaining `limit`
+    # slots, so small limits skip the later round trips entirely.
+    fact_sources = [
+        (worker_q, _worker_facts, 1),
+        (label_area_q, _label_area_facts, 2),
+        (northernmost_q, _northernmost_facts, 1),
+        (success_q, _success_facts, 1),
+    ]
+
+    while fact_sources and len(results) < limit:
+        wave = []
+        slots = limit - len(results)
+        while fact_sources and slots > 0:
+            source = fact_sources.pop(0)
+            wave.append(source)
+            slots -= source[2]
+
+        wave_results = await asyncio.gather(
+            *(execute_isolated(db, query) for query, _, _ in wave)
+        )
+        for (_, build_facts, _), result in zip(wave, wave_results):
+            results.extend(build_facts(result, templates))
+
+    # Return limited results
+    return results[:limit]
+
+
+# ==============================================================================
+# FACT BUILDERS (one per query, each returns zero or more facts in order)
+# ==============================================================================
+
+
+def _worker_facts(result, templates) -> list[FunFact]:
+    """FACT 1: Most Active Worker (Titan Affinity)."""
+    worker_res = result.first()
+    if not worker_res:
+        return []
+    title, text = templates["titan"]
+    return [
+        FunFact(
+            title=title,
+            fact=text.format_map({"name": worker_res[0], "count": worker_res[1]}),
+            icon="cpu",
+        )
+    ]
+
+
+def _label_area_facts(result, templates) -> list[FunFact]:
+    """FACTS 2 + 3: Area Conversion and Dominant Label from the ROLLUP rows."""
+    facts = []
+
+    # Split the ROLLUP rows: NULL label is the grand total, the rest are per label
+    total_area = 0
+    label_rows = []
+    for row in result.all():
+        if row.label is None:
+            total_area = row.area or 0
+        else:
+            label_rows.append(row)
+
+    # --- FACT 2: Area Conversion (1 smartphone screen ~ 0.007 m²) ---
     if total_area > 0:
         screens = int(total_area / 0.007)
         if screens > 0:
-            results.append(
+            title, text = templates["area"]
+            facts.append(
                 FunFact(
-                    title=FUN_FACT_TEMPLATES["area"][l]["title"],
-                    fact=FUN_FACT_TEMPLATES["area"][l]["text"].format(count=screens),
+                    title=title,
+                    fact=text.format_map({"count": screens}),
                     icon="maximize",
                 )
             )
 
     # --- FACT 3: Dominant Label (Trash Specialist) ---
-    # Get label counts from Detection
-    label_detection_q = (
-        select(Detection.label, func.count(Detection.id))
-        .join(Media)
-        .where(Media.uploader_id == user_id)
-        .group_by(Detection.label)
-    )
-    detection_labels = (await db.execute(label_detection_q)).all()
-
-    # Get label counts from VideoDetection
-    label_video_detection_q = (
-        select(VideoDetection.label, func.count(VideoDetection.id))
-        .join(Media)
-        .where(Media.uploader_id == user_id)
-        .group_by(VideoDetection.label)
-    )
-    video_detection_labels = (await db.execute(label_video_detection_q)).all()
-
-    # Combine label counts
-    from collections import Counter
-
-    label_counter = Counter()
-    for label, count in detection_labels:
-        label_counter[label] += count
-    for label, count in video_detection_labels:
-        label_counter[label] += count
-
-    if label_counter:
-        dominant_label, _ = label_counter.most_common(1)[0]
-        results.append(
+    if label_rows:
+        dominant_label = max(label_rows, key=lambda row: row.count).label
+        title, text = templates["specialist"]
+        facts.append(
             FunFact(
-                title=FUN_FACT_TEMPLATES["specialist"][l]["title"],
-                fact=FUN_FACT_TEMPLATES["specialist"][l]["text"].format(
-                    label=dominant_label
-                ),
+                title=title,
+                fact=text.format_map({"label": dominant_label}),
                 icon="target",
             )
         )
 
-    # --- FACT 4: Northernmost Location (Arctic Explorer) ---
-    northernmost_q = (
-        select(Media.lat)
-        .where(Media.uploader_id == user_id, Media.lat.isnot(None))
-        .order_by(desc(Media.lat))
-        .limit(1)
-    )
-    northernmost_res = (await db.execute(northernmost_q)).scalar()
-    if northernmost_res:
-        results.append(
-            FunFact(
-                title=FUN_FACT_TEMPLATES["northernmost"][l]["title"],
-                fact=FUN_FACT_TEMPLATES["northernmost"][l]["text"].format(
-                    lat=round(northernmost_res, 2)
-                ),
-                icon="compass",
-            )
+    return facts
+
+
+def _northernmost_facts(result, templates) -> list[FunFact]:
+    """FACT 4: Northernmost Location (Arctic Explorer)."""
+    northernmost_res = result.scalar()
+    if not northernmost_res:
+        return []
+    title, text = templates["northernmost"]
+    return [
+        FunFact(
+            title=title,
+            fact=text.format_map({"lat": round(northernmost_res, 2)}),
+            icon="compass",
         )
+    ]
 
-    # --- FACT 5: Success Rate (Processing Champion) ---
-    success_q = select(func.count(Media.id)).where(
-        Media.uploader_id == user_id, Media.status == MediaStatus.READY
-    )
-    total_q = select(func.count(Media.id)).where(Media.uploader_id == user_id)
 
-    success_count = (await db.execute(success_q)).scalar() or 0
-    total_count = (await db.execute(total_q)).scalar() or 0
+def _success_facts(result, templates) -> list[FunFact]:
+    """FACT 5: Success Rate (Processing Champion)."""
+    success_row = result.first()
+    if not success_row:
+        return []
+    success_count = success_row.ready or 0
+    total_count = success_row.total or 0
+    if total_count <= 0:
+        return []
 
-    if total_count > 0:
-        success_rate = int((success_count / total_count) * 100)
-        results.append(
-            FunFact(
-                title=FUN_FACT_TEMPLATES["efficiency"][l]["title"],
-                fact=FUN_FACT_TEMPLATES["efficiency"][l]["text"].format(
-                    success=success_rate, ready=success_count
-                ),
-                icon="award",
-            )
+    success_rate = int((success_count / total_count) * 100)
+    title, text = templates["efficiency"]
+    return [
+        FunFact(
+            title=title,
+            fact=text.format_map({"success": success_rate, "ready": success_count}),
+            icon="award",
         )
-
-    # Return limited results
-    return results[:limit]
+    ]
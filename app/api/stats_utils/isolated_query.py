@@ -0,0 +1,36 @@
+"""
+Concurrent query helper for stats utilities.
+
+A single AsyncSession is bound to one connection and does not allow
+concurrent execute() calls, so independent aggregation queries that should
+overlap their round trips each run on a short-lived session of their own.
+"""
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def execute_isolated(db: AsyncSession, query) -> Result:
+    """
+    Execute a read-only query on its own session, bound to db's engine.
+
+    Using db.bind (instead of the global session factory) keeps the query on
+    whatever engine the caller's session uses, e.g. a test database.
+
+    Returns:
+        A fully buffered Result, safe to read after the session is closed
+    """
+    async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+        result = await session.execute(query)
+        return result.freeze()()
+
+
+async def run_isolated(db: AsyncSession, fn, *args):
+    """
+    Await fn(session, *args) on its own session, bound to db's engine.
+
+    For helpers that issue their own queries (e.g. the KPI functions), so
+    several of them can be gathered without sharing db's connection.
+    """
+    async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+        return await fn(session, *args)
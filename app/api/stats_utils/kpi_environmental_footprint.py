@@ -7,7 +7,7 @@ of the environmental monitoring effort.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam
 
 from app.models.db.Media import Media
 from app.models.db.Detection import Detection
@@ -15,6 +15,32 @@ from app.models.db.VideoDetection import VideoDetection
 from app.models.upload.MediaStatus import MediaStatus
 from app.models.stats import EnvironmentalFootprint
 
+# Static statements; user_id is supplied at execute time
+_READY_USER_MEDIA = (
+    Media.uploader_id == bindparam("user_id"),
+    Media.status == MediaStatus.READY,
+)
+
+# Query for Detection
+_DETECTION_FOOTPRINT_QUERY = (
+    select(
+        func.coalesce(func.sum(Detection.area_sqm), 0).label("total_area"),
+        func.count(Detection.id).label("total_detections"),
+    )
+    .join(Media, Detection.media_id == Media.id)
+    .where(*_READY_USER_MEDIA)
+)
+
+# Query for VideoDetection
+_VIDEO_DETECTION_FOOTPRINT_QUERY = (
+    select(
+        func.coalesce(func.sum(VideoDetection.area_sqm), 0).label("total_area"),
+        func.count(VideoDetection.id).label("total_detections"),
+    )
+    .join(Media, VideoDetection.media_id == Media.id)
+    .where(*_READY_USER_MEDIA)
+)
+
 
 async def get_environmental_footprint(
     db: AsyncSession, user_id: str
@@ -35,30 +61,11 @@ async def get_environmental_footprint(
     Returns:
         EnvironmentalFootprint with total_area_sqm and total_detections
     """
-    # Query for Detection
-    detection_query = (
-        select(
-            func.coalesce(func.sum(Detection.area_sqm), 0).label("total_area"),
-            func.count(Detection.id).label("total_detections"),
-        )
-        .join(Media, Detection.media_id == Media.id)
-        .where(Media.uploader_id == user_id, Media.status == MediaStatus.READY)
-    )
-
-    # Query for VideoDetection
-    video_detection_query = (
-        select(
-            func.coalesce(func.sum(VideoDetection.area_sqm), 0).label("total_area"),
-            func.count(VideoDetection.id).label("total_detections"),
-        )
-        .join(Media, VideoDetection.media_id == Media.id)
-        .where(Media.uploader_id == user_id, Media.status == MediaStatus.READY)
-    )
-
-    detection_result = await db.execute(detection_query)
+    params = {"user_id": user_id}
+    detection_result = await db.execute(_DETECTION_FOOTPRINT_QUERY, params)
     detection_row = detection_result.one()
 
-    video_detection_result = await db.execute(video_detection_query)
+    video_detection_result = await db.execute(_VIDEO_DETECTION_FOOTPRINT_QUERY, params)
     video_detection_row = video_detection_result.one()
 
     total_area = float(detection_row.total_area or 0) + float(
@@ -68,6 +75,6 @@ async def get_environmental_footprint(
         video_detection_row.total_detections or 0
     )
 
-    return EnvironmentalFootprint(
+    return EnvironmentalFootprint.model_construct(
         total_area_sqm=total_area, total_detections=total_detections
     )
@@ -6,7 +6,8 @@ This helps identify unreliable workers that may need attention or reconfiguratio
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case
+from sqlalchemy import select, func, case, cast, bindparam, Float, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.models.db.Media import Media
 from app.models.db.AIWorker import AIWorkerState
@@ -15,26 +16,79 @@ from app.models.stats import WorkerEfficiency, AIFleetEfficiency
 from app.api.dashboard_utils.utils.init_workers import TITAN_FLEET
 
 
+def _build_fleet_query():
+    """Fleet statement with user_id as a bind parameter (fleet has a default)."""
+    # Every Titan in the fleet, even those with no tasks for this user
+    fleet = func.unnest(
+        bindparam("fleet", TITAN_FLEET, type_=ARRAY(String))
+    ).table_valued("name", with_ordinality="position").render_derived("fleet")
+
+    # Success/failure counts per worker for this user's media
+    # Uses CASE to conditionally count only rows matching each status
+    media_stats = (
+        select(
+            Media.assigned_worker,
+            # COUNT with CASE: only counts rows where condition is true
+            func.count(case((Media.status == MediaStatus.READY, 1))).label("successes"),
+            func.count(case((Media.status == MediaStatus.FAILED, 1))).label("failures")
+        )
+        .where(
+            Media.uploader_id == bindparam("user_id"),
+            Media.assigned_worker.isnot(None)  # Only media that was assigned to a worker
+        )
+        .group_by(Media.assigned_worker)
+    ).subquery()
+
+    successes = func.coalesce(media_stats.c.successes, 0)
+    failures = func.coalesce(media_stats.c.failures, 0)
+
+    return (
+        select(
+            fleet.c.name,
+            successes.label("successes"),
+            failures.label("failures"),
+            func.coalesce(AIWorkerState.tasks_processed_today, 0).label("tasks_today"),
+            func.coalesce(
+                cast(successes, Float)
+                / cast(func.nullif(successes + failures, 0), Float),
+                1.0,
+            ).label("reliability_score"),
+        )
+        .select_from(fleet)
+        .outerjoin(media_stats, media_stats.c.assigned_worker == fleet.c.name)
+        .outerjoin(AIWorkerState, AIWorkerState.name == fleet.c.name)
+        .order_by(fleet.c.position)
+    )
+
+
+# Module-level so the statement is built (and compiled) once per process
+_FLEET_QUERY = _build_fleet_query()
+
+
 async def get_ai_fleet_efficiency(
     db: AsyncSession, user_id: str
 ) -> AIFleetEfficiency:
     """
     Calculates the success vs. failure ratio for each AI worker in the fleet.
     
-    SQL Logic - Two queries:
+    SQL Logic - Single set-oriented query:
     
-    Query 1 (Media stats per worker):
+    Fleet source:
+    - unnest(:fleet) WITH ORDINALITY turns TITAN_FLEET into one row per worker,
+      keeping the configured fleet order via the ordinality column
+    
+    Media stats subquery (LEFT JOIN):
     - Uses CASE expressions to conditionally count READY (success) vs FAILED media
     - Groups by assigned_worker to get per-worker breakdown
     - Only counts media assigned to a worker (assigned_worker IS NOT NULL)
     
-    Query 2 (Worker state):
-    - Fetches current AIWorkerState to get tasks_processed_today counter
+    Worker state (LEFT JOIN):
+    - Reads AIWorkerState.tasks_processed_today for each worker
     - This can be compared against success+failure to verify daily reset logic
     
-    Reliability Score Calculation:
-        reliability = successes / (successes + failures)
-        - Returns 1.0 if no tasks processed (benefit of the doubt)
+    Reliability Score Calculation (in SQL):
+        reliability = successes / NULLIF(successes + failures, 0)
+        - COALESCE to 1.0 if no tasks processed (benefit of the doubt)
         - Ranges from 0.0 (all failures) to 1.0 (all successes)
     
     Fleet-wide Metrics:
@@ -47,66 +101,26 @@ async def get_ai_fleet_efficiency(
         - fleet_reliability_score: Overall success rate (0-1)
         - total_successes, total_failures: Fleet-wide counts
     """
-    # Query 1: Get success/failure counts per worker for this user's media
-    # Uses CASE to conditionally count only rows matching each status
-    media_query = (
-        select(
-            Media.assigned_worker,
-            # COUNT with CASE: only counts rows where condition is true
-            func.count(case((Media.status == MediaStatus.READY, 1))).label("successes"),
-            func.count(case((Media.status == MediaStatus.FAILED, 1))).label("failures")
-        )
-        .where(
-            Media.uploader_id == user_id,
-            Media.assigned_worker.isnot(None)  # Only media that was assigned to a worker
-        )
-        .group_by(Media.assigned_worker)
-    )
-
-    media_result = await db.execute(media_query)
-    # Create lookup dict: worker_name -> row with successes/failures
-    media_rows = {row.assigned_worker: row for row in media_result.all()}
-
-    # Query 2: Get tasks_processed_today from AIWorkerState table
-    # This tracks the daily counter which resets at midnight
-    worker_query = select(AIWorkerState)
-    worker_result = await db.execute(worker_query)
-    worker_states = {w.name: w for w in worker_result.scalars().all()}
-
-    workers = []
-    total_successes = 0
-    total_failures = 0
+    rows = (await db.execute(_FLEET_QUERY, {"user_id": user_id})).all()
 
-    # Iterate through all workers in TITAN_FLEET to ensure complete list
-    # (even workers with no tasks for this user are included with zero counts)
-    for worker_name in TITAN_FLEET:
-        media_data = media_rows.get(worker_name)
-        worker_state = worker_states.get(worker_name)
-
-        successes = media_data.successes if media_data else 0
-        failures = media_data.failures if media_data else 0
-        tasks_today = worker_state.tasks_processed_today if worker_state else 0
-
-        # Calculate reliability score: successes / total_tasks
-        total_tasks = successes + failures
-        reliability = successes / total_tasks if total_tasks > 0 else 1.0
-
-        workers.append(WorkerEfficiency(
-            name=worker_name,
-            success_count=successes,
-            failure_count=failures,
-            tasks_processed_today=tasks_today,
-            reliability_score=round(reliability, 4)
-        ))
-
-        total_successes += successes
-        total_failures += failures
+    workers = [
+        WorkerEfficiency.model_construct(
+            name=row.name,
+            success_count=row.successes,
+            failure_count=row.failures,
+            tasks_processed_today=row.tasks_today,
+            reliability_score=round(float(row.reliability_score), 4),
+        )
+        for row in rows
+    ]
+    total_successes = sum(row.successes for row in rows)
+    total_failures = sum(row.failures for row in rows)
 
     # Calculate fleet-wide reliability score
     total_fleet_tasks = total_successes + total_failures
     fleet_reliability = total_successes / total_fleet_tasks if total_fleet_tasks > 0 else 1.0
 
-    return AIFleetEfficiency(
+    return AIFleetEfficiency.model_construct(
         workers=workers,
         fleet_reliability_score=round(fleet_reliability, 4),
         total_successes=total_successes,
@@ -5,14 +5,131 @@ Counts the number of geographical "clusters" where trash confidence is >= 80%.
 This helps users identify high-priority zones that require immediate attention.
 """
 
+from geoalchemy2 import Geometry
+from geoalchemy2.functions import ST_ClusterDBSCAN
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import (
+    select,
+    func,
+    case,
+    union_all,
+    table,
+    column,
+    text,
+    bindparam,
+    Integer,
+    String,
+)
 from app.models.db.VideoDetection import VideoDetection
 from app.models.db.Media import Media
 from app.models.stats import HotspotDensity
 
+# NOTE: the threshold and grid resolution are baked into the user_hotspot_grid
+# materialized view (see migration 8d3f5a0c7e21); change both together.
 HOTSPOT_CONFIDENCE_THRESHOLD = 80
 HOTSPOT_GRID_RESOLUTION_DEGREES = 0.001
+# DBSCAN radius over grid cells: 1.5 cells links all 8 neighbouring cells
+HOTSPOT_CLUSTER_EPS_DEGREES = HOTSPOT_GRID_RESOLUTION_DEGREES * 1.5
+# 1 keeps isolated high-confidence cells as their own hotspot
+HOTSPOT_CLUSTER_MIN_POINTS = 1
+# Adaptive two-level grid: coarse ~1km cells are only refined into the
+# ~100m materialized-view cells when they hold at least this many points;
+# sparse coarse cells collapse into a single point (one hotspot)
+HOTSPOT_COARSE_GRID_RESOLUTION_DEGREES = 0.01
+HOTSPOT_COARSE_CELL_MIN_POINTS = 10
+
+# Whether the database has PostGIS; probed once at startup by detect_postgis()
+HAS_POSTGIS = True
+
+# Materialized view: one row per (uploader_id, snapped grid cell) with the
+# number of high-confidence Media/VideoDetection points in that cell
+user_hotspot_grid = table(
+    "user_hotspot_grid",
+    column("uploader_id", String),
+    column("cell", Geometry(geometry_type="POINT", srid=4326)),
+    column("n", Integer),
+)
+
+
+def _build_hotspot_density_query():
+    """Density statement over user_hotspot_grid with user_id as a bind parameter."""
+    # Per-coarse-cell point totals alongside each fine cell
+    cells = (
+        select(
+            user_hotspot_grid.c.n,
+            user_hotspot_grid.c.cell,
+            func.ST_SnapToGrid(
+                user_hotspot_grid.c.cell, HOTSPOT_COARSE_GRID_RESOLUTION_DEGREES
+            ).label("coarse_cell"),
+        )
+        .where(user_hotspot_grid.c.uploader_id == bindparam("user_id"))
+    ).subquery()
+    coarse_totals = (
+        select(
+            cells.c.n,
+            cells.c.cell,
+            cells.c.coarse_cell,
+            func.sum(cells.c.n)
+            .over(partition_by=cells.c.coarse_cell)
+            .label("coarse_n"),
+        )
+    ).subquery()
+    adaptive_cell = case(
+        (
+            coarse_totals.c.coarse_n >= HOTSPOT_COARSE_CELL_MIN_POINTS,
+            coarse_totals.c.cell,
+        ),
+        else_=coarse_totals.c.coarse_cell,
+    )
+
+    clustered = (
+        select(
+            coarse_totals.c.n,
+            ST_ClusterDBSCAN(
+                adaptive_cell,
+                HOTSPOT_CLUSTER_EPS_DEGREES,
+                HOTSPOT_CLUSTER_MIN_POINTS,
+            )
+            .over()
+            .label("cluster_id"),
+        )
+    ).subquery()
+    # GROUP BY instead of COUNT(DISTINCT) lets the planner pick a
+    # HashAggregate; one row per cluster, then count rows and sum points
+    clusters = (
+        select(func.sum(clustered.c.n).label("n"))
+        .group_by(clustered.c.cluster_id)
+    ).subquery()
+    return select(
+        func.coalesce(func.sum(clusters.c.n), 0).label("point_count"),
+        func.count().label("hotspot_count"),
+    ).select_from(clusters)
+
+
+def _build_high_confidence_count_query():
+    """COUNT of high-confidence Media and VideoDetection points from the base tables."""
+    media_points = select(Media.id).where(
+        Media.uploader_id == bindparam("user_id"),
+        Media.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
+        Media.location.isnot(None),
+    )
+    video_points = (
+        select(VideoDetection.id)
+        .where(
+            VideoDetection.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
+            VideoDetection.location.isnot(None),
+            Media.uploader_id == bindparam("user_id"),
+        )
+        .join(Media, VideoDetection.media_id == Media.id)
+    )
+    points = union_all(media_points, video_points).subquery()
+    return select(func.count()).select_from(points)
+
+
+# Both statements are static apart from user_id, so build them once and let
+# every request hit the compiled statement cache
+_HOTSPOT_DENSITY_QUERY = _build_hotspot_density_query()
+_HIGH_CONFIDENCE_COUNT_QUERY = _build_high_confidence_count_query()
 
 
 async def get_hotspot_density(
@@ -20,100 +137,104 @@ async def get_hotspot_density(
 ) -> HotspotDensity:
     """
     Counts the number of geographical "clusters" with high-confidence trash detections.
-    
-    SQL Logic:
-    
-    Query 1 (High-confidence count):
-    - Simple COUNT of media with confidence >= 80 and valid location
-    - Provides raw count for "High-Priority Zones Found" metric
-    
-    Query 2 (Spatial clustering with PostGIS):
-    - Uses ST_SnapToGrid(location, 0.001) to snap points to a grid
+
+    SQL Logic (single round trip on the user_hotspot_grid materialized view):
+
+    Materialized view:
+    - UNION ALL of high-confidence (>= 80) Media and VideoDetection points
+      with a valid location, grouped by (uploader_id, ST_SnapToGrid(0.001))
     - Grid resolution of 0.001 degrees ≈ ~100m at the equator
-    - COUNT(DISTINCT snapped_point) gives number of unique grid cells
-    - This approximates the number of distinct "hotspots"
-    
+    - n holds the number of points per cell; refreshed concurrently every
+      few minutes by refresh_hotspot_grid (see main.py lifespan)
+
+    Adaptive two-level grid:
+    - Each fine cell is also snapped to a coarse 0.01 degree (~1km) cell
+    - Coarse cells with >= 10 points keep their fine cells; sparser coarse
+      cells collapse onto the coarse cell point, so scattered detections in
+      a ~1km area count as one hotspot and DBSCAN gets fewer input points
+
+    Spatial clustering with PostGIS:
+    - Uses ST_ClusterDBSCAN(cell, 0.0015, 1) OVER () on the adaptive cells
+    - SUM(n) is the raw high-confidence count for the
+      "High-Priority Zones Found" metric
+    - GROUP BY cluster_id (hash aggregate) then COUNT(*) gives the number
+      of distinct "hotspots"
+
     Why 80% confidence threshold:
         High-confidence detections (80%+) represent areas where the AI is
         very certain about trash presence. These are prioritized for cleanup.
-    
+
     Clustering Approach:
-        Full PostGIS ST_ClusterWithin would provide true spatial clustering,
-        but requires additional setup. This simplified approach using ST_SnapToGrid:
-        - Divides the map into ~100m x ~100m grid cells
-        - Counts unique cells with high-confidence media
-        - Close-by points snap to the same cell, reducing duplicate counts
-        - Provides a reasonable approximation without complex clustering
-    
+        DBSCAN runs over pre-aggregated grid cells instead of raw points, so
+        the per-request work depends on the number of occupied cells:
+        - Cells that touch (including diagonally) share a cluster
+        - With minpoints = 1 every cell belongs to a cluster, so an isolated
+          high-confidence detection still counts as its own hotspot
+        - Unlike plain grid counting, nearby points on either side of a cell
+          boundary are not split into two hotspots
+
     Fallback:
-        If PostGIS functions fail (e.g., not installed), falls back to
-        using raw media count as the hotspot count.
-    
+        If the startup probe found no PostGIS extension (HAS_POSTGIS is
+        False), runs a count-only query on the base tables and uses the raw
+        count as the hotspot count. Query errors are not swallowed.
+
     Returns:
         HotspotDensity containing:
         - hotspot_count: Number of distinct geographic clusters
         - high_confidence_media_count: Total high-confidence media items
     """
-    # Query 1: Count high-confidence items in both Media and VideoDetection
-    media_query = select(func.count(Media.id)).where(
-        Media.uploader_id == user_id,
-        Media.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
-        Media.location.isnot(None),
-    )
-    video_query = (
-        select(func.count(VideoDetection.id))
-        .where(
-            VideoDetection.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
-            VideoDetection.location.isnot(None),
-            Media.uploader_id == user_id,
+    if not HAS_POSTGIS:
+        # Fallback: without PostGIS, use total high-confidence count as hotspot count
+        total_high_confidence = (
+            await db.execute(_HIGH_CONFIDENCE_COUNT_QUERY, {"user_id": user_id})
+        ).scalar() or 0
+        return HotspotDensity.model_construct(
+            hotspot_count=total_high_confidence,
+            high_confidence_media_count=total_high_confidence,
         )
-        .join(Media, VideoDetection.media_id == Media.id)
-    )
 
-    media_count_result, video_count_result = await db.execute(
-        media_query
-    ), await db.execute(video_query)
-    media_count = media_count_result.scalar() or 0
-    video_count = video_count_result.scalar() or 0
-    total_high_confidence = media_count + video_count
-
-    # Query 2: Spatial clustering using PostGIS ST_SnapToGrid for both tables
-    try:
-        from geoalchemy2.functions import ST_SnapToGrid
-        from sqlalchemy import union_all
-
-        snapped_media = select(
-            ST_SnapToGrid(Media.location, HOTSPOT_GRID_RESOLUTION_DEGREES).label(
-                "snapped"
-            )
-        ).where(
-            Media.uploader_id == user_id,
-            Media.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
-            Media.location.isnot(None),
-        )
+    # Raw count and DBSCAN cluster count in one query
+    row = (await db.execute(_HOTSPOT_DENSITY_QUERY, {"user_id": user_id})).one()
+    total_high_confidence = int(row.point_count or 0)
+    hotspot_count = int(row.hotspot_count or 0)
 
-        snapped_video = (
-            select(
-                ST_SnapToGrid(
-                    VideoDetection.location, HOTSPOT_GRID_RESOLUTION_DEGREES
-                ).label("snapped")
-            )
-            .where(
-                VideoDetection.confidence >= HOTSPOT_CONFIDENCE_THRESHOLD,
-                VideoDetection.location.isnot(None),
-                Media.uploader_id == user_id,
-            )
-            .join(Media, VideoDetection.media_id == Media.id)
-        )
+    return HotspotDensity.model_construct(
+        hotspot_count=hotspot_count, high_confidence_media_count=total_high_confidence
+    )
 
-        unioned = union_all(snapped_media, snapped_video).subquery()
-        cluster_query = select(func.count(func.distinct(unioned.c.snapped)))
-        cluster_result = await db.execute(cluster_query)
-        hotspot_count = cluster_result.scalar() or 0
-    except Exception:
-        # Fallback: If PostGIS fails, use total high-confidence count as hotspot count
-        hotspot_count = total_high_confidence
 
-    return HotspotDensity(
-        hotspot_count=hotspot_count, high_confidence_media_count=total_high_confidence
+async def detect_postgis(db: AsyncSession) -> bool:
+    """Check once whether PostGIS is installed and record it in HAS_POSTGIS."""
+    global HAS_POSTGIS
+    result = await db.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
     )
+    HAS_POSTGIS = result.scalar() is not None
+    return HAS_POSTGIS
+
+
+# Transaction-level advisory lock key held while refreshing user_hotspot_grid
+HOTSPOT_GRID_REFRESH_LOCK_KEY = 8_305_021
+
+
+async def refresh_hotspot_grid(db: AsyncSession) -> bool:
+    """
+    Refresh user_hotspot_grid without blocking concurrent KPI reads.
+
+    Every app worker runs the periodic refresh; the advisory lock lets only
+    one of them recompute the view per round, the rest skip. The lock is
+    released when the caller's transaction ends.
+
+    Returns:
+        True if this call refreshed the view, False if another refresh held the lock
+    """
+    acquired = (
+        await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": HOTSPOT_GRID_REFRESH_LOCK_KEY},
+        )
+    ).scalar()
+    if not acquired:
+        return False
+    await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY user_hotspot_grid"))
+    return True
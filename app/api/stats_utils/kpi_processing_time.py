@@ -6,7 +6,7 @@ to READY status. This measures system responsiveness and identifies bottlenecks.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam
 
 from app.models.db.Media import Media
 from app.models.db.MediaLog import MediaLog
@@ -14,22 +14,80 @@ from app.models.upload.MediaStatus import MediaStatus
 from app.models.stats import ProcessingTime, MeanTimeToProcess
 
 
+def _build_mttp_query():
+    """MTTP statement with user_id as a bind parameter."""
+    # Per (media, worker) spans plus the whole-media span, from one grouping
+    spans = (
+        select(
+            MediaLog.media_id,
+            MediaLog.worker_name,
+            func.min(MediaLog.timestamp).label("start_time"),  # First log entry
+            func.max(MediaLog.timestamp).label("end_time"),  # Last log entry
+            func.min(func.min(MediaLog.timestamp))
+            .over(partition_by=MediaLog.media_id)
+            .label("media_start_time"),
+            func.max(func.max(MediaLog.timestamp))
+            .over(partition_by=MediaLog.media_id)
+            .label("media_end_time"),
+            func.row_number()
+            .over(partition_by=MediaLog.media_id)
+            .label("media_row"),
+        )
+        .join(Media, MediaLog.media_id == Media.id)
+        .where(
+            Media.uploader_id == bindparam("user_id"),
+            Media.status == MediaStatus.READY,  # Only successful completions
+        )
+        .group_by(MediaLog.media_id, MediaLog.worker_name)
+    ).cte("media_worker_spans")
+
+    # EXTRACT('epoch', interval) converts PostgreSQL interval to seconds
+    worker_seconds = func.extract("epoch", spans.c.end_time - spans.c.start_time)
+    media_seconds = func.extract(
+        "epoch", spans.c.media_end_time - spans.c.media_start_time
+    )
+    first_row_of_media = spans.c.media_row == 1
+
+    return (
+        select(
+            spans.c.worker_name,
+            func.avg(worker_seconds).label("avg_seconds"),
+            func.count(spans.c.media_id).label("task_count"),
+            (
+                func.sum(func.sum(media_seconds).filter(first_row_of_media)).over()
+                / func.nullif(
+                    func.sum(func.count().filter(first_row_of_media)).over(), 0
+                )
+            ).label("overall_avg"),
+        )
+        .group_by(spans.c.worker_name)
+    )
+
+
+_MTTP_QUERY = _build_mttp_query()
+
+
 async def get_mean_time_to_process(
     db: AsyncSession, user_id: str
 ) -> MeanTimeToProcess:
     """
     Calculates the average duration for a media item to reach READY status.
     
-    SQL Logic (Two-stage approach):
-
-    Stage 1 - Subqueries:
-    - Worker subquery: grouped by (media_id, worker_name) for per-worker metrics
-    - Overall subquery: grouped by media_id only for fleet-wide average
-    - Both only include READY media (successful completions)
-
-    Stage 2 - Aggregation:
-    - Per-worker: AVG(end_time - start_time) grouped by worker_name
-    - Fleet overall: AVG(end_time - start_time) across one row per media item
+    SQL Logic (single query, MediaLog scanned once):
+
+    CTE - one row per (media_id, worker_name):
+    - MIN/MAX(timestamp) grouped by (media_id, worker_name) give the
+      per-worker span for that media item
+    - MIN(MIN(timestamp)) / MAX(MAX(timestamp)) OVER (PARTITION BY media_id)
+      give the full pipeline span of the media item from the same groups
+    - ROW_NUMBER() OVER (PARTITION BY media_id) marks one row per media item
+    - Only includes READY media (successful completions)
+
+    Outer aggregation (GROUP BY worker_name):
+    - Per-worker: AVG(end_time - start_time) and COUNT of media items
+    - Fleet overall: SUM(media span) / COUNT(media) over the marked rows,
+      computed as a window over all groups so every row carries it
+      (one duration per media item avoids multi-worker double counting)
     - Uses EXTRACT('epoch', ...) to convert interval to seconds
 
     Processing Time Calculation:
@@ -39,87 +97,30 @@ async def get_mean_time_to_process(
     Identifying Bottlenecks:
         By grouping averages by worker_name, we can identify which workers
         are slower than others, helping prioritize optimization efforts.
+        Unassigned (NULL) and 'You' rows still count toward the fleet
+        average but are left out of the per-worker list.
 
     Returns:
         MeanTimeToProcess containing:
         - overall_avg_seconds: System-wide average processing time
         - by_worker: List of per-worker processing times and task counts
     """
-    # Stage 1a: Subquery to compute start/end times per media per worker
-    # Used for per-worker latency metrics
-    worker_subquery = (
-        select(
-            MediaLog.media_id,
-            MediaLog.worker_name,
-            func.min(MediaLog.timestamp).label("start_time"),  # First log entry
-            func.max(MediaLog.timestamp).label("end_time"),  # Last log entry
-        )
-        .join(Media, MediaLog.media_id == Media.id)
-        .where(
-            Media.uploader_id == user_id,
-            Media.status == MediaStatus.READY,  # Only successful completions
-        )
-        .group_by(MediaLog.media_id, MediaLog.worker_name)
-    ).subquery()
-
-    # Stage 1b: Subquery to compute full pipeline duration per media item
-    # Grouping only by media_id avoids multi-worker double counting in fleet average
-    overall_subquery = (
-        select(
-            MediaLog.media_id,
-            func.min(MediaLog.timestamp).label("start_time"),
-            func.max(MediaLog.timestamp).label("end_time"),
-        )
-        .join(Media, MediaLog.media_id == Media.id)
-        .where(Media.uploader_id == user_id, Media.status == MediaStatus.READY)
-        .group_by(MediaLog.media_id)
-    ).subquery()
-
-    # Stage 2a: Calculate average latency grouped by worker
-    # EXTRACT('epoch', interval) converts PostgreSQL interval to seconds
-    worker_query = (
-        select(
-            worker_subquery.c.worker_name,
-            func.avg(
-                func.extract(
-                    "epoch", worker_subquery.c.end_time - worker_subquery.c.start_time
-                )
-            ).label("avg_seconds"),
-            func.count(worker_subquery.c.media_id).label("task_count"),
-        )
-        .where(
-            worker_subquery.c.worker_name.isnot(None),  # Exclude unassigned tasks
-            worker_subquery.c.worker_name != "You",  # Exclude 'You' worker
-        )
-        .group_by(worker_subquery.c.worker_name)
-    )
-
-    worker_result = await db.execute(worker_query)
-    worker_rows = worker_result.all()
+    rows = (await db.execute(_MTTP_QUERY, {"user_id": user_id})).all()
 
     # Build per-worker processing time list
     by_worker = [
-        ProcessingTime(
+        ProcessingTime.model_construct(
             worker_name=row.worker_name,
             avg_processing_seconds=round(float(row.avg_seconds or 0), 2),
             task_count=row.task_count
         )
-        for row in worker_rows
+        for row in rows
+        # Exclude unassigned tasks and the 'You' worker
+        if row.worker_name is not None and row.worker_name != "You"
     ]
+    overall_avg = (rows[0].overall_avg if rows else None) or 0
 
-    # Stage 2b: Calculate fleet-wide average from one duration per media item
-    overall_query = select(
-        func.avg(
-            func.extract(
-                "epoch", overall_subquery.c.end_time - overall_subquery.c.start_time
-            )
-        ).label("overall_avg")
-    )
-
-    overall_result = await db.execute(overall_query)
-    overall_avg = overall_result.scalar() or 0
-
-    return MeanTimeToProcess(
+    return MeanTimeToProcess.model_construct(
         overall_avg_seconds=round(float(overall_avg), 2),
         by_worker=by_worker
     )
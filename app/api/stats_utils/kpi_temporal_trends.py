@@ -6,13 +6,64 @@ This helps users visualize trends and identify peak periods of environmental imp
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, column, bindparam, Date, DateTime
 from datetime import datetime, timezone, timedelta
 
 from app.models.db.Media import Media
 from app.models.stats import TemporalTrend
 
 
+def _build_temporal_trends_query():
+    """Trends statement with user_id, start_day and end_day as bind parameters."""
+    # Window bounds are bound per request, as UTC calendar dates
+    start_day = bindparam("start_day", type_=Date)
+    end_day = bindparam("end_day", type_=Date)
+
+    # Bucket by the UTC calendar day explicitly: a bare date_trunc('day', ...)
+    # truncates in the session TimeZone, which would shift every bucket away
+    # from the UTC calendar on any non-UTC database or role setting
+    day_bucket = cast(func.timezone("UTC", Media.created_at), Date)
+
+    daily_counts = (
+        select(
+            day_bucket.label("day"),
+            func.count(Media.id).label("count"),
+        )
+        .where(
+            Media.uploader_id == bindparam("user_id"),
+            Media.has_trash == True,  # Only count media containing detected trash
+            # UTC midnight of the first day; a constant, so the index still applies
+            Media.created_at >= func.timezone("UTC", cast(start_day, DateTime)),
+        )
+        .group_by(day_bucket)
+    ).subquery()
+
+    # One row per day in the window, days without reports included. The
+    # series runs over plain timestamps so the session TimeZone plays no part
+    calendar = (
+        func.generate_series(
+            cast(start_day, DateTime), cast(end_day, DateTime), timedelta(days=1)
+        )
+        .table_valued(column("day", DateTime))
+        .render_derived("calendar")
+    )
+    calendar_day = cast(calendar.c.day, Date)
+
+    return (
+        select(
+            calendar_day.label("day"),
+            func.coalesce(daily_counts.c.count, 0).label("count"),
+        )
+        .select_from(calendar)
+        .outerjoin(daily_counts, daily_counts.c.day == calendar_day)
+        .order_by(calendar.c.day)
+    )
+
+
+# Compiled once and reused; only the user and the window change per request
+_TEMPORAL_TRENDS_QUERY = _build_temporal_trends_query()
+
+
 async def get_temporal_trends(
     db: AsyncSession, user_id: str, days: int
 ) -> list[TemporalTrend]:
@@ -20,18 +71,16 @@ async def get_temporal_trends(
     Tracks the number of trash reports generated per day over a time window.
     
     SQL Logic:
-    - Uses DATE_TRUNC('day', created_at) to bucket timestamps into daily intervals
+    - Buckets created_at by its UTC calendar day (timezone('UTC', created_at)::date)
     - Filters for has_trash == True to focus on environmental impact, not just uploads
-    - Applies cutoff_date filter based on the 'days' parameter
-    - Groups and orders by day for chronological output
+    - Applies a start-of-window filter based on the 'days' parameter
+    - generate_series(start_day, today, '1 day') LEFT JOIN the daily counts
+      returns exactly one row per day, in chronological order
     
     Zero-Day Filling:
-        The database query only returns days with actual data. To ensure a continuous
-        line chart without gaps, we programmatically fill in "zero-days" (days with
-        no reports) in the response. This is done by:
-        1. Converting query results to a date->count dictionary
-        2. Iterating through each day in the window
-        3. Using dict.get(date, 0) to default missing days to 0
+        Days with no reports have no row in the daily counts, so the LEFT JOIN
+        leaves them NULL and COALESCE(count, 0) turns them into "zero-days".
+        The chart gets a continuous line without any Python-side padding.
     
     Args:
         days: Number of days to look back (e.g., 7 for weekly, 30 for monthly)
@@ -39,44 +88,17 @@ async def get_temporal_trends(
     Returns:
         List of TemporalTrend objects, one per day in the window (including zero-days)
     """
-    # Calculate the cutoff date (start of our time window)
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-    day_bucket = func.date_trunc("day", Media.created_at)
+    # Window of 'days' UTC calendar days ending today
+    end_day = datetime.now(timezone.utc).date()
+    start_day = end_day - timedelta(days=days - 1)
 
-    query = (
-        select(
-            # Truncate timestamp to day precision for daily bucketing
-            day_bucket.label("day"),
-            func.count(Media.id).label("count"),
-        )
-        .where(
-            Media.uploader_id == user_id,
-            Media.has_trash == True,  # Only count media containing detected trash
-            Media.created_at >= cutoff_date,
-        )
-        .group_by(day_bucket)
-        .order_by(day_bucket)
+    result = await db.execute(
+        _TEMPORAL_TRENDS_QUERY,
+        {"user_id": user_id, "start_day": start_day, "end_day": end_day},
     )
 
-    result = await db.execute(query)
-    rows = result.all()
-
-    # Create a lookup dict: date -> count for O(1) access
-    data_by_date = {row[0].date(): int(row[1]) for row in rows}
-
-    # Fill in zero-days for continuous chart rendering
-    # Start from (days-1) ago to include 'days' total days ending today
-    trends = []
-    current_date = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
-    end_date = datetime.now(timezone.utc).date()
-
-    while current_date <= end_date:
-        count_val = data_by_date.get(current_date, 0)  # Default to 0 if no data
-        trends.append(TemporalTrend(
-            date=current_date,
-            count=int(count_val)
-        ))
-        current_date += timedelta(days=1)
-
-    return trends
+    # Values are trusted (DB counts / generated dates), so skip validation
+    return [
+        TemporalTrend.model_construct(date=row.day, count=int(row.count))
+        for row in result.all()
+    ]
@@ -7,25 +7,90 @@ of environmental waste are most prevalent in their scanned areas.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case, literal, union_all, bindparam, Integer
 
 from app.models.db.Media import Media
 from app.models.db.Detection import Detection
 from app.models.db.VideoDetection import VideoDetection
 from app.models.stats import TrashCompositionItem
 
+TRASH_COMPOSITION_MAX_LABELS = 20
+TRASH_COMPOSITION_OTHER_LABEL = "other"
+
+
+def _build_trash_composition_query():
+    """Composition statement with user_id and limit as bind parameters."""
+    # Labels from both image and video detections of this user's media
+    labels = union_all(
+        select(Detection.label.label("label"))
+        .join(Media, Detection.media_id == Media.id)
+        .where(Media.uploader_id == bindparam("user_id")),
+        select(VideoDetection.label.label("label"))
+        .join(Media, VideoDetection.media_id == Media.id)
+        .where(Media.uploader_id == bindparam("user_id")),
+    ).subquery()
+
+    label_counts = (
+        select(labels.c.label, func.count().label("count"))
+        .group_by(labels.c.label)
+    ).subquery()
+
+    ranked = select(
+        label_counts.c.label,
+        label_counts.c.count,
+        func.row_number()
+        .over(order_by=(label_counts.c.count.desc(), label_counts.c.label))
+        .label("rank"),
+    ).subquery()
+
+    # Keep the top `limit` labels, fold the tail into "other"
+    bucketed = select(
+        case(
+            (ranked.c.rank <= bindparam("limit", type_=Integer), ranked.c.label),
+            else_=literal(TRASH_COMPOSITION_OTHER_LABEL),
+        ).label("label"),
+        ranked.c.count,
+        ranked.c.rank,
+    ).subquery()
+    bucket_count = func.sum(bucketed.c.count)
+    return (
+        select(
+            bucketed.c.label,
+            bucket_count.label("count"),
+            func.round(
+                bucket_count * 100 / func.nullif(func.sum(bucket_count).over(), 0),
+                2,
+            ).label("percentage"),
+        )
+        .group_by(bucketed.c.label)
+        .order_by(func.min(bucketed.c.rank))
+    )
+
+
+# Built once at import; user_id and limit are bound per request, so the
+# compiled SQL is reused from the statement cache
+_TRASH_COMPOSITION_QUERY = _build_trash_composition_query()
+
 
 async def get_trash_composition(
-    db: AsyncSession, user_id: str
+    db: AsyncSession, user_id: str, limit: int = TRASH_COMPOSITION_MAX_LABELS
 ) -> list[TrashCompositionItem]:
     """
     Calculates the percentage distribution of identified trash types.
     
     SQL Logic:
-    - JOIN Detection -> Media to link detections to their parent media
+    - UNION ALL of Detection and VideoDetection labels, each joined to Media
     - Filter by current user's uploads (Media.uploader_id = user_id)
-    - GROUP BY detection label to aggregate counts per trash type
-    - ORDER BY count DESC to show most common types first
+    - GROUP BY label to aggregate counts per trash type
+    - ROW_NUMBER() over count DESC ranks the labels
+    - Labels ranked beyond `limit` are folded into a single "other" bucket,
+      so the response size is bounded regardless of label cardinality
+    - ORDER BY rank keeps the most common types first and "other" last
+    - Percentage = count * 100 / SUM(count) OVER (), rounded to 2 decimals in
+      SQL, so no Python-side total is needed
+    
+    Args:
+        limit: Maximum number of individual labels before bucketing the tail
     
     Returns:
         List of TrashCompositionItem with label, count, and percentage (0-100)
@@ -34,44 +99,17 @@ async def get_trash_composition(
         [{"label": "plastic", "count": 150, "percentage": 45.5},
          {"label": "metal", "count": 100, "percentage": 30.3}, ...]
     """
-    # Query Detection counts
-    detection_query = (
-        select(Detection.label, func.count(Detection.id).label("count"))
-        .join(Media, Detection.media_id == Media.id)
-        .where(Media.uploader_id == user_id)
-        .group_by(Detection.label)
-    )
-    detection_result = await db.execute(detection_query)
-    detection_rows = detection_result.all()
-
-    # Query VideoDetection counts
-    video_query = (
-        select(VideoDetection.label, func.count(VideoDetection.id).label("count"))
-        .join(Media, VideoDetection.media_id == Media.id)
-        .where(Media.uploader_id == user_id)
-        .group_by(VideoDetection.label)
-    )
-    video_result = await db.execute(video_query)
-    video_rows = video_result.all()
-
-    # Combine counts per label
-    from collections import defaultdict
-
-    label_counts = defaultdict(int)
-    for row in detection_rows:
-        label_counts[str(row[0])] += int(row[1])
-    for row in video_rows:
-        label_counts[str(row[0])] += int(row[1])
-
-    # Sort by count descending
-    sorted_items = sorted(label_counts.items(), key=lambda x: x[1], reverse=True)
-    total = sum(count for _, count in sorted_items)
+    rows = (
+        await db.execute(
+            _TRASH_COMPOSITION_QUERY, {"user_id": user_id, "limit": limit}
+        )
+    ).all()
 
     return [
-        TrashCompositionItem(
-            label=label,
-            count=count,
-            percentage=round((count / total * 100) if total > 0 else 0, 2),
+        TrashCompositionItem.model_construct(
+            label=str(row[0]),
+            count=int(row[1]),
+            percentage=float(row[2] or 0),
         )
-        for label, count in sorted_items
+        for row in rows
     ]
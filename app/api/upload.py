@@ -13,63 +13,190 @@ from app.database import AsyncSessionLocal
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.api.deps import get_current_user, get_current_user_from_token
-from app.api.medialog_utils.media_log_utils import create_status_change_log
+from app.api.medialog_utils.media_log_utils import (
+    create_status_change_log,
+    status_change_log_values,
+)
 from app.models.db.Media import Media
+from app.models.db.MediaLog import MediaLog
 from app.models.upload.MediaStatus import MediaStatus
 from app.api.upload_utils.conn_manager import worker_signal, manager
+from app.api.upload_utils.bulk_insert import bulk_insert_rows
+from app.api.stats_utils.cache import invalidate_user_stats
 from PIL import Image
-import io
 import uuid
+import io
+import hashlib
 import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import tempfile
 import os
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi import HTTPException, status
 from app.models.upload.UploadResponse import UploadResponse, RecentsResponse
-from app.api.upload_utils.hf_upload import process_hf_upload, process_video_hf_upload
-from sqlalchemy import select
+from app.api.upload_utils.hf_upload import (
+    process_hf_upload,
+    process_video_hf_upload,
+    run_hf_call,
+    hf_api,
+)
+from sqlalchemy import select, bindparam
 from app.api.upload_utils.video_file_helpers import (
     save_video_chunk_to_temp,
     assemble_video_from_chunks,
 )
 from app.api.upload_utils.video_thumbnail import extract_video_thumbnail
 from app.api.upload_utils.hf_upload import process_hf_upload
-from huggingface_hub import HfApi, CommitOperationAdd
 import shutil
 from app.models.db.Media import MediaType
 from app.models.db.VideoDetection import VideoDetection
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+logger = logging.getLogger(__name__)
 
 THUMBNAIL_SIZE = (400, 400)
 
+# PIL decode/thumbnail/JPEG encode is CPU-bound; worker processes give real
+# multi-core parallelism for a batch instead of contending for the GIL with
+# the event loop. Processes are only spawned on first use.
+IMAGE_PROCESS_WORKERS = os.cpu_count() or 1
+# Buffer size used when streaming uploads to disk
+UPLOAD_COPY_BUFFER_SIZE = 64 * 1024
+
+
+def _new_image_pool() -> ProcessPoolExecutor:
+    # forkserver, not the Linux default fork: this process already runs the
+    # event loop, thread pools and network clients, and forking a
+    # multi-threaded process can deadlock the children
+    return ProcessPoolExecutor(
+        max_workers=IMAGE_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
 
-def _process_image_to_temp(
-    content: bytes, media_id: uuid.UUID
-) -> tuple[int, int, str, str]:
+
+_image_pool = _new_image_pool()
+
+
+async def _run_in_image_pool(fn, *args):
     """
-    CPU-bound image processing: extract dimensions, create thumbnail, and save both to temp files.
-    This function runs in a thread pool to avoid blocking the event loop.
-    Returns: (width, height, content_temp_path, thumbnail_temp_path)
+    Run fn(*args) in the image worker pool.
+
+    A worker that dies (e.g. OOM on a huge image) leaves the pool broken for
+    every later call, so a broken pool is replaced once and the call retried.
     """
-    img = Image.open(io.BytesIO(content))
-    width, height = img.size
+    global _image_pool
+    loop = asyncio.get_running_loop()
+    pool = _image_pool
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # Concurrent calls that hit the same broken pool share one replacement
+        if _image_pool is pool:
+            logger.warning("Image worker pool broke; starting a new one")
+            _image_pool = _new_image_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(_image_pool, fn, *args)
+
+# Accepted image formats by magic bytes: (offset, signature, PIL format name)
+IMAGE_SNIFF_BYTES = 16
+IMAGE_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "JPEG"),
+    (0, b"\x89PNG\r\n\x1a\n", "PNG"),
+    (8, b"WEBP", "WEBP"),  # RIFF container, checked below
+    (0, b"BM", "BMP"),
+    (0, b"II*\x00", "TIFF"),
+    (0, b"MM\x00*", "TIFF"),
+)
+
 
-    thumbnail_img = img.copy()
-    thumbnail_img.thumbnail(THUMBNAIL_SIZE)
-    if thumbnail_img.mode != "RGB":
-        thumbnail_img = thumbnail_img.convert("RGB")
+class UndecodableImageError(Exception):
+    """An upload with a valid image signature that PIL could not decode."""
 
-    # Save original content to temp file
+
+def _sniff_image_format(header: bytes) -> str | None:
+    """Return the PIL format name for a file header, or None if not accepted."""
+    for offset, signature, image_format in IMAGE_SIGNATURES:
+        if header[offset : offset + len(signature)] == signature:
+            if image_format == "WEBP" and not header.startswith(b"RIFF"):
+                continue
+            return image_format
+    return None
+
+
+def _save_upload_to_temp(upload_file, media_id: uuid.UUID) -> tuple[str, str]:
+    """
+    Blocking I/O: stream an uploaded file to a temp file in fixed-size chunks,
+    so the full image never has to sit in Python memory. The SHA-256 of the
+    content is computed from the same chunks (used to skip re-uploading
+    identical files to HF).
+    Returns: (content_temp_path, content_sha256)
+    """
     content_temp_path = os.path.join(tempfile.gettempdir(), f"{media_id}_content")
+    digest = hashlib.sha256()
     with open(content_temp_path, "wb") as f:
-        f.write(content)
+        while chunk := upload_file.read(UPLOAD_COPY_BUFFER_SIZE):
+            digest.update(chunk)
+            f.write(chunk)
+    return content_temp_path, digest.hexdigest()
+
+
+def _remove_temp_files(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _write_bytes_to_temp(path: str, data: bytes | memoryview) -> None:
+    """
+    Write an in-memory payload with raw os.open/os.write, skipping the
+    buffered file object layer (the data is already a single bytes object).
+    The file is created owner-only (0o600).
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _process_image_to_temp(
+    content_temp_path: str, media_id: uuid.UUID, image_format: str
+) -> tuple[int, int, str]:
+    """
+    CPU-bound image processing: read dimensions and save a thumbnail to a temp file.
+    The original is read lazily from content_temp_path (pixels are only decoded
+    for the thumbnail). This function runs in a worker process to avoid
+    blocking the event loop. image_format is the sniffed PIL format, so PIL
+    skips probing every registered plugin.
+    Returns: (width, height, thumbnail_temp_path)
+    """
+    with Image.open(content_temp_path, formats=[image_format]) as img:
+        # Header-only probe; no pixel data is decoded for the dimensions
+        width, height = img.size
+
+        # JPEG: let libjpeg decode straight at the smallest DCT scale (1/2, 1/4,
+        # 1/8) that still covers the thumbnail, and convert to RGB while doing
+        # so. No-op for other formats.
+        img.draft("RGB", THUMBNAIL_SIZE)
+        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        thumbnail_img = img if img.mode == "RGB" else img.convert("RGB")
+
+        # Encode into memory, then dump it to the temp file in one write
+        thumbnail_buffer = io.BytesIO()
+        thumbnail_img.save(thumbnail_buffer, format="JPEG", quality=85, optimize=True)
 
-    # Save thumbnail to temp file
     thumbnail_temp_path = os.path.join(tempfile.gettempdir(), f"{media_id}_thumbnail")
-    thumbnail_img.save(thumbnail_temp_path, format="JPEG", quality=85, optimize=True)
+    _write_bytes_to_temp(thumbnail_temp_path, thumbnail_buffer.getbuffer())
 
-    return width, height, content_temp_path, thumbnail_temp_path
+    return width, height, thumbnail_temp_path
 
 
 @router.post(
@@ -83,52 +210,122 @@ async def batch_upload(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    media_records = []
+    media_rows = []
+    log_rows = []
     files_to_process = []
+    status_updates = []
 
+    # Reject the batch on an unknown format before any disk or PIL work
+    image_formats = []
     for file in files:
-        content = await file.read()
+        image_format = _sniff_image_format(file.file.read(IMAGE_SNIFF_BYTES))
+        file.file.seek(0)
+        if image_format is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported image format: {file.filename}",
+            )
+        image_formats.append(image_format)
+
+    async def prepare_file(file: UploadFile, image_format: str):
         media_id = uuid.uuid4()
 
-        # Run CPU-bound image processing in a thread and save to temp files
-        # This frees RAM immediately after processing each file
-        width, height, content_path, thumbnail_path = await asyncio.to_thread(
-            _process_image_to_temp, content, media_id
-        )
-        # Release the in-memory content immediately
-        del content
-
-        new_media = Media(
-            id=media_id,
-            uploader_id=current_user.id,
-            status=MediaStatus.PENDING,
-            initial_metadata={
-                "filename": file.filename,
-                "size": os.path.getsize(content_path),
-                "width": width,
-                "height": height,
-            },
+        try:
+            # Stream the upload straight to disk instead of reading it into memory
+            content_path, content_sha256 = await asyncio.to_thread(
+                _save_upload_to_temp, file.file, media_id
+            )
+
+            # Run CPU-bound image processing in a worker process; it reads the
+            # original from disk and saves the thumbnail to a temp file
+            try:
+                width, height, thumbnail_path = await _run_in_image_pool(
+                    _process_image_to_temp, content_path, media_id, image_format
+                )
+            except (OSError, Image.DecompressionBombError) as e:
+                # PIL decode errors (UnidentifiedImageError is an OSError)
+                raise UndecodableImageError(file.filename) from e
+        except BaseException:
+            # Whatever this file already wrote (the paths are fixed per id)
+            _remove_temp_files(
+                os.path.join(tempfile.gettempdir(), f"{media_id}_content"),
+                os.path.join(tempfile.gettempdir(), f"{media_id}_thumbnail"),
+            )
+            raise
+        return media_id, (width, height, content_path, thumbnail_path, content_sha256)
+
+    # Process the whole batch in parallel across the pool's processes. Every
+    # file runs to completion so a failed batch can clean up all temp files
+    prepared_files = await asyncio.gather(
+        *(
+            prepare_file(file, image_format)
+            for file, image_format in zip(files, image_formats)
+        ),
+        return_exceptions=True,
+    )
+    failures = [
+        (file, result)
+        for file, result in zip(files, prepared_files)
+        if isinstance(result, BaseException)
+    ]
+    if failures:
+        for result in prepared_files:
+            if not isinstance(result, BaseException):
+                _, (_, _, content_path, thumbnail_path, _) = result
+                _remove_temp_files(content_path, thumbnail_path)
+
+        for _, error in failures:
+            if not isinstance(error, UndecodableImageError):
+                raise error
+        # The bytes passed the format sniff but aren't a valid image
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Could not decode image: {failures[0][0].filename}",
         )
 
-        insert_log = create_status_change_log(
-            media_id=media_id,
-            status=MediaStatus.PENDING,
+    for file, (media_id, processed) in zip(files, prepared_files):
+        width, height, content_path, thumbnail_path, content_sha256 = processed
+
+        media_rows.append(
+            {
+                "id": media_id,
+                "uploader_id": current_user.id,
+                "status": MediaStatus.PENDING,
+                "content_sha256": content_sha256,
+                "initial_metadata": {
+                    "filename": file.filename,
+                    "size": os.path.getsize(content_path),
+                    "width": width,
+                    "height": height,
+                },
+            }
+        )
+        log_rows.append(
+            status_change_log_values(
+                media_id=media_id,
+                status=MediaStatus.PENDING,
+            )
         )
-        db.add(insert_log)
 
-        await manager.send_status(
-            user_id=str(current_user.id),
-            media_id=str(media_id),
-            status=MediaStatus.PENDING.value,
-            worker=None,
+        status_updates.append(
+            {"media_id": str(media_id), "status": MediaStatus.PENDING.value}
         )
 
-        media_records.append(new_media)
         # Pass file paths instead of raw bytes
-        files_to_process.append((media_id, file.filename, content_path, thumbnail_path))
+        files_to_process.append(
+            (media_id, file.filename, content_path, thumbnail_path, content_sha256)
+        )
 
-    db.add_all(media_records)
+    # One bulk write per table for the whole batch (media first for the log
+    # FK), without ORM object/identity-map bookkeeping; COPY for large batches
+    await bulk_insert_rows(db, Media, media_rows)
+    await bulk_insert_rows(db, MediaLog, log_rows)
     await db.commit()
+    # New media changes this user's stats; drop their cached KPIs/summaries
+    await invalidate_user_stats(str(current_user.id))
+
+    # Notify the dashboard once per batch, after the rows are committed
+    await manager.send_status_batch(str(current_user.id), status_updates)
 
     background_tasks.add_task(
         process_hf_upload,
@@ -136,15 +333,68 @@ async def batch_upload(
         current_user.id,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
-            "message": f"{len(media_records)} files uploaded successfully",
-            "media_ids": [str(m.id) for m in media_records],
+            "message": f"{len(media_rows)} files uploaded successfully",
+            "media_ids": [str(row["id"]) for row in media_rows],
         },
         status_code=status.HTTP_201_CREATED,
     )
 
 
+# /recents statements, built once; user_id is bound per request.
+# Column projections: no ORM hydration/identity-map work, no geometry
+# column, and no selectin load of Media.detections
+_RECENT_MEDIA_QUERY = (
+    select(
+        Media.id,
+        Media.uploader_id,
+        Media.status,
+        Media.hf_path,
+        Media.initial_metadata,
+        Media.technical_metadata,
+        Media.assigned_worker,
+        Media.created_at,
+        Media.updated_at,
+        Media.lat,
+        Media.lng,
+        Media.altitude,
+        Media.address,
+        Media.has_trash,
+        Media.confidence,
+        Media.failed_reason,
+    )
+    .where(Media.uploader_id == bindparam("user_id"))
+    .order_by(Media.created_at.desc())
+    .limit(4)
+)
+
+_RECENT_VIDEO_DETECTIONS_QUERY = (
+    select(
+        VideoDetection.id,
+        VideoDetection.media_id,
+        VideoDetection.lat,
+        VideoDetection.lng,
+        VideoDetection.altitude,
+        VideoDetection.address,
+        VideoDetection.label,
+        VideoDetection.confidence,
+        VideoDetection.bbox,
+        VideoDetection.timestamp_in_video,
+        VideoDetection.frame_hf_path,
+        VideoDetection.created_at,
+        VideoDetection.area_sqm,
+    )
+    .where(
+        VideoDetection.media_id.in_(
+            select(Media.id).where(Media.uploader_id == bindparam("user_id"))
+        )
+    )
+    .order_by(VideoDetection.created_at.desc())
+    .limit(4)
+)
+
+
 @router.get(
     "/recents",
     status_code=status.HTTP_200_OK,
@@ -153,77 +403,22 @@ async def batch_upload(
 async def get_recents(
     db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)
 ):
+    params = {"user_id": current_user.id}
     # 1. Fetch 4 recent media items
-    media_query = (
-        select(Media)
-        .where(Media.uploader_id == current_user.id)
-        .order_by(Media.created_at.desc())
-        .limit(4)
-    )
-    media_result = await db.execute(media_query)
-    recent_media = media_result.scalars().all()
+    recent_media = (await db.execute(_RECENT_MEDIA_QUERY, params)).all()
 
     # 2. Fetch 4 recent video detections
-    video_query = (
-        select(VideoDetection)
-        .where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(Media.uploader_id == current_user.id)
-            )
-        )
-        .order_by(VideoDetection.created_at.desc())
-        .limit(4)
-    )
-    video_result = await db.execute(video_query)
-    recent_videos = video_result.scalars().all()
+    recent_videos = (await db.execute(_RECENT_VIDEO_DETECTIONS_QUERY, params)).all()
 
-    # 3. Return the exact same structure as the Vault endpoint
-    return {
-        "total": len(recent_media) + len(recent_videos),
-        "image_items": [
-            {
-                "id": str(media.id),
-                "uploader_id": str(media.uploader_id),
-                "status": (
-                    media.status.value
-                    if hasattr(media.status, "value")
-                    else media.status
-                ),
-                "hf_path": media.hf_path,
-                "initial_metadata": media.initial_metadata,
-                "technical_metadata": media.technical_metadata,
-                "assigned_worker": media.assigned_worker,
-                "created_at": media.created_at.isoformat(),
-                "updated_at": media.updated_at.isoformat(),
-                "lat": media.lat,
-                "lng": media.lng,
-                "altitude": media.altitude,
-                "address": media.address,
-                "has_trash": media.has_trash,
-                "confidence": media.confidence,
-                "failed_reason": media.failed_reason,
-            }
-            for media in recent_media
-        ],
-        "video_items": [
-            {
-                "id": str(video_det.id),
-                "media_id": str(video_det.media_id),
-                "lat": video_det.lat,
-                "lng": video_det.lng,
-                "altitude": video_det.altitude,
-                "address": video_det.address,
-                "label": video_det.label,
-                "confidence": video_det.confidence,
-                "bbox": video_det.bbox,
-                "timestamp_in_video": video_det.timestamp_in_video,
-                "frame_hf_path": video_det.frame_hf_path,
-                "created_at": video_det.created_at.isoformat(),
-                "area_sqm": video_det.area_sqm,
-            }
-            for video_det in recent_videos
-        ],
-    }
+    # 3. Return the exact same structure as the Vault endpoint; rows are
+    # keyed by the item field names and orjson encodes the raw values
+    return ORJSONResponse(
+        content={
+            "total": len(recent_media) + len(recent_videos),
+            "image_items": [dict(row._mapping) for row in recent_media],
+            "video_items": [dict(row._mapping) for row in recent_videos],
+        }
+    )
 
 
 from fastapi import Form
@@ -268,7 +463,7 @@ async def video_init(
         worker=None,
     )
 
-    return JSONResponse(content={"media_id": str(media_id)})
+    return ORJSONResponse(content={"media_id": str(media_id)})
 
 
 @router.post("/video/chunk/{media_id}")
@@ -299,19 +494,18 @@ async def video_chunk(
         raise HTTPException(status_code=404, detail="Temp dir for media_id not found")
     chunk_path = os.path.join(temp_dir, f"chunk_{chunk_index}")
     if os.path.exists(chunk_path):
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "status": "duplicate",
                 "detail": f"Chunk {chunk_index} already uploaded",
             },
             status_code=200,
         )
-    chunk_bytes = await chunk.read()
+    # Stream the chunk to disk without materializing it in memory
     await asyncio.to_thread(
-        save_video_chunk_to_temp, str(media_uuid), chunk_index, chunk_bytes
+        save_video_chunk_to_temp, str(media_uuid), chunk_index, chunk.file
     )
-    del chunk_bytes
-    return JSONResponse(content={"status": "ok"})
+    return ORJSONResponse(content={"status": "ok"})
 
 
 @router.post("/video/complete/{media_id}")
@@ -334,7 +528,7 @@ async def video_complete(
         if not os.path.exists(os.path.join(temp_dir, f"chunk_{i}"))
     ]
     if missing_chunks:
-        return JSONResponse(
+        return ORJSONResponse(
             content={"status": "incomplete", "missing_chunks": missing_chunks},
             status_code=400,
         )
@@ -356,7 +550,6 @@ async def video_complete(
     HF_REPO_ID = os.getenv("HF_REPO_ID")
     if not HF_REPO_ID or not HF_TOKEN:
         raise HTTPException(status_code=500, detail="HF_REPO_ID or HF_TOKEN not set")
-    api = HfApi(token=HF_TOKEN)
     from datetime import datetime, timezone
 
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -364,15 +557,13 @@ async def video_complete(
         f"media/{current_user.id}/{date_str}/{media_uuid}_video_thumbnail.jpg"
     )
     try:
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: api.upload_file(
-                path_or_fileobj=thumbnail_path,
-                path_in_repo=thumb_hf_path,
-                repo_id=HF_REPO_ID,
-                repo_type="dataset",
-                commit_message=f"Upload video thumbnail for {media_uuid}",
-            ),
+        await run_hf_call(
+            hf_api.upload_file,
+            path_or_fileobj=thumbnail_path,
+            path_in_repo=thumb_hf_path,
+            repo_id=HF_REPO_ID,
+            repo_type="dataset",
+            commit_message=f"Upload video thumbnail for {media_uuid}",
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"HF upload failed: {e}")
@@ -406,7 +597,7 @@ async def video_complete(
         video_hf_path=video_hf_path,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "status": "complete",
             "video_path": video_path,
@@ -450,13 +641,15 @@ async def video_cancel(
         worker=None,
     )
 
-    return JSONResponse(content={"status": "cancelled"})
+    return ORJSONResponse(content={"status": "cancelled"})
 
 
 @router.websocket("/ws/updates")
 async def websocket_updates(
     websocket: WebSocket,
     token: str | None = Query(None),
+    # Dashboards that handle MEDIA_STATUS_BATCH frames connect with ?batch=true
+    batch: bool = Query(False),
     # REMOVE db = Depends(get_db)
 ):
     auth_token = websocket.cookies.get("access_token") or token
@@ -477,11 +670,11 @@ async def websocket_updates(
     # The 'async with' block ends here. The DB connection is now safely returned
     # to the pool, but we still have the `user` object in memory!
 
-    await manager.connect(user.id, websocket)
+    await manager.connect(user.id, websocket, batch=batch)
 
     # 2. Enter the infinite loop safely
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(user.id)
+        manager.disconnect(user.id, websocket)
@@ -0,0 +1,54 @@
+"""
+Adaptive (AIMD) concurrency limit for calls to a rate-limited service.
+
+The limit grows by one after each successful call and halves when the
+service reports overload, like TCP congestion control: healthy periods use
+more parallelism, a burst of 429s quickly backs off instead of spending the
+remaining slots on requests that will be rejected too.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, min_limit: int = 1, max_limit: int = 16, initial: int = 4):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = initial
+        self._active = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one slot while the body runs.
+
+        Leaving normally counts as a success (limit + 1); raising
+        OverloadedError counts as overload (limit / 2). Other exceptions
+        leave the limit unchanged.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+        success = False
+        overloaded = False
+        try:
+            yield
+            success = True
+        except OverloadedError:
+            overloaded = True
+            raise
+        finally:
+            async with self._changed:
+                self._active -= 1
+                if success:
+                    self.limit = min(self.max_limit, self.limit + 1)
+                elif overloaded:
+                    self.limit = max(self.min_limit, self.limit // 2)
+                self._changed.notify_all()
+
+
+class OverloadedError(Exception):
+    """The service rejected the call because it is overloaded (e.g. HTTP 429)."""
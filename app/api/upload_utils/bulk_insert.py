@@ -0,0 +1,78 @@
+"""
+Bulk row writes for upload batches.
+
+Small batches go through one ORM bulk INSERT (executemany). From
+BULK_COPY_MIN_ROWS rows on (e.g. dashcam bulk uploads) the rows are streamed
+with asyncpg's COPY protocol instead: no per-row parse/plan, one data stream
+for the whole batch. COPY costs an extra round trip to introspect the column
+types, which is why small batches keep the INSERT path.
+"""
+
+import enum
+import json
+
+from sqlalchemy import JSON, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BULK_COPY_MIN_ROWS = 100
+
+
+def _copy_value(column, value):
+    """Convert a Python value the way the SQLAlchemy column type would bind it."""
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store the member name
+        return value.name
+    if isinstance(column.type, JSON):
+        # asyncpg's json codec (set up by SQLAlchemy) expects a JSON string
+        return json.dumps(value)
+    return value
+
+
+def _copy_records(model, rows: list[dict]) -> tuple[list[str], list[tuple]]:
+    """
+    Build COPY column names and records for `rows`.
+
+    COPY bypasses SQLAlchemy, so Python-side column defaults (ids,
+    timestamps, flags) are applied here for columns the rows don't set.
+    """
+    columns = [
+        column
+        for column in model.__table__.columns
+        if column.key in rows[0] or column.default is not None
+    ]
+
+    records = []
+    for row in rows:
+        record = []
+        for column in columns:
+            if column.key in row:
+                value = row[column.key]
+            elif column.default.is_callable:
+                value = column.default.arg(None)
+            else:
+                value = column.default.arg
+            record.append(_copy_value(column, value))
+        records.append(tuple(record))
+
+    return [column.name for column in columns], records
+
+
+async def bulk_insert_rows(db: AsyncSession, model, rows: list[dict]) -> None:
+    """
+    Insert `rows` (column key -> value dicts) into model's table within the
+    session's transaction. Uses COPY for large batches, INSERT otherwise.
+    """
+    if not rows:
+        return
+    if len(rows) < BULK_COPY_MIN_ROWS:
+        await db.execute(insert(model), rows)
+        return
+
+    column_names, records = _copy_records(model, rows)
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        model.__tablename__, records=records, columns=column_names
+    )
@@ -1,24 +1,95 @@
 import asyncio
+import logging
+import os
+import time
+import orjson
+from collections import defaultdict
 from typing import Dict
 from fastapi import WebSocket
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 
+logger = logging.getLogger(__name__)
 
 worker_signal = asyncio.Condition()
 
 
+async def wake_workers(count: int = 1):
+    """
+    Wake up to `count` idle AI workers, one per newly claimable task.
+
+    Workers claim tasks from the database and go straight on to the next one
+    after finishing, so waking every idle worker (notify_all) for a single
+    task would only have the rest find nothing and go back to sleep.
+    """
+    if count <= 0:
+        return
+    async with worker_signal:
+        worker_signal.notify(count)
+
+# With REDIS_URL set, status events are published on a per-user channel and
+# every app worker fans them out to the sockets it holds, so a dashboard gets
+# updates no matter which worker handled the upload. Without Redis, events go
+# straight to this process's sockets.
+REDIS_URL = os.getenv("REDIS_URL")
+WS_CHANNEL_PREFIX = "hyperion:ws:user"
+WS_PUBSUB_RETRY_SECONDS = 1
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.hf_cooldown_until: Optional[datetime] = None
+    def __init__(self, redis_url: Optional[str] = REDIS_URL):
+        # Every open dashboard socket per user (one per tab)
+        self.active_connections: Dict[str, set[WebSocket]] = defaultdict(set)
+        # Sockets whose dashboard accepts MEDIA_STATUS_BATCH frames
+        self.batch_clients: set[WebSocket] = set()
+        # time.monotonic() deadline; checked before every upload/worker poll,
+        # so it stays a plain float comparison
+        self.hf_cooldown_until: Optional[float] = None
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
 
-    async def connect(self, user_id: str, websocket: WebSocket):
+    async def connect(self, user_id: str, websocket: WebSocket, batch: bool = False):
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        self.active_connections[user_id].add(websocket)
+        if batch:
+            self.batch_clients.add(websocket)
+
+    def disconnect(self, user_id: str, websocket: WebSocket):
+        sockets = self.active_connections.get(user_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.active_connections[user_id]
+        self.batch_clients.discard(websocket)
+
+    @staticmethod
+    def _status_payload(
+        media_id: str,
+        status: str,
+        worker: Optional[str] = None,
+        img_url: Optional[str] = None,
+        address: Optional[str] = None,
+        failed_reason: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> dict:
+        return {
+            "type": "MEDIA_STATUS_UPDATE",
+            "media_id": str(media_id),
+            "status": status,
+            "worker": worker,
+            # orjson writes aware datetimes as ISO 8601 (same text as isoformat())
+            "timestamp": timestamp or datetime.now(timezone.utc),
+            "img_url": img_url,
+            "address": address,
+            "failed_reason": failed_reason,
+        }
 
-    def disconnect(self, user_id: str):
-        self.active_connections.pop(user_id, None)
+    @staticmethod
+    def _encode(payload: dict) -> str:
+        # orjson instead of send_json's json.dumps; still sent as a text frame
+        # so the dashboard keeps parsing event.data as a JSON string
+        return orjson.dumps(payload).decode()
 
     async def send_status(
         self,
@@ -31,32 +102,97 @@ class ConnectionManager:
         failed_reason: Optional[str] = None,
     ):
         """Sends a JSON packet to a specific user's dashboard."""
-        if user_id in self.active_connections:
-            websocket = self.active_connections[user_id]
-            payload = {
-                "type": "MEDIA_STATUS_UPDATE",
-                "media_id": str(media_id),
-                "status": status,
-                "worker": worker,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "img_url": img_url,
-                "address": address,
-                "failed_reason": failed_reason,
-            }
+        payload = self._status_payload(
+            media_id, status, worker, img_url, address, failed_reason
+        )
+        await self._publish(user_id, [payload], batch=False)
+
+    async def send_status_batch(self, user_id: str, updates: list[dict]):
+        """
+        Sends several status packets to a user's dashboard in one go.
+
+        Each update holds send_status keyword arguments (media_id, status, ...)
+        and all share one timestamp. Dashboards that connected with batch
+        support get a single {"type": "MEDIA_STATUS_BATCH", "events": [...]}
+        frame; older ones get MEDIA_STATUS_UPDATE frames back to back.
+        """
+        if not updates:
+            return
+        timestamp = datetime.now(timezone.utc)
+        events = [
+            self._status_payload(**update, timestamp=timestamp) for update in updates
+        ]
+        await self._publish(user_id, events, batch=True)
+
+    async def _publish(self, user_id: str, events: list[dict], batch: bool):
+        if self._redis is not None:
             try:
-                await websocket.send_json(payload)
+                await self._redis.publish(
+                    f"{WS_CHANNEL_PREFIX}:{user_id}",
+                    orjson.dumps({"events": events, "batch": batch}),
+                )
+                return
+            except RedisError as e:
+                logger.warning("WS event publish failed, sending locally: %s", e)
+        await self._deliver(user_id, events, batch)
+
+    async def _deliver(self, user_id: str, events: list[dict], batch: bool):
+        """Send events to the sockets this process holds for user_id."""
+        sockets = self.active_connections.get(user_id)
+        if not sockets:
+            return
+
+        batch_frame = None
+        event_frames = None
+        for websocket in list(sockets):
+            try:
+                if batch and websocket in self.batch_clients:
+                    if batch_frame is None:
+                        batch_frame = self._encode(
+                            {"type": "MEDIA_STATUS_BATCH", "events": events}
+                        )
+                    await websocket.send_text(batch_frame)
+                    continue
+                if event_frames is None:
+                    event_frames = [self._encode(event) for event in events]
+                for frame in event_frames:
+                    await websocket.send_text(frame)
             except Exception:
-                self.disconnect(user_id)
+                self.disconnect(user_id, websocket)
+
+    async def run_pubsub_listener(self):
+        """
+        Long-running task (started in the app lifespan) that delivers events
+        published by any app worker to this worker's sockets. No-op without Redis.
+        """
+        if self._redis is None:
+            return
+        prefix = f"{WS_CHANNEL_PREFIX}:"
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{prefix}*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        user_id = message["channel"].decode()[len(prefix) :]
+                        if user_id not in self.active_connections:
+                            continue
+                        data = orjson.loads(message["data"])
+                        await self._deliver(user_id, data["events"], data["batch"])
+            except RedisError as e:
+                logger.warning("WS pub/sub listener failed, reconnecting: %s", e)
+                await asyncio.sleep(WS_PUBSUB_RETRY_SECONDS)
 
     def is_hf_rate_limited(self) -> bool:
         if self.hf_cooldown_until:
-            if datetime.now(timezone.utc) < self.hf_cooldown_until:
+            if time.monotonic() < self.hf_cooldown_until:
                 return True
             self.hf_cooldown_until = None
         return False
 
     def set_hf_cooldown(self, hours: int = 1):
-        self.hf_cooldown_until = datetime.now(timezone.utc) + timedelta(hours=hours)
+        self.hf_cooldown_until = time.monotonic() + hours * 3600
 
 
 manager = ConnectionManager()
@@ -1,18 +1,112 @@
 import os
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import update, select
-from huggingface_hub import HfApi, CommitOperationAdd
+from sqlalchemy import update, select, insert
+import httpx
+from huggingface_hub import HfApi, CommitOperationAdd, constants, set_client_factory
+from huggingface_hub.utils import HfHubHTTPError
+from huggingface_hub.utils._http import hf_request_event_hook
 from app.database import AsyncSessionLocal
-from app.api.medialog_utils.media_log_utils import create_status_change_log
+from app.api.medialog_utils.media_log_utils import (
+    create_status_change_log,
+    status_change_log_values,
+)
 from app.models.db.Media import Media
+from app.models.db.MediaLog import MediaLog
 from app.models.upload.MediaStatus import MediaStatus
-from app.api.upload_utils.conn_manager import worker_signal, manager
+from app.api.upload_utils.conn_manager import wake_workers, manager
+from app.api.upload_utils.adaptive_limiter import (
+    AdaptiveConcurrencyLimiter,
+    OverloadedError,
+)
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 HF_TOKEN = os.getenv("HF_TOKEN")
 HF_REPO_ID = os.getenv("HF_REPO_ID")
 
+# One client for every HF call; huggingface_hub keeps a shared HTTP session,
+# so reusing it keeps connections alive between uploads and deletions
+hf_api = HfApi(token=HF_TOKEN)
+
+# huggingface_hub is synchronous; its blocking HTTP calls run on a dedicated,
+# bounded pool so upload bursts don't exhaust the default executor that
+# asyncio.to_thread and other offloaded work share
+HF_IO_WORKERS = 8
+# Files uploaded in parallel within one create_commit (library default is 5);
+# a batch commit carries two files (original + thumbnail) per image
+HF_COMMIT_UPLOAD_THREADS = 16
+_hf_executor = ThreadPoolExecutor(
+    max_workers=HF_IO_WORKERS, thread_name_prefix="hf-io"
+)
+# Every thread above (and the commit upload threads) can hold a connection
+HF_HTTP_MAX_CONNECTIONS = HF_IO_WORKERS + HF_COMMIT_UPLOAD_THREADS
+
+
+def _hf_client_factory() -> httpx.Client:
+    """
+    huggingface_hub's default client with HTTP/2 enabled: concurrent calls
+    from the HF threads share multiplexed connections to the Hub instead of
+    opening one HTTP/1.1 connection each. The pool keeps a keep-alive
+    connection per HF thread for hosts without HTTP/2.
+    """
+    return httpx.Client(
+        event_hooks={"request": [hf_request_event_hook]},
+        follow_redirects=True,
+        timeout=httpx.Timeout(constants.HF_HUB_DOWNLOAD_TIMEOUT, write=60.0),
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=HF_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HF_HTTP_MAX_CONNECTIONS,
+        ),
+    )
+
+
+# The client is shared by every huggingface_hub call in the process
+set_client_factory(_hf_client_factory)
+
+
+# How many HF calls run at once adapts between 1 and the pool size: +1 per
+# success, halved on HTTP 429. Rate-limited calls are retried with
+# exponential backoff; if HF keeps refusing, the global HF cooldown is set.
+HF_RATE_LIMIT_RETRIES = 3
+HF_RATE_LIMIT_BACKOFF_SECONDS = 1
+_hf_limiter = AdaptiveConcurrencyLimiter(
+    min_limit=1, max_limit=HF_IO_WORKERS, initial=4
+)
+
+
+def _http_status(error: HfHubHTTPError) -> int | None:
+    """Status code of a failed Hub call, read from the response (no str(error))."""
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
+
+def _is_rate_limited(error: HfHubHTTPError) -> bool:
+    return _http_status(error) == 429
+
+
+async def run_hf_call(fn, /, *args, **kwargs):
+    """Run a blocking huggingface_hub call on the HF pool under the adaptive limit."""
+    call = partial(fn, *args, **kwargs)
+    for attempt in range(HF_RATE_LIMIT_RETRIES + 1):
+        try:
+            async with _hf_limiter.slot():
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        _hf_executor, call
+                    )
+                except HfHubHTTPError as e:
+                    if _is_rate_limited(e):
+                        raise OverloadedError(str(e)) from e
+                    raise
+        except OverloadedError as e:
+            if attempt == HF_RATE_LIMIT_RETRIES:
+                manager.set_hf_cooldown()
+                raise e.__cause__
+            await asyncio.sleep(HF_RATE_LIMIT_BACKOFF_SECONDS * 2**attempt)
+
 
 async def delete_from_hf(hf_path: str, media_id: uuid.UUID) -> bool:
     """
@@ -40,9 +134,6 @@ async def delete_from_hf(hf_path: str, media_id: uuid.UUID) -> bool:
                 # Other media still reference this file, don't delete
                 return True
 
-        api = HfApi(token=HF_TOKEN)
-        loop = asyncio.get_event_loop()
-
         base_name = hf_path.rsplit("/", 1)[-1]
         if "_thumbnail_" in base_name:
             paired_path = hf_path.replace("_thumbnail_", "_", 1)
@@ -55,19 +146,18 @@ async def delete_from_hf(hf_path: str, media_id: uuid.UUID) -> bool:
 
         for path in paths_to_delete:
             try:
-                await loop.run_in_executor(
-                    None,
-                    lambda p=path: api.delete_file(
-                        path_in_repo=p,
-                        repo_id=HF_REPO_ID or "",
-                        repo_type="dataset",
-                        commit_message=f"Delete media file {p}",
-                    ),
+                await run_hf_call(
+                    hf_api.delete_file,
+                    path_in_repo=path,
+                    repo_id=HF_REPO_ID or "",
+                    repo_type="dataset",
+                    commit_message=f"Delete media file {path}",
                 )
-            except Exception as delete_error:
-                if "404" in str(delete_error):
+            except HfHubHTTPError as delete_error:
+                # Already gone (e.g. the paired file never existed)
+                if _http_status(delete_error) == 404:
                     continue
-                raise delete_error
+                raise
 
         return True
     except Exception as e:
@@ -75,161 +165,365 @@ async def delete_from_hf(hf_path: str, media_id: uuid.UUID) -> bool:
         return False
 
 
+# Upload batches from concurrent requests are merged into one HF commit:
+# hf_upload_batcher waits up to HF_BATCH_WINDOW_SECONDS after the first queued
+# batch and keeps taking more until HF_BATCH_MAX_FILES files or
+# HF_BATCH_MAX_BYTES are collected. Fewer, larger commits keep the dataset
+# clear of the Hub's commit rate limit during upload bursts.
+HF_BATCH_WINDOW_SECONDS = 0.5
+HF_BATCH_MAX_FILES = 50
+HF_BATCH_MAX_BYTES = 500 * 1024 * 1024
+# Batches in flight at once: the next batch's HF commit overlaps the previous
+# batch's status UPDATE/commit and notifications instead of waiting for them
+HF_UPLOAD_PIPELINE_DEPTH = 2
+# The post-commit status UPDATE is retried (e.g. after a deadlock with the
+# other in-flight batch) instead of failing files that are already on HF
+HF_STATUS_UPDATE_ATTEMPTS = 3
+HF_STATUS_UPDATE_RETRY_SECONDS = 0.5
+
+# (files_data, user_id) jobs waiting for the next batch commit
+_hf_upload_queue: asyncio.Queue = asyncio.Queue()
+_hf_batcher_running = False
+
+
 async def process_hf_upload(files_data: list[tuple], user_id: str):
     """
     Process and upload files to Hugging Face.
     Checks for duplicates before uploading to avoid wasted storage.
 
+    The batch is queued for hf_upload_batcher, which commits it together with
+    other users' pending batches. Without a running batcher (e.g. outside the
+    app lifespan) it is uploaded directly.
+
     Args:
-        files_data: List of tuples containing (media_id, filename, content_temp_path, thumbnail_temp_path)
+        files_data: List of tuples containing (media_id, filename, content_temp_path, thumbnail_temp_path, content_sha256)
         user_id: The ID of the user uploading the files
     """
-    api = HfApi(token=HF_TOKEN)
+    if _hf_batcher_running:
+        await _hf_upload_queue.put((files_data, user_id))
+    else:
+        await _upload_jobs([(files_data, user_id)])
+
+
+def _job_bytes(files_data: list[tuple]) -> int:
+    total = 0
+    for _, _, content_path, thumbnail_path, _ in files_data:
+        for temp_file in (content_path, thumbnail_path):
+            try:
+                total += os.path.getsize(temp_file)
+            except OSError:
+                pass
+    return total
+
+
+async def hf_upload_batcher():
+    """
+    Long-running task (started in the app lifespan) that drains the upload
+    queue into batched HF commits.
+    """
+    global _hf_batcher_running
+    _hf_batcher_running = True
+    loop = asyncio.get_running_loop()
+    pipeline = asyncio.Semaphore(HF_UPLOAD_PIPELINE_DEPTH)
+    in_flight: set[asyncio.Task] = set()
+
+    async def run_batch(jobs):
+        try:
+            await _upload_jobs(jobs)
+        except Exception as e:
+            print(f"HF upload batch failed: {e}")
+        finally:
+            pipeline.release()
+
+    try:
+        while True:
+            # While every pipeline slot is busy, new uploads keep queueing
+            # and end up in the next (larger) batch
+            await pipeline.acquire()
+            job = await _hf_upload_queue.get()
+            jobs = [job]
+            file_count = len(job[0])
+            byte_count = _job_bytes(job[0])
+            deadline = loop.time() + HF_BATCH_WINDOW_SECONDS
+
+            while file_count < HF_BATCH_MAX_FILES and byte_count < HF_BATCH_MAX_BYTES:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    job = await asyncio.wait_for(_hf_upload_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                jobs.append(job)
+                file_count += len(job[0])
+                byte_count += _job_bytes(job[0])
+
+            task = asyncio.create_task(run_batch(jobs))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+    finally:
+        _hf_batcher_running = False
+
+
+async def _upload_jobs(jobs: list[tuple[list[tuple], str]]):
+    """
+    Upload the queued jobs in one commit.
+
+    The uploads were streamed to temp files by batch_upload; they are removed
+    here however the batch ends (uploaded, duplicates only, or failed).
+    """
+    try:
+        await _upload_files_to_hf(jobs)
+    finally:
+        for files_data, _ in jobs:
+            for _, _, content_path, thumbnail_path, _ in files_data:
+                for temp_file in (content_path, thumbnail_path):
+                    try:
+                        if os.path.exists(temp_file):
+                            os.remove(temp_file)
+                    except Exception as cleanup_error:
+                        print(f"Failed to cleanup temp file {temp_file}: {cleanup_error}")
+
+
+async def _upload_files_to_hf(jobs: list[tuple[list[tuple], str]]):
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
     if not HF_REPO_ID:
         raise ValueError("HF_REPO_ID environment variable is not set")
 
     operations = []
+    # (user_id, media_id, hf_path) of every file in the commit
     media_ids = []
-    temp_files_to_cleanup = []
+    # Same, for files whose content is already in the dataset
+    reused_ids = []
+    # Same, for repeats of a file added to this commit; only valid once the
+    # commit lands
+    batch_reused_ids = []
+    # (user_id, content_sha256) -> hf_path of files added to this commit
+    batch_paths: dict[tuple[str, str], str] = {}
+    duplicate_updates: dict[str, list[dict]] = {}
 
     async with AsyncSessionLocal() as session:
-        for m_id, filename, content_path, thumbnail_path in files_data:
-            temp_files_to_cleanup.extend([content_path, thumbnail_path])
-
-            # first duplicate check for name
-            duplicate_query = (
-                select(Media)
-                .where(
-                    Media.id != m_id,
-                    Media.status != MediaStatus.FAILED,
-                    Media.initial_metadata["filename"].as_string() == filename,
-                    Media.uploader_id == user_id,
+        # Duplicate rows are updated user by user, in the same user order as
+        # the UPLOADED update below (see the user_media_stats lock note there)
+        for files_data, user_id in sorted(jobs, key=lambda job: job[1]):
+            for m_id, filename, content_path, thumbnail_path, content_sha256 in files_data:
+                # first duplicate check for name
+                duplicate_query = (
+                    select(Media)
+                    .where(
+                        Media.id != m_id,
+                        Media.status != MediaStatus.FAILED,
+                        Media.initial_metadata["filename"].as_string() == filename,
+                        Media.uploader_id == user_id,
+                    )
+                    .limit(1)
                 )
-                .limit(1)
-            )
-            dup_result = await session.execute(duplicate_query)
-            duplicate = dup_result.scalar_one_or_none()
+                dup_result = await session.execute(duplicate_query)
+                duplicate = dup_result.scalar_one_or_none()
 
-            if duplicate:
-                original_name = (duplicate.initial_metadata or {}).get(
-                    "filename", "Unknown"
-                )
-                original_date = duplicate.created_at.strftime("%Y-%m-%d %H:%M")
-                duplicate_reason = f"Image is a duplicate of image {original_name[0:5]}... uploaded at {original_date}"
-
-                media = await session.execute(select(Media).where(Media.id == m_id))
-                current_task = media.scalar_one_or_none()
-
-                if current_task:
-                    current_task.status = MediaStatus.FAILED
-                    current_task.failed_reason = duplicate_reason
-                    current_task.original_media_id = duplicate.id
-                    current_task.hf_path = duplicate.hf_path
-
-                    # copy data from original
-                    if duplicate.lat is not None and duplicate.lng is not None:
-                        current_task.lat = duplicate.lat
-                        current_task.lng = duplicate.lng
-                        current_task.location = duplicate.location
-                        current_task.altitude = duplicate.altitude
-                        current_task.address = duplicate.address
-
-                    current_task.has_trash = duplicate.has_trash
-                    current_task.confidence = duplicate.confidence
-                    current_task.technical_metadata = duplicate.technical_metadata
-
-                    session.add(
-                        create_status_change_log(
-                            m_id,
-                            MediaStatus.FAILED,
-                            detail=f"Duplicate detected: {original_name[0:5]}... (uploaded {original_date}). Using original image data.",
-                        )
+                if duplicate:
+                    original_name = (duplicate.initial_metadata or {}).get(
+                        "filename", "Unknown"
                     )
+                    original_date = duplicate.created_at.strftime("%Y-%m-%d %H:%M")
+                    duplicate_reason = f"Image is a duplicate of image {original_name[0:5]}... uploaded at {original_date}"
+
+                    media = await session.execute(select(Media).where(Media.id == m_id))
+                    current_task = media.scalar_one_or_none()
+
+                    if current_task:
+                        current_task.status = MediaStatus.FAILED
+                        current_task.failed_reason = duplicate_reason
+                        current_task.original_media_id = duplicate.id
+                        current_task.hf_path = duplicate.hf_path
+
+                        # copy data from original
+                        if duplicate.lat is not None and duplicate.lng is not None:
+                            current_task.lat = duplicate.lat
+                            current_task.lng = duplicate.lng
+                            current_task.altitude = duplicate.altitude
+                            current_task.address = duplicate.address
+
+                        current_task.has_trash = duplicate.has_trash
+                        current_task.confidence = duplicate.confidence
+                        current_task.technical_metadata = duplicate.technical_metadata
+
+                        session.add(
+                            create_status_change_log(
+                                m_id,
+                                MediaStatus.FAILED,
+                                detail=f"Duplicate detected: {original_name[0:5]}... (uploaded {original_date}). Using original image data.",
+                            )
+                        )
+
+                        duplicate_updates.setdefault(user_id, []).append(
+                            {
+                                "media_id": str(m_id),
+                                "status": "FAILED",
+                                "failed_reason": duplicate_reason,
+                            }
+                        )
+                    continue
 
-                    await manager.send_status(
-                        user_id,
-                        str(m_id),
-                        "FAILED",
-                        failed_reason=duplicate_reason,
+                # Identical bytes already uploaded by this user: point at that
+                # copy instead of sending the file to HF again. Scoped to the
+                # uploader so a path never points into another user's folder.
+                # delete_from_hf keeps files other media still reference.
+                batch_path = batch_paths.get((user_id, content_sha256))
+                if batch_path:
+                    batch_reused_ids.append((user_id, m_id, batch_path))
+                    continue
+
+                existing_path = (
+                    await session.execute(
+                        select(Media.hf_path)
+                        .where(
+                            Media.content_sha256 == content_sha256,
+                            Media.uploader_id == user_id,
+                            Media.id != m_id,
+                            Media.hf_path.isnot(None),
+                            Media.status != MediaStatus.FAILED,
+                        )
+                        .limit(1)
                     )
-            else:
-                full_path = f"media/{user_id}/{date_str}/{m_id}_{filename}"
-                thumb_path = f"media/{user_id}/{date_str}/{m_id}_thumbnail_{filename}"
+                ).scalar_one_or_none()
 
-                operations.append(
-                    CommitOperationAdd(
-                        path_in_repo=full_path, path_or_fileobj=content_path
+                if existing_path:
+                    reused_ids.append((user_id, m_id, existing_path))
+                else:
+                    full_path = f"media/{user_id}/{date_str}/{m_id}_{filename}"
+                    thumb_path = f"media/{user_id}/{date_str}/{m_id}_thumbnail_{filename}"
+
+                    operations.append(
+                        CommitOperationAdd(
+                            path_in_repo=full_path, path_or_fileobj=content_path
+                        )
                     )
-                )
-                operations.append(
-                    CommitOperationAdd(
-                        path_in_repo=thumb_path, path_or_fileobj=thumbnail_path
+                    operations.append(
+                        CommitOperationAdd(
+                            path_in_repo=thumb_path, path_or_fileobj=thumbnail_path
+                        )
                     )
-                )
-                media_ids.append((m_id, thumb_path))
+                    media_ids.append((user_id, m_id, thumb_path))
+                    if content_sha256:
+                        batch_paths[(user_id, content_sha256)] = thumb_path
 
         await session.commit()
 
+    for user_id, updates in duplicate_updates.items():
+        await manager.send_status_batch(user_id, updates)
+
     # upload only non-duplicate files to HF
+    uploaded = reused_ids
     if operations:
+        user_ids = {user_id for user_id, _, _ in media_ids}
+        if len(user_ids) == 1:
+            commit_message = f"Batch upload {len(operations)} files for user {next(iter(user_ids))}"
+        else:
+            commit_message = f"Batch upload {len(operations)} files for {len(user_ids)} users"
+
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: api.create_commit(
-                    repo_id=HF_REPO_ID or "",
-                    repo_type="dataset",
-                    operations=operations,
-                    commit_message=f"Batch upload {len(operations)} files for user {user_id}",
-                ),
+            await run_hf_call(
+                hf_api.create_commit,
+                repo_id=HF_REPO_ID or "",
+                repo_type="dataset",
+                operations=operations,
+                commit_message=commit_message,
+                num_threads=HF_COMMIT_UPLOAD_THREADS,
             )
+        except Exception as e:
+            await _mark_upload_failed(media_ids + batch_reused_ids)
+            print(f"Batch upload failed: {e}")
+        else:
+            uploaded = media_ids + batch_reused_ids + reused_ids
 
-            async with AsyncSessionLocal() as session:
-                for m_id, hf_path in media_ids:
-                    await session.execute(
-                        update(Media)
-                        .where(Media.id == m_id)
-                        .values(status=MediaStatus.UPLOADED, hf_path=hf_path)
-                    )
-                    session.add(create_status_change_log(m_id, MediaStatus.UPLOADED))
-                    await manager.send_status(
-                        user_id, str(m_id), "UPLOADED", img_url=hf_path
-                    )
-
-                await session.commit()
+    if not uploaded:
+        return
 
-            async with worker_signal:
-                worker_signal.notify_all()
+    # Both in-flight batches can hold several users' media, and the
+    # user_media_stats trigger locks each user's counter row in row order;
+    # one global order keeps two batches from locking them crosswise
+    uploaded = sorted(uploaded, key=lambda entry: (entry[0], str(entry[1])))
 
+    for attempt in range(1, HF_STATUS_UPDATE_ATTEMPTS + 1):
+        try:
+            await _mark_uploaded(uploaded)
+            break
         except Exception as e:
-            async with AsyncSessionLocal() as session:
-                for m_id, _ in media_ids:
-                    await session.execute(
-                        update(Media)
-                        .where(Media.id == m_id)
-                        .values(
-                            status=MediaStatus.FAILED,
-                            failed_reason="Server encountered an issue while saving your files to secure storage.",
-                        )
-                    )
-                    await manager.send_status(
-                        user_id,
-                        str(m_id),
-                        "FAILED",
-                        failed_reason="Server encountered an issue while saving your files to secure storage.",
-                    )
-                await session.commit()
-            print(f"Batch upload failed: {e}")
+            print(
+                f"Recording uploaded batch failed "
+                f"(attempt {attempt}/{HF_STATUS_UPDATE_ATTEMPTS}): {e}"
+            )
+            if attempt < HF_STATUS_UPDATE_ATTEMPTS:
+                await asyncio.sleep(HF_STATUS_UPDATE_RETRY_SECONDS * attempt)
+    else:
+        await _mark_upload_failed(uploaded)
+        return
+
+    # Notify once the new statuses are committed
+    await _send_status_per_user(
+        uploaded,
+        lambda m_id, hf_path: {
+            "media_id": str(m_id),
+            "status": "UPLOADED",
+            "img_url": hf_path,
+        },
+    )
+
+    await wake_workers(len(uploaded))
+
+
+async def _mark_uploaded(uploaded: list[tuple]):
+    """
+    Mark (user_id, media_id, hf_path) entries UPLOADED with one executemany
+    UPDATE by primary key and one multi-row log INSERT for the whole batch.
+    """
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Media),
+            [
+                {"id": m_id, "status": MediaStatus.UPLOADED, "hf_path": hf_path}
+                for _, m_id, hf_path in uploaded
+            ],
+        )
+        await session.execute(
+            insert(MediaLog),
+            [
+                status_change_log_values(m_id, MediaStatus.UPLOADED)
+                for _, m_id, _ in uploaded
+            ],
+        )
+        await session.commit()
 
-        finally:
-            for temp_file in temp_files_to_cleanup:
-                try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                except Exception as cleanup_error:
-                    print(f"Failed to cleanup temp file {temp_file}: {cleanup_error}")
+
+async def _mark_upload_failed(media_ids: list[tuple]):
+    """Mark (user_id, media_id, hf_path) entries FAILED and notify their users."""
+    failed_reason = "Server encountered an issue while saving your files to secure storage."
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Media)
+            .where(Media.id.in_([m_id for _, m_id, _ in media_ids]))
+            .values(status=MediaStatus.FAILED, failed_reason=failed_reason)
+        )
+        await session.commit()
+    await _send_status_per_user(
+        media_ids,
+        lambda m_id, _: {
+            "media_id": str(m_id),
+            "status": "FAILED",
+            "failed_reason": failed_reason,
+        },
+    )
+
+
+async def _send_status_per_user(media_ids: list[tuple], build_update):
+    """Send one status batch per user for (user_id, media_id, hf_path) entries."""
+    updates: dict[str, list[dict]] = {}
+    for user_id, m_id, hf_path in media_ids:
+        updates.setdefault(user_id, []).append(build_update(m_id, hf_path))
+    for user_id, user_updates in updates.items():
+        await manager.send_status_batch(user_id, user_updates)
 
 
 async def upload_video_frames_to_hf(
@@ -243,7 +537,6 @@ async def upload_video_frames_to_hf(
     """
     if not frames_data:
         return True  # nothing to upload
-    api = HfApi(token=HF_TOKEN)
     if not HF_REPO_ID:
         print("Error: HF_REPO_ID environment variable is not set")
         return False
@@ -256,15 +549,13 @@ async def upload_video_frames_to_hf(
         )
 
     try:
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: api.create_commit(
-                repo_id=HF_REPO_ID or "",
-                repo_type="dataset",
-                operations=operations,
-                commit_message=f"Auto-upload: {len(operations)} evidence frames for video {media_id}",
-            ),
+        await run_hf_call(
+            hf_api.create_commit,
+            repo_id=HF_REPO_ID or "",
+            repo_type="dataset",
+            operations=operations,
+            commit_message=f"Auto-upload: {len(operations)} evidence frames for video {media_id}",
+            num_threads=HF_COMMIT_UPLOAD_THREADS,
         )
         print(
             f"Successfully batch uploaded {len(operations)} frames for video {media_id}"
@@ -277,7 +568,6 @@ async def upload_video_frames_to_hf(
 
 import os
 import asyncio
-from huggingface_hub import HfApi
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.db.Media import Media
@@ -293,20 +583,16 @@ async def process_video_hf_upload(
     video_hf_path: str,
 ):
     """Background task to upload the full video to HF and notify the worker"""
-    HF_TOKEN = os.getenv("HF_TOKEN")
     HF_REPO_ID = os.getenv("HF_REPO_ID")
-    api = HfApi(token=HF_TOKEN)
 
     try:
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: api.upload_file(
-                path_or_fileobj=local_video_path,
-                path_in_repo=video_hf_path,
-                repo_id=HF_REPO_ID or "",
-                repo_type="dataset",
-                commit_message=f"Upload full video for AI processing: {media_id}",
-            ),
+        await run_hf_call(
+            hf_api.upload_file,
+            path_or_fileobj=local_video_path,
+            path_in_repo=video_hf_path,
+            repo_id=HF_REPO_ID or "",
+            repo_type="dataset",
+            commit_message=f"Upload full video for AI processing: {media_id}",
         )
 
         async with AsyncSessionLocal() as session:
@@ -335,8 +621,7 @@ async def process_video_hf_upload(
                     worker=None,
                 )
 
-                async with worker_signal:
-                    worker_signal.notify_all()
+                await wake_workers()
 
     except Exception as e:
         print(f"Failed to upload video to HF: {e}")
@@ -347,12 +632,10 @@ async def process_video_hf_upload(
 
 def delete_video_from_hf(video_hf_path: str):
     """Deletes a video file from the Hugging Face dataset."""
-    HF_TOKEN = os.getenv("HF_TOKEN")
     HF_REPO_ID = os.getenv("HF_REPO_ID")
-    api = HfApi(token=HF_TOKEN)
 
     try:
-        api.delete_file(
+        hf_api.delete_file(
             path_in_repo=video_hf_path,
             repo_id=HF_REPO_ID or "",
             repo_type="dataset",
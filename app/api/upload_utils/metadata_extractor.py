@@ -1,104 +1,252 @@
-from PIL import Image, ExifTags
-import io
+from PIL import Image
 import httpx
 import asyncio
-
-_address_cache = {}
+import logging
+import os
+import time
+from cachetools import TTLCache
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
+NOMINATIM_HEADERS = {"User-Agent": "Hyperion-App-Thesis"}
+# very strict OSM policy -> one req per sec (process-wide, small margin)
+NOMINATIM_MIN_INTERVAL_SECONDS = 1.1
+# Throttled (429) / unavailable responses and network errors are retried
+# with exponential backoff (2s, 4s) that holds off every caller
+NOMINATIM_MAX_ATTEMPTS = 3
+NOMINATIM_RETRY_BASE_SECONDS = 2.0
+NOMINATIM_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Addresses per ~110m cell: a bounded in-process tier, backed by Redis (when
+# REDIS_URL is set) so every app worker shares lookups and they survive
+# restarts. Entries live for 30 days in both tiers.
+ADDRESS_CACHE_MAX_ENTRIES = 10_000
+ADDRESS_CACHE_TTL_SECONDS = 30 * 86400
+ADDRESS_CACHE_KEY_PREFIX = "hyperion:geocode"
+
+REDIS_URL = os.getenv("REDIS_URL")
+_redis = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+_address_cache: TTLCache = TTLCache(
+    maxsize=ADDRESS_CACHE_MAX_ENTRIES, ttl=ADDRESS_CACHE_TTL_SECONDS
+)
+# Lookups in progress per cache cell; concurrent callers for the same cell
+# wait on the first caller's request instead of sending their own
+_address_inflight: dict[int, asyncio.Future] = {}
+# One pooled client for every lookup, created on first use
+_nominatim_client: httpx.AsyncClient | None = None
+_nominatim_pacing = asyncio.Lock()
+_nominatim_next_request = 0.0
+
+
+async def close_geocoder_client():
+    """Close the pooled Nominatim client (called on app shutdown)."""
+    global _nominatim_client
+    if _nominatim_client is not None:
+        await _nominatim_client.aclose()
+        _nominatim_client = None
+
+
+def _address_cache_key(lat, lon) -> int:
+    # about 110m pecision at the equator, good enough for caching; the
+    # quantized lat/lon are packed into one int (lon needs 19 bits)
+    return round((lat + 90) * 1000) << 19 | round((lon + 180) * 1000)
+
+
+def get_cached_address(lat, lon):
+    """Return the cached address for the coordinates, or None without a lookup."""
+    if lat is None or lon is None:
+        return None
+    return _address_cache.get(_address_cache_key(lat, lon))
 
 
 async def get_address_from_coords(lat, lon):
     if lat is None or lon is None:
         return None
 
-    # about 110m pecision at the equator, good enough for caching
-    cache_key = f"{round(lat, 3)},{round(lon, 3)}"
+    cache_key = _address_cache_key(lat, lon)
     if cache_key in _address_cache:
         return _address_cache[cache_key]
 
-    url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}"
-    headers = {"User-Agent": "Hyperion-App-Thesis"}
+    inflight = _address_inflight.get(cache_key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
 
+    future = asyncio.get_running_loop().create_future()
+    _address_inflight[cache_key] = future
+    result = None
     try:
-        # very strict OSM policy -> one req per sec
-        await asyncio.sleep(1.1)
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(url, headers=headers)
-            if resp.status_code == 200:
-                data = resp.json()
-                addr = data.get("address", {})
-                city = addr.get("city") or addr.get("town") or addr.get("village")
-                country = addr.get("country")
-                result = (
-                    f"{city}, {country}"
-                    if city and country
-                    else data.get("display_name")
-                )
-                _address_cache[cache_key] = result
-                return result
-    except Exception:
+        result = await _get_persisted_address(cache_key)
+        if result is None:
+            result = await _reverse_geocode(lat, lon)
+            if result is not None:
+                await _persist_address(cache_key, result)
+        if result is not None:
+            _address_cache[cache_key] = result
+        return result
+    finally:
+        _address_inflight.pop(cache_key, None)
+        future.set_result(result)
+
+
+async def _get_persisted_address(cache_key: int):
+    if _redis is None:
         return None
+    try:
+        address = await _redis.get(f"{ADDRESS_CACHE_KEY_PREFIX}:{cache_key}")
+    except RedisError as e:
+        logger.warning("Address cache read failed, treating as miss: %s", e)
+        return None
+    return address.decode() if address is not None else None
+
+
+async def _persist_address(cache_key: int, address: str) -> None:
+    if _redis is None:
+        return
+    try:
+        await _redis.set(
+            f"{ADDRESS_CACHE_KEY_PREFIX}:{cache_key}",
+            address,
+            ex=ADDRESS_CACHE_TTL_SECONDS,
+        )
+    except RedisError as e:
+        logger.warning("Address cache write failed: %s", e)
+
+
+async def _wait_for_nominatim_slot():
+    """Wait for the next free request slot, at most one per interval across all callers."""
+    global _nominatim_next_request
+    async with _nominatim_pacing:
+        delay = _nominatim_next_request - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _nominatim_next_request = time.monotonic() + NOMINATIM_MIN_INTERVAL_SECONDS
+
+
+async def _back_off_nominatim(seconds: float):
+    """Push the shared next slot back so every caller waits out the backoff."""
+    global _nominatim_next_request
+    async with _nominatim_pacing:
+        _nominatim_next_request = max(
+            _nominatim_next_request, time.monotonic() + seconds
+        )
+
+
+async def _reverse_geocode(lat, lon):
+    global _nominatim_client
+
+    if _nominatim_client is None:
+        # Requests are paced one at a time, so a single kept-alive HTTP/2
+        # connection carries every lookup after the first handshake
+        _nominatim_client = httpx.AsyncClient(
+            timeout=5.0,
+            headers=NOMINATIM_HEADERS,
+            http2=True,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        )
+
+    for attempt in range(NOMINATIM_MAX_ATTEMPTS):
+        if attempt:
+            await _back_off_nominatim(NOMINATIM_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        await _wait_for_nominatim_slot()
+        try:
+            resp = await _nominatim_client.get(
+                NOMINATIM_URL, params={"format": "json", "lat": lat, "lon": lon}
+            )
+        except httpx.TransportError:
+            continue
+        if resp.status_code in NOMINATIM_RETRY_STATUSES:
+            continue
+        if resp.status_code != 200:
+            return None
+        try:
+            data = resp.json()
+            addr = data.get("address", {})
+            city = addr.get("city") or addr.get("town") or addr.get("village")
+            country = addr.get("country")
+            return (
+                f"{city}, {country}"
+                if city and country
+                else data.get("display_name")
+            )
+        except Exception:
+            return None
+    return None
+
+
+_NEGATIVE_REFS = frozenset(("S", "W"))
 
 
 def get_decimal_from_dms(dms, ref):
     """Convert GPS DMS (Degrees, Minutes, Seconds) to decimal degrees."""
-    degrees = dms[0]
-    minutes = dms[1] / 60.0
-    seconds = dms[2] / 3600.0
+    # float() each IFDRational first so the arithmetic stays on plain floats
+    # instead of going through Fraction
+    value = float(dms[0]) + float(dms[1]) / 60.0 + float(dms[2]) / 3600.0
+    return -value if ref in _NEGATIVE_REFS else value
+
+
+# GPS IFD tag ids (see PIL.ExifTags.GPS)
+GPS_LATITUDE_REF = 1
+GPS_LATITUDE = 2
+GPS_LONGITUDE_REF = 3
+GPS_LONGITUDE = 4
+GPS_ALTITUDE = 6
+
+# Base IFD tag id -> technical_metadata key
+_TECH_TAGS = ((271, "make"), (272, "model"), (305, "software"))
 
-    if ref in ["S", "W"]:
-        return -float(degrees + minutes + seconds)
-    return float(degrees + minutes + seconds)
 
+def extract_media_metadata(image_path: str):
+    """
+    Extracts EXIF data including GPS and Altitude using Pillow.
 
-def extract_media_metadata(image_bytes: bytes):
-    """Extracts EXIF data including GPS and Altitude using Pillow."""
+    Image.open only parses the header segments (EXIF lives in JPEG's APP1),
+    so the file is read up to the metadata, not in full, and no pixel data
+    is decoded.
+    """
     try:
-        img = Image.open(io.BytesIO(image_bytes))
-        exif_data = img.getexif()
-
-        if not exif_data:
-            return {"error": "No EXIF data found"}
-
-        exif_ifd = exif_data.get_ifd(0x8769)
-
-        # 36867 = DateTimeOriginal
-        # 36868 = DateTimeDigitized
-        # 306 = DateTime (módosítás dátuma)
-        date_taken = exif_ifd.get(36867) or exif_ifd.get(36868) or exif_data.get(306)
-
-        tech_meta = {
-            "make": exif_data.get(271),
-            "model": exif_data.get(272),
-            "software": exif_data.get(305),
-            "date_taken": str(date_taken) if date_taken else None,
-            "gps": None,
-        }
-
-        gps_ifd = exif_data.get_ifd(0x8825)  # GPSInfo IFD
-        if gps_ifd:
-            gps_data = {}
-            for t, value in gps_ifd.items():
-                tag_name = ExifTags.GPSTAGS.get(t, t)
-                gps_data[tag_name] = value
-
-            try:
-                lat = get_decimal_from_dms(
-                    gps_data["GPSLatitude"], gps_data["GPSLatitudeRef"]
-                )
-                lon = get_decimal_from_dms(
-                    gps_data["GPSLongitude"], gps_data["GPSLongitudeRef"]
-                )
-                alt = float(gps_data.get("GPSAltitude", 0))
-
-                tech_meta["gps"] = {
-                    "lat": lat,
-                    "lng": lon,
-                    "altitude": alt,
-                    "address": None,
-                }
-            except (KeyError, TypeError, ZeroDivisionError):
-                pass
-
-        return tech_meta
+        with Image.open(image_path) as img:
+            exif_data = img.getexif()
+
+            if not exif_data:
+                return {"error": "No EXIF data found"}
+
+            exif_ifd = exif_data.get_ifd(0x8769)
+
+            # 36867 = DateTimeOriginal
+            # 36868 = DateTimeDigitized
+            # 306 = DateTime (módosítás dátuma)
+            date_taken = (
+                exif_ifd.get(36867) or exif_ifd.get(36868) or exif_data.get(306)
+            )
+
+            tech_meta = {key: exif_data.get(tag_id) for tag_id, key in _TECH_TAGS}
+            tech_meta["date_taken"] = str(date_taken) if date_taken else None
+            tech_meta["gps"] = None
+
+            gps_ifd = exif_data.get_ifd(0x8825)  # GPSInfo IFD
+            if gps_ifd:
+                try:
+                    lat = get_decimal_from_dms(
+                        gps_ifd[GPS_LATITUDE], gps_ifd[GPS_LATITUDE_REF]
+                    )
+                    lon = get_decimal_from_dms(
+                        gps_ifd[GPS_LONGITUDE], gps_ifd[GPS_LONGITUDE_REF]
+                    )
+                    alt = float(gps_ifd.get(GPS_ALTITUDE, 0))
+
+                    tech_meta["gps"] = {
+                        "lat": lat,
+                        "lng": lon,
+                        "altitude": alt,
+                        "address": None,
+                    }
+                except (KeyError, TypeError, ZeroDivisionError):
+                    pass
+
+            return tech_meta
     except Exception as e:
         return {"error": f"Extraction failed: {str(e)}"}
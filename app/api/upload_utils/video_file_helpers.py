@@ -1,19 +1,24 @@
 import os
 import tempfile
 import shutil
-from typing import Optional
+from typing import BinaryIO, Optional
 
 
-def save_video_chunk_to_temp(media_id: str, chunk_index: int, chunk_bytes: bytes) -> str:
+# Másolási puffer mérete a chunkok lemezre streameléséhez
+CHUNK_COPY_BUFFER_SIZE = 64 * 1024
+
+
+def save_video_chunk_to_temp(media_id: str, chunk_index: int, chunk_file: BinaryIO) -> str:
     """
     Fájlrendszeri I/O: elment egy chunkot a /tmp/video_upload_<media_id>/chunk_<index> helyre.
+    A chunkot fájlobjektumból, 64 KB-os darabokban streameli, így nem kerül egészében memóriába.
     Visszaadja a chunk elérési útját.
     """
     temp_dir = os.path.join(tempfile.gettempdir(), f"video_upload_{media_id}")
     os.makedirs(temp_dir, exist_ok=True)
     chunk_path = os.path.join(temp_dir, f"chunk_{chunk_index}")
     with open(chunk_path, "wb") as f:
-        f.write(chunk_bytes)
+        shutil.copyfileobj(chunk_file, f, CHUNK_COPY_BUFFER_SIZE)
     return chunk_path
 
 
@@ -1,8 +1,26 @@
+import base64
+import binascii
 import logging
+import orjson
+import uuid
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, asc, update, func
+from sqlalchemy import (
+    select,
+    desc,
+    asc,
+    update,
+    delete,
+    func,
+    false,
+    cast,
+    literal_column,
+    String,
+    Text,
+    tuple_,
+)
 from typing import Optional, List
 
 from app.database import get_db
@@ -12,6 +30,7 @@ from app.models.db.VideoDetection import VideoDetection
 from app.models.upload.MediaStatus import MediaStatus
 from app.models.vault.VaultResponse import VaultResponse
 from app.api.upload_utils.hf_upload import delete_from_hf
+from app.api.stats_utils.cache import invalidate_user_stats
 from app.api.vault_utils.temp_file_finder import find_temp_video_file
 
 router = APIRouter()
@@ -27,6 +46,112 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
+# initial_metadata ->> 'filename' with the key inlined (not a bind parameter)
+# so the planner can match it to the ix_media_filename_trgm expression index
+MEDIA_FILENAME = Media.initial_metadata.op("->>", return_type=String)(
+    literal_column("'filename'")
+)
+
+
+def _raw_json(column):
+    """The JSON column's stored text, selected under the column's own name."""
+    return cast(column, Text).label(column.key)
+
+
+def _json_fragments(row, keys: tuple[str, ...]) -> dict:
+    """
+    Row mapping as an item dict, with the raw JSON text under `keys` wrapped
+    in orjson.Fragment so it is copied into the response as-is instead of
+    being decoded into dicts and re-encoded (EXIF metadata can be large).
+    """
+    item = dict(row)
+    for key in keys:
+        if item[key] is not None:
+            item[key] = orjson.Fragment(item[key])
+    return item
+
+
+VAULT_ITEM_JSON_KEYS = ("initial_metadata", "technical_metadata")
+VIDEO_ITEM_JSON_KEYS = ("bbox",)
+
+# Columns behind VaultItem / VideoDetectionItem. The vault selects these
+# instead of whole entities: rows come back as plain tuples, with no ORM
+# instances, identity-map bookkeeping or selectin detections load per page
+VAULT_ITEM_COLUMNS = (
+    Media.id,
+    Media.uploader_id,
+    Media.status,
+    Media.hf_path,
+    _raw_json(Media.initial_metadata),
+    _raw_json(Media.technical_metadata),
+    Media.assigned_worker,
+    Media.created_at,
+    Media.updated_at,
+    Media.lat,
+    Media.lng,
+    Media.altitude,
+    Media.address,
+    Media.has_trash,
+    Media.confidence,
+    Media.failed_reason,
+)
+VIDEO_ITEM_COLUMNS = (
+    VideoDetection.id,
+    VideoDetection.media_id,
+    VideoDetection.lat,
+    VideoDetection.lng,
+    VideoDetection.altitude,
+    VideoDetection.address,
+    VideoDetection.label,
+    VideoDetection.confidence,
+    _raw_json(VideoDetection.bbox),
+    VideoDetection.timestamp_in_video,
+    VideoDetection.frame_hf_path,
+    VideoDetection.created_at,
+    VideoDetection.area_sqm,
+)
+
+
+def _encode_cursor(media_after, video_after) -> Optional[str]:
+    """
+    Opaque next-page cursor: the (created_at, id) of the last image and video
+    item sent, or None for a list that is exhausted. None once both are.
+    """
+    if media_after is None and video_after is None:
+        return None
+    return base64.urlsafe_b64encode(
+        orjson.dumps({"m": media_after, "v": video_after})
+    ).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[Optional[tuple], Optional[tuple]]:
+    try:
+        positions = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return tuple(
+            (datetime.fromisoformat(position[0]), uuid.UUID(position[1]))
+            if position is not None
+            else None
+            for position in (positions["m"], positions["v"])
+        )
+    except (binascii.Error, KeyError, IndexError, TypeError, ValueError):
+        # ValueError also covers orjson.JSONDecodeError
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _seek_after(columns: tuple, position: Optional[tuple], direction: str):
+    """Keyset condition for rows after `position` in the page order."""
+    if position is None:
+        return false()
+    key = tuple_(*columns)
+    return key > position if direction == "asc" else key < position
+
+
+def _last_position(items: list[dict], page_size: int) -> Optional[list]:
+    """Keyset position after the last item, or None if the list ran out."""
+    if len(items) < page_size:
+        return None
+    return [items[-1]["created_at"].isoformat(), str(items[-1]["id"])]
+
 
 @router.get(
     "/vault",
@@ -44,162 +169,137 @@ async def get_media_vault(
     direction: str = Query("desc", pattern="^(asc|desc)$"),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of the previous page (created_at order only); "
+        "replaces page",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     """
     Retrieves the user's personal media library with advanced search and filtering.
+
+    Sorted by created_at, every page also carries a next_cursor. Passing it
+    back continues after the last item with an index seek on
+    (created_at, id) instead of an OFFSET that reads and discards every
+    earlier row, so deep pages cost the same as the first.
     """
 
     print(f"!!! MY ACTIVE USER ID IS: {current_user.id} !!!")  # <--- ADD THIS
 
-    query = select(Media).where(Media.uploader_id == current_user.id)
-    video_query = select(VideoDetection).where(
-        VideoDetection.media_id.in_(
-            select(Media.id).where(Media.uploader_id == current_user.id)
-        )
-    )
-
+    # One filter list feeds both the page query and the count query, so the
+    # two can't drift apart
+    media_filters = [Media.uploader_id == current_user.id]
     if status_filter:
-        query = query.where(Media.status == status_filter)
-        video_query = video_query.where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(
-                    Media.uploader_id == current_user.id, Media.status == status_filter
-                )
-            )
-        )
-
+        media_filters.append(Media.status == status_filter)
     if search:
-        query = query.where(
-            Media.initial_metadata["filename"].as_string().ilike(f"%{search}%")
-        )
-        video_query = video_query.where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(
-                    Media.uploader_id == current_user.id,
-                    Media.initial_metadata["filename"].as_string().ilike(f"%{search}%"),
-                )
-            )
+        media_filters.append(
+            MEDIA_FILENAME.ilike(f"%{search}%")
         )
+    video_filter = VideoDetection.media_id.in_(
+        select(Media.id).where(*media_filters)
+    )
+
+    query = select(*VAULT_ITEM_COLUMNS).where(*media_filters)
+    video_query = select(*VIDEO_ITEM_COLUMNS).where(video_filter)
 
     column_map = {
         "created_at": Media.created_at,
         "status": Media.status,
-        "filename": Media.initial_metadata["filename"].as_string(),
+        "filename": MEDIA_FILENAME,
     }
 
     sort_column = column_map.get(order_by, Media.created_at)
-    if direction == "desc":
-        query = query.order_by(desc(sort_column))
-        video_query = video_query.order_by(desc(VideoDetection.created_at))
-    else:
-        query = query.order_by(asc(sort_column))
-        video_query = video_query.order_by(asc(VideoDetection.created_at))
-
-    offset = (page - 1) * page_size
+    keyset = sort_column is Media.created_at
+    if cursor is not None and not keyset:
+        raise HTTPException(
+            status_code=400, detail="cursor requires order_by=created_at"
+        )
+    if cursor is not None:
+        media_after, video_after = _decode_cursor(cursor)
+
+    # id breaks created_at ties so keyset positions are unambiguous
+    order = desc if direction == "desc" else asc
+    query = query.order_by(order(sort_column), order(Media.id))
+    video_query = video_query.order_by(
+        order(VideoDetection.created_at), order(VideoDetection.id)
+    )
 
-    count_query = (
+    # Both totals in one round trip, as two scalar subqueries. A
+    # count(*) OVER () on the page query would save the round trip too, but
+    # makes Postgres read every matching row instead of stopping after the
+    # page on the (uploader_id, created_at DESC) index.
+    count_query = select(
         select(func.count())
         .select_from(Media)
-        .where(Media.uploader_id == current_user.id)
-    )
-    count_video_query = (
+        .where(*media_filters)
+        .scalar_subquery()
+        .label("total"),
         select(func.count())
         .select_from(VideoDetection)
-        .where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(Media.uploader_id == current_user.id)
-            )
-        )
+        .where(video_filter)
+        .scalar_subquery()
+        .label("total_video_detections"),
     )
 
-    if status_filter:
-        count_query = count_query.where(Media.status == status_filter)
-        count_video_query = count_video_query.where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(
-                    Media.uploader_id == current_user.id, Media.status == status_filter
-                )
-            )
-        )
+    counts = (await db.execute(count_query)).one()
+    total = counts.total
+    total_video_detections = counts.total_video_detections
 
-    if search:
-        count_query = count_query.where(
-            Media.initial_metadata["filename"].as_string().ilike(f"%{search}%")
+    if cursor is not None:
+        query = query.where(
+            _seek_after((Media.created_at, Media.id), media_after, direction)
         )
-        count_video_query = count_video_query.where(
-            VideoDetection.media_id.in_(
-                select(Media.id).where(
-                    Media.uploader_id == current_user.id,
-                    Media.initial_metadata["filename"].as_string().ilike(f"%{search}%"),
-                )
+        video_query = video_query.where(
+            _seek_after(
+                (VideoDetection.created_at, VideoDetection.id),
+                video_after,
+                direction,
             )
         )
+    else:
+        offset = (page - 1) * page_size
+        query = query.offset(offset)
+        video_query = video_query.offset(offset)
 
-    count_result = await db.execute(count_query)
-    count_video_result = await db.execute(count_video_query)
-    total = count_result.scalar_one()
-    total_video_detections = count_video_result.scalar_one()
-
-    query = query.offset(offset).limit(page_size)
-    video_query = video_query.offset(offset).limit(page_size)
+    query = query.limit(page_size)
+    video_query = video_query.limit(page_size)
 
     result = await db.execute(query)
     video_result = await db.execute(video_query)
 
-    records = result.scalars().all()
-    video_detections = video_result.scalars().all()
-
-    return {
-        "total": total + total_video_detections,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": (total + total_video_detections + page_size - 1) // page_size,
-        "image_items": [
-            {
-                "id": str(media.id),
-                "uploader_id": str(media.uploader_id),
-                "status": (
-                    media.status.value
-                    if hasattr(media.status, "value")
-                    else media.status
-                ),
-                "hf_path": media.hf_path,
-                "initial_metadata": media.initial_metadata,
-                "technical_metadata": media.technical_metadata,
-                "assigned_worker": media.assigned_worker,
-                "created_at": media.created_at.isoformat(),
-                "updated_at": media.updated_at.isoformat(),
-                "lat": media.lat,
-                "lng": media.lng,
-                "altitude": media.altitude,
-                "address": media.address,
-                "has_trash": media.has_trash,
-                "confidence": media.confidence,
-                "failed_reason": media.failed_reason,
-            }
-            for media in records
-        ],
-        "video_items": [
-            {
-                "id": str(video_det.id),
-                "media_id": str(video_det.media_id),
-                "lat": video_det.lat,
-                "lng": video_det.lng,
-                "altitude": video_det.altitude,
-                "address": video_det.address,
-                "label": video_det.label,
-                "confidence": video_det.confidence,
-                "bbox": video_det.bbox,
-                "timestamp_in_video": video_det.timestamp_in_video,
-                "frame_hf_path": video_det.frame_hf_path,
-                "created_at": video_det.created_at.isoformat(),
-                "area_sqm": video_det.area_sqm,
-            }
-            for video_det in video_detections
-        ],
-    }
+    # Row mappings are keyed by column name, i.e. the item field names
+    image_items = [
+        _json_fragments(row, VAULT_ITEM_JSON_KEYS) for row in result.mappings()
+    ]
+    video_items = [
+        _json_fragments(row, VIDEO_ITEM_JSON_KEYS) for row in video_result.mappings()
+    ]
+    next_cursor = (
+        _encode_cursor(
+            _last_position(image_items, page_size),
+            _last_position(video_items, page_size),
+        )
+        if keyset
+        else None
+    )
+
+    # Returned as a response so the rows skip the VaultResponse validation
+    # round trip; orjson writes the UUIDs, datetimes and enums directly
+    # (response_model still documents the shape)
+    return ORJSONResponse(
+        content={
+            "total": total + total_video_detections,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + total_video_detections + page_size - 1)
+            // page_size,
+            "image_items": image_items,
+            "video_items": video_items,
+            "next_cursor": next_cursor,
+        }
+    )
 
 
 @router.delete("/vault/all", status_code=status.HTTP_200_OK)
@@ -211,38 +311,45 @@ async def delete_all_media(
     Delete all media items from the user's vault, including images from HF dataset.
     """
 
-    query = select(Media).where(Media.uploader_id == current_user.id)
-    result = await db.execute(query)
-    media_items = result.scalars().all()
-
-    if not media_items:
-        return JSONResponse(
-            content={"detail": "No media found to delete", "deleted_count": 0}
-        )
-
-    deleted_count = 0
-    media_ids = [media.id for media in media_items]
-
+    # Other media may still name these as their original; unlink them first
     await db.execute(
         update(Media)
-        .where(Media.original_media_id.in_(media_ids))
+        .where(
+            Media.original_media_id.in_(
+                select(Media.id).where(Media.uploader_id == current_user.id)
+            )
+        )
         .values(original_media_id=None)
     )
-    logger.info(f"Set original_media_id=None for media_ids: {media_ids}")
-
-    for media in media_items:
-        # Delete from HF dataset if hf_path exists
-        if media.hf_path:
-            logger.info(f"Deleting from HF: hf_path={media.hf_path}, id={media.id}")
-            await delete_from_hf(media.hf_path, media.id)
+    # One DELETE for the whole vault; detections, video detections and logs
+    # go with it through their ON DELETE CASCADE foreign keys
+    result = await db.execute(
+        delete(Media)
+        .where(Media.uploader_id == current_user.id)
+        .returning(Media.id, Media.hf_path)
+    )
+    deleted = result.all()
 
-        await db.delete(media)
-        deleted_count += 1
-        logger.info(f"Deleted media id={media.id}")
+    if not deleted:
+        await db.rollback()
+        return ORJSONResponse(
+            content={"detail": "No media found to delete", "deleted_count": 0}
+        )
 
     await db.commit()
-
-    return JSONResponse(
+    await invalidate_user_stats(str(current_user.id))
+    deleted_count = len(deleted)
+    logger.info(f"Deleted {deleted_count} media for user {current_user.id}")
+
+    # Remove the files from the HF dataset once the rows are gone, so
+    # delete_from_hf's reference check no longer counts this user's media.
+    # Duplicates share a path; delete each path once.
+    hf_paths = {row.hf_path: row.id for row in deleted if row.hf_path}
+    for hf_path, media_id in hf_paths.items():
+        logger.info(f"Deleting from HF: hf_path={hf_path}, id={media_id}")
+        await delete_from_hf(hf_path, media_id)
+
+    return ORJSONResponse(
         content={
             "detail": "All media deleted successfully",
             "deleted_count": deleted_count,
@@ -338,9 +445,10 @@ async def delete_media(
     await db.delete(media)
     logger.info(f"Deleted media id={media.id}")
     await db.commit()
+    await invalidate_user_stats(str(current_user.id))
 
     detail_msg = "Media deleted successfully"
     if temp_file_status:
         detail_msg += f"; {temp_file_status}"
     logger.info(detail_msg)
-    return JSONResponse(content={"detail": detail_msg})
+    return ORJSONResponse(content={"detail": detail_msg})
@@ -1,6 +1,6 @@
 import os
+import time
 import bcrypt  # Use this directly
-from datetime import datetime, timedelta, timezone
 from jose import jwt
 
 # No more pwd_context!
@@ -29,11 +29,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+# HMAC key bytes, encoded once instead of on every token mint
+_SIGNING_KEY = SECRET_KEY.encode("utf-8")
+
+
 def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY or "", algorithm=ALGORITHM or "")
+    # exp as epoch seconds, which is what jwt.encode turns a datetime into
+    expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return jwt.encode({**data, "exp": expire}, _SIGNING_KEY, algorithm=ALGORITHM)
 
 
 def get_access_token_expiry_seconds() -> int:
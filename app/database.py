@@ -8,18 +8,66 @@ load_dotenv()
 
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica for the stats endpoints; falls back to the primary
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# SQL statement logging is opt-in (SQL_ECHO=1) for local debugging only
+SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
+# Recycle connections before managed Postgres / proxies drop idle ones
+DB_POOL_RECYCLE_SECONDS = 1800
+# Connections per app worker (pool + overflow); with N workers the database
+# sees up to N times this, so size it against the server's connection limit
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Behind PgBouncer in transaction mode a connection can land on a different
+# server per transaction, so prepared statements must not be cached
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "0") == "1"
+STATEMENT_CACHE_SIZE = 0 if DB_PGBOUNCER else 512
 
 engine = create_async_engine(
     DATABASE_URL or "",
-    echo=False,
+    echo=SQL_ECHO,
     pool_pre_ping=True,  # verify connections are alive before using them
-    pool_size=20,
-    max_overflow=10,  # allow up to 10 additional connections beyond the pool_size when needed
+    pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,  # additional connections beyond the pool_size when needed
+    # SQLAlchemy compiled-statement LRU (default 500); the stats KPIs, fun facts,
+    # vault and map queries together exceed the default, so keep them all compiled
+    query_cache_size=1200,
+    connect_args={
+        # keep the parsed/planned KPI aggregation statements prepared per connection
+        "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+    },
 )
 AsyncSessionLocal = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Read-only engine for the stats KPIs (pure SELECT aggregations). With a
+# replica configured they stop competing with upload writes on the primary;
+# without one it shares the primary's pool. Either way every transaction is
+# READ ONLY with a single REPEATABLE READ snapshot.
+read_only_engine = (
+    create_async_engine(
+        DATABASE_REPLICA_URL,
+        echo=SQL_ECHO,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_size=10,
+        max_overflow=10,
+        query_cache_size=1200,
+        connect_args={
+            "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+            "statement_cache_size": STATEMENT_CACHE_SIZE,
+        },
+    )
+    if DATABASE_REPLICA_URL
+    else engine
+).execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+AsyncSessionLocalRO = async_sessionmaker(
+    bind=read_only_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -31,3 +79,12 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+async def get_db_ro():
+    """Read-only session for the stats endpoints (replica when configured)."""
+    async with AsyncSessionLocalRO() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,11 +1,19 @@
 import uuid
-from sqlalchemy import String, ForeignKey, JSON, Float, Boolean
+from sqlalchemy import String, ForeignKey, JSON, Float, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
 
 class Detection(Base):
     __tablename__ = "detections"
+    __table_args__ = (
+        # Covering index for the per-user label/area KPIs (index-only scans)
+        Index(
+            "ix_detections_media_id",
+            "media_id",
+            postgresql_include=["label", "area_sqm"],
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     media_id: Mapped[uuid.UUID] = mapped_column(
@@ -1,9 +1,9 @@
-from sqlalchemy import String, ForeignKey, JSON, DateTime, Enum, Index, Boolean, Float
+from sqlalchemy import String, ForeignKey, JSON, DateTime, Enum, Index, Boolean, Float, FetchedValue, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from geoalchemy2 import Geometry, WKBElement
 from geoalchemy2.shape import to_shape
-from datetime import datetime, timezone
+from datetime import datetime
 import uuid
 from app.database import Base
 from app.models.upload.MediaStatus import MediaStatus
@@ -19,8 +19,70 @@ class MediaType(PyEnum):
 
 class Media(Base):
     __tablename__ = "media"
+    # Read the database-stamped timestamps and trigger-set location back
+    # with RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         Index("ix_media_location_gist", "location", postgresql_using="gist"),
+        # Supports the hotspot KPI filter (uploader_id = ? AND confidence >= ?)
+        Index(
+            "ix_media_uploader_confidence_located",
+            "uploader_id",
+            "confidence",
+            postgresql_where=text("location IS NOT NULL"),
+        ),
+        # Index-only lookup for the northernmost-find fun fact
+        Index(
+            "ix_media_uploader_lat_desc",
+            "uploader_id",
+            text("lat DESC"),
+            postgresql_where=text("lat IS NOT NULL"),
+        ),
+        # Covers the most-active-worker fun fact (GROUP BY assigned_worker)
+        Index(
+            "ix_media_uploader_worker",
+            "uploader_id",
+            "assigned_worker",
+            postgresql_where=text("assigned_worker IS NOT NULL"),
+        ),
+        # Temporal trends KPI (uploader_id = ? AND has_trash AND created_at >= ?)
+        Index(
+            "ix_media_uploader_created_trash",
+            "uploader_id",
+            text("created_at DESC"),
+            postgresql_where=text("has_trash"),
+        ),
+        # MTTP KPI (uploader_id = ? AND status = 'READY')
+        Index(
+            "ix_media_uploader_ready",
+            "uploader_id",
+            postgresql_where=text("status = 'READY'"),
+        ),
+        # Default vault page (uploader_id = ? ORDER BY created_at DESC LIMIT n)
+        Index(
+            "ix_media_uploader_created_desc",
+            "uploader_id",
+            text("created_at DESC"),
+        ),
+        # Vault page filtered by status, same default ordering
+        Index(
+            "ix_media_uploader_status_created",
+            "uploader_id",
+            "status",
+            text("created_at DESC"),
+        ),
+        # Vault filename search (ILIKE '%term%'); needs the pg_trgm extension
+        Index(
+            "ix_media_filename_trgm",
+            text("(initial_metadata ->> 'filename') gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        # Content-hash lookup that skips re-uploading identical files to HF
+        Index(
+            "ix_media_content_sha256",
+            "content_sha256",
+            postgresql_where=text("content_sha256 IS NOT NULL"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -32,6 +94,8 @@ class Media(Base):
         Enum(MediaStatus), default=MediaStatus.PENDING
     )
     hf_path: Mapped[str] = mapped_column(String, nullable=True)
+    # Hex SHA-256 of the uploaded original (images only)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     media_type: Mapped[MediaType] = mapped_column(
         Enum(MediaType), nullable=False, default=MediaType.IMAGE
@@ -48,19 +112,26 @@ class Media(Base):
         String, ForeignKey("ai_worker_states.name"), nullable=True
     )
 
+    # Stamped by Postgres. clock_timestamp() rather than now(): rows inserted
+    # by one upload batch keep distinct, ordered times for the vault paging
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),  # Add (timezone=True)
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.clock_timestamp(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),  # Add (timezone=True)
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.clock_timestamp(),
+        onupdate=func.clock_timestamp(),
     )
     lat: Mapped[float | None] = mapped_column(nullable=True)
     lng: Mapped[float | None] = mapped_column(nullable=True)
+    # Derived from lat/lng by the media_sync_location trigger; never set it
+    # from app code
     location: Mapped[WKBElement | None] = mapped_column(
-        Geometry(geometry_type="POINT", srid=4326), nullable=True
+        Geometry(geometry_type="POINT", srid=4326),
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
     )
     altitude: Mapped[float | None] = mapped_column(nullable=True)
     address: Mapped[str | None] = mapped_column(String, nullable=True)
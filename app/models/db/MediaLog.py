@@ -1,12 +1,21 @@
-from sqlalchemy import String, ForeignKey, DateTime, Text
+from sqlalchemy import String, ForeignKey, DateTime, Text, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
-from datetime import datetime, timezone
+from datetime import datetime
 import uuid
 from app.database import Base
 
 
 class MediaLog(Base):
     __tablename__ = "media_task_logs"
+    __table_args__ = (
+        # MTTP KPI: per (media_id, worker_name) MIN/MAX(timestamp) from the index
+        Index(
+            "ix_media_task_logs_media_worker",
+            "media_id",
+            "worker_name",
+            postgresql_include=["timestamp"],
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     media_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("media.id", ondelete="CASCADE"), nullable=False)
@@ -17,6 +26,7 @@ class MediaLog(Base):
         Text, nullable=False
     )  # e.g., "Helios started extraction"
 
+    # Per-row clock so several status changes in one transaction stay ordered
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.clock_timestamp()
     )
@@ -1,15 +1,17 @@
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import String, Integer
 from sqlalchemy.dialects.postgresql import UUID
-from nanoid import generate
 from app.database import Base
 import uuid
+import secrets
 
 class User(Base):
     __tablename__ = "users"
 
+    # 15 random bytes -> 20 URL-safe base64 chars: same length, alphabet
+    # (A-Za-z0-9_-) and 120 bits of entropy as the old nanoid(size=20)
     id: Mapped[str] = mapped_column(
-        String(20), primary_key=True, default=lambda: generate(size=20)
+        String(20), primary_key=True, default=lambda: secrets.token_urlsafe(15)
     )
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class UserMediaStats(Base):
+    """Per-uploader media counters, maintained by a trigger on `media`.
+
+    Rows are written only by the user_media_stats_apply() trigger
+    (see migration 5e2a9c4d1b80); application code should only read them.
+    """
+
+    __tablename__ = "user_media_stats"
+
+    uploader_id: Mapped[str] = mapped_column(
+        String(20), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ready: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
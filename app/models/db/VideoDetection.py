@@ -8,7 +8,15 @@ from app.database import Base
 
 class VideoDetection(Base):
     __tablename__ = "video_detections"
-    __table_args__ = (Index("ix_video_loc_gist", "location", postgresql_using="gist"),)
+    __table_args__ = (
+        Index("ix_video_loc_gist", "location", postgresql_using="gist"),
+        # Covering index for the per-user label/area KPIs (index-only scans)
+        Index(
+            "ix_video_detections_media_id",
+            "media_id",
+            postgresql_include=["label", "area_sqm"],
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
 
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from app.models.upload.MediaStatus import MediaStatus
 
 
 class DetectionInput(BaseModel):
@@ -21,7 +22,7 @@ class DetectionResponse(BaseModel):
 class MediaResponse(BaseModel):
     id: str
     uploader_id: str
-    status: str
+    status: MediaStatus
     hf_path: Optional[str] = None
     initial_metadata: Optional[dict] = None
     technical_metadata: Optional[dict] = None
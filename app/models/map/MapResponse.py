@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from app.models.upload.MediaStatus import MediaStatus
 
 
 class MapMediaLog(BaseModel):
@@ -20,7 +21,7 @@ class MapDetection(BaseModel):
 class MapItem(BaseModel):
     id: str
     filename: Optional[str] = None
-    status: str
+    status: MediaStatus
     worker_name: Optional[str] = None
     lat: float
     lng: float
@@ -1,7 +1,9 @@
 import enum
 
 
-class MediaStatus(enum.Enum):
+# str mixin: members are the status strings themselves, so they compare equal
+# to plain strings and encode as their value with no Enum special-casing
+class MediaStatus(str, enum.Enum):
     PENDING = "PENDING"  
     UPLOADED = "UPLOADED"  
     EXTRACTING = "EXTRACTING"  
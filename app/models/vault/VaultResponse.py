@@ -1,10 +1,11 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from app.models.upload.MediaStatus import MediaStatus
 
 class VaultItem(BaseModel):
     id: str
     uploader_id: str
-    status: str
+    status: MediaStatus
     hf_path: Optional[str] = None
     initial_metadata: Optional[Dict[str, Any]] = None
     technical_metadata: Optional[Dict[str, Any]] = None
@@ -43,3 +44,5 @@ class VaultResponse(BaseModel):
     total_pages: int
     image_items: List[VaultItem]
     video_items: List[VideoDetectionItem]
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -5,6 +5,7 @@ load_dotenv()
 from contextlib import asynccontextmanager
 import asyncio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api import auth
 from app.api import system
 from app.api import dashboard
@@ -14,17 +15,30 @@ from app.api import map
 from app.api import stats
 from app.api import lab
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.api.dashboard_utils.ux import track_ux_metrics
 from app.api.dashboard_utils.utils.init_workers import initialize_worker_fleet
 from app.api.auth import prune_expired_blacklisted_tokens
+from app.api.stats_utils.kpi_hotspot_density import (
+    detect_postgis,
+    refresh_hotspot_grid,
+)
 from app.database import AsyncSessionLocal
+import logging
 import os
 
 # Video temp cleaner import
 from app.api.upload_utils.video_temp_cleaner import cleanup_old_video_temp_dirs
+from app.api.upload_utils.hf_upload import hf_upload_batcher
+from app.api.upload_utils.conn_manager import manager
+from app.api.upload_utils.metadata_extractor import close_geocoder_client
+from app.api.dashboard_utils.utils.hf_metadata import drain_address_lookups
 
 
 BLACKLIST_PRUNE_INTERVAL_SECONDS = 3600
+HOTSPOT_GRID_REFRESH_INTERVAL_SECONDS = 300
+
+logger = logging.getLogger(__name__)
 
 
 async def _blacklist_pruner() -> None:
@@ -35,6 +49,17 @@ async def _blacklist_pruner() -> None:
             await session.commit()
 
 
+async def _hotspot_grid_refresher() -> None:
+    while True:
+        await asyncio.sleep(HOTSPOT_GRID_REFRESH_INTERVAL_SECONDS)
+        try:
+            async with AsyncSessionLocal() as session:
+                await refresh_hotspot_grid(session)
+                await session.commit()
+        except Exception as e:
+            logger.warning("Hotspot grid refresh failed: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     asyncio.create_task(initialize_worker_fleet())
@@ -42,8 +67,11 @@ async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as session:
         await prune_expired_blacklisted_tokens(session)
         await session.commit()
+        if not await detect_postgis(session):
+            logger.warning("PostGIS not installed; hotspot KPI uses raw counts")
 
     prune_task = asyncio.create_task(_blacklist_pruner())
+    hotspot_grid_task = asyncio.create_task(_hotspot_grid_refresher())
 
     async def periodic_cleanup():
         while True:
@@ -51,24 +79,45 @@ async def lifespan(app: FastAPI):
             await asyncio.sleep(24 * 3600)  # 24 óra
 
     video_cleanup_task = asyncio.create_task(periodic_cleanup())
+    hf_batcher_task = asyncio.create_task(hf_upload_batcher())
+    ws_pubsub_task = asyncio.create_task(manager.run_pubsub_listener())
 
     try:
         yield
     finally:
         prune_task.cancel()
+        hotspot_grid_task.cancel()
         video_cleanup_task.cancel()
+        hf_batcher_task.cancel()
+        ws_pubsub_task.cancel()
         try:
             await prune_task
         except asyncio.CancelledError:
             pass
+        try:
+            await hotspot_grid_task
+        except asyncio.CancelledError:
+            pass
         try:
             await video_cleanup_task
         except asyncio.CancelledError:
             pass
+        try:
+            await hf_batcher_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await ws_pubsub_task
+        except asyncio.CancelledError:
+            pass
+        # Pending reverse-geocodes need the geocoder client; finish them first
+        await drain_address_lookups()
+        await close_geocoder_client()
 
 
 app = FastAPI(
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title="Hyperion AI Backend",
     description="""
     API for the Hyperion platform. 
@@ -90,10 +139,15 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[FRONTEND_URL, "http://127.0.0.1:5173", "http://localhost:5173"],
     allow_credentials=True,
-    allow_methods=["*"],
+    # Exactly the methods the routers expose
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type"],
 )
 
+# Map, vault and stats JSON compresses several-fold; level 4 keeps the CPU
+# cost low, and bodies under 1KB are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 @app.middleware("http")
 async def middleware(request, call_next):
     return await track_ux_metrics(request, call_next)
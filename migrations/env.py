@@ -43,6 +43,7 @@ from app.models.db.AIWorker import AIWorkerState
 from app.models.db.MediaLog import MediaLog
 from app.models.db.Detection import Detection
 from app.models.db.VideoDetection import VideoDetection
+from app.models.db.UserMediaStats import UserMediaStats
 
 target_metadata = Base.metadata
 
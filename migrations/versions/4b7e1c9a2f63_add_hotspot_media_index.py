@@ -0,0 +1,42 @@
+"""add_hotspot_media_index
+
+Revision ID: 4b7e1c9a2f63
+Revises: 29cd64845037
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e1c9a2f63'
+down_revision: Union[str, Sequence[str], None] = '29cd64845037'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_media_uploader_confidence_located',
+            'media',
+            ['uploader_id', 'confidence'],
+            unique=False,
+            postgresql_where=sa.text('location IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_media_uploader_confidence_located',
+            table_name='media',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,76 @@
+"""add_user_media_stats
+
+Revision ID: 5e2a9c4d1b80
+Revises: 8d3f5a0c7e21
+Create Date: 2026-10-15 11:24:06.512947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c4d1b80'
+down_revision: Union[str, Sequence[str], None] = '8d3f5a0c7e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_media_stats',
+    sa.Column('uploader_id', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('ready', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['uploader_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('uploader_id')
+    )
+    # Keep total/ready in step with every media insert, delete and
+    # status/uploader change: remove the old row's contribution, add the new one
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION user_media_stats_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE user_media_stats
+                SET total = total - 1,
+                    ready = ready - (OLD.status = 'READY')::int
+                WHERE uploader_id = OLD.uploader_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO user_media_stats (uploader_id, total, ready)
+                VALUES (NEW.uploader_id, 1, (NEW.status = 'READY')::int)
+                ON CONFLICT (uploader_id) DO UPDATE
+                SET total = user_media_stats.total + 1,
+                    ready = user_media_stats.ready + EXCLUDED.ready;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER media_user_media_stats
+        AFTER INSERT OR DELETE OR UPDATE OF status, uploader_id ON media
+        FOR EACH ROW EXECUTE FUNCTION user_media_stats_apply()
+        """
+    )
+    # Backfill counters for existing media
+    op.execute(
+        """
+        INSERT INTO user_media_stats (uploader_id, total, ready)
+        SELECT uploader_id, COUNT(*), COUNT(*) FILTER (WHERE status = 'READY')
+        FROM media
+        GROUP BY uploader_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS media_user_media_stats ON media")
+    op.execute("DROP FUNCTION IF EXISTS user_media_stats_apply()")
+    op.drop_table('user_media_stats')
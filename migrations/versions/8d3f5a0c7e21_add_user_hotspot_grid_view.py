@@ -0,0 +1,55 @@
+"""add_user_hotspot_grid_view
+
+Revision ID: 8d3f5a0c7e21
+Revises: 4b7e1c9a2f63
+Create Date: 2026-10-15 10:02:17.904311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f5a0c7e21'
+down_revision: Union[str, Sequence[str], None] = '4b7e1c9a2f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Threshold (80) and grid size (0.001) must match kpi_hotspot_density.py
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW user_hotspot_grid AS
+        SELECT pts.uploader_id,
+               ST_SnapToGrid(pts.geom, 0.001) AS cell,
+               COUNT(*) AS n
+        FROM (
+            SELECT m.uploader_id, m.location AS geom
+            FROM media m
+            WHERE m.confidence >= 80 AND m.location IS NOT NULL
+            UNION ALL
+            SELECT m.uploader_id, v.location AS geom
+            FROM video_detections v
+            JOIN media m ON v.media_id = m.id
+            WHERE v.confidence >= 80 AND v.location IS NOT NULL
+        ) AS pts
+        GROUP BY pts.uploader_id, cell
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'ux_user_hotspot_grid_uploader_cell',
+        'user_hotspot_grid',
+        ['uploader_id', 'cell'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_user_hotspot_grid_uploader_cell', table_name='user_hotspot_grid')
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_hotspot_grid")
@@ -0,0 +1,38 @@
+"""stamp_timestamps_server_side
+
+Revision ID: a4d9e2c6f813
+Revises: f1a7c9e3b254
+Create Date: 2026-10-16 00:41:17.532904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2c6f813'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c9e3b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'media', 'created_at', server_default=sa.text('clock_timestamp()')
+    )
+    op.alter_column(
+        'media', 'updated_at', server_default=sa.text('clock_timestamp()')
+    )
+    op.alter_column(
+        'media_task_logs', 'timestamp', server_default=sa.text('clock_timestamp()')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('media_task_logs', 'timestamp', server_default=None)
+    op.alter_column('media', 'updated_at', server_default=None)
+    op.alter_column('media', 'created_at', server_default=None)
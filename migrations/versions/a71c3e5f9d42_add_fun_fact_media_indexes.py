@@ -0,0 +1,55 @@
+"""add_fun_fact_media_indexes
+
+Revision ID: a71c3e5f9d42
+Revises: 5e2a9c4d1b80
+Create Date: 2026-10-15 11:51:33.207815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71c3e5f9d42'
+down_revision: Union[str, Sequence[str], None] = '5e2a9c4d1b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_media_uploader_lat_desc',
+            'media',
+            ['uploader_id', sa.text('lat DESC')],
+            unique=False,
+            postgresql_where=sa.text('lat IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_uploader_worker',
+            'media',
+            ['uploader_id', 'assigned_worker'],
+            unique=False,
+            postgresql_where=sa.text('assigned_worker IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_media_uploader_worker',
+            table_name='media',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_media_uploader_lat_desc',
+            table_name='media',
+            postgresql_concurrently=True,
+        )
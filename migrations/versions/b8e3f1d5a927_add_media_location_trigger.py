@@ -0,0 +1,59 @@
+"""add_media_location_trigger
+
+Revision ID: b8e3f1d5a927
+Revises: a4d9e2c6f813
+Create Date: 2026-10-16 01:12:03.948152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f1d5a927'
+down_revision: Union[str, Sequence[str], None] = 'a4d9e2c6f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A trigger rather than a generated column: location already backs the
+    # GiST index, the located partial index and the user_hotspot_grid view,
+    # which a drop-and-re-add of the column would all take with it
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION media_sync_location() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.lat IS NULL OR NEW.lng IS NULL THEN
+                NEW.location := NULL;
+            ELSE
+                NEW.location := ST_SetSRID(ST_MakePoint(NEW.lng, NEW.lat), 4326);
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER media_sync_location
+        BEFORE INSERT OR UPDATE OF lat, lng ON media
+        FOR EACH ROW EXECUTE FUNCTION media_sync_location()
+        """
+    )
+    # Rows written before the trigger with coordinates but no geometry
+    op.execute(
+        """
+        UPDATE media
+        SET location = ST_SetSRID(ST_MakePoint(lng, lat), 4326)
+        WHERE location IS NULL AND lat IS NOT NULL AND lng IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS media_sync_location ON media')
+    op.execute('DROP FUNCTION IF EXISTS media_sync_location()')
@@ -0,0 +1,81 @@
+"""add_kpi_indexes
+
+Revision ID: c3f8b2d6e915
+Revises: a71c3e5f9d42
+Create Date: 2026-10-15 13:08:52.640118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8b2d6e915'
+down_revision: Union[str, Sequence[str], None] = 'a71c3e5f9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_media_uploader_created_trash',
+            'media',
+            ['uploader_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text('has_trash'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_uploader_ready',
+            'media',
+            ['uploader_id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'READY'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_detections_media_id',
+            'detections',
+            ['media_id'],
+            unique=False,
+            postgresql_include=['label', 'area_sqm'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_video_detections_media_id',
+            'video_detections',
+            ['media_id'],
+            unique=False,
+            postgresql_include=['label', 'area_sqm'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_task_logs_media_worker',
+            'media_task_logs',
+            ['media_id', 'worker_name'],
+            unique=False,
+            postgresql_include=['timestamp'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_media_task_logs_media_worker', 'media_task_logs'),
+            ('ix_video_detections_media_id', 'video_detections'),
+            ('ix_detections_media_id', 'detections'),
+            ('ix_media_uploader_ready', 'media'),
+            ('ix_media_uploader_created_trash', 'media'),
+        ):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+            )
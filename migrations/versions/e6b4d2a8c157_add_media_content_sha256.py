@@ -0,0 +1,46 @@
+"""add_media_content_sha256
+
+Revision ID: e6b4d2a8c157
+Revises: c3f8b2d6e915
+Create Date: 2026-10-15 23:24:10.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b4d2a8c157'
+down_revision: Union[str, Sequence[str], None] = 'c3f8b2d6e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'media', sa.Column('content_sha256', sa.String(length=64), nullable=True)
+    )
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_media_content_sha256',
+            'media',
+            ['content_sha256'],
+            unique=False,
+            postgresql_where=sa.text('content_sha256 IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_media_content_sha256',
+            table_name='media',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('media', 'content_sha256')
@@ -0,0 +1,62 @@
+"""add_vault_media_indexes
+
+Revision ID: f1a7c9e3b254
+Revises: e6b4d2a8c157
+Create Date: 2026-10-15 23:52:41.806215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c9e3b254'
+down_revision: Union[str, Sequence[str], None] = 'e6b4d2a8c157'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_media_uploader_created_desc',
+            'media',
+            ['uploader_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_uploader_status_created',
+            'media',
+            ['uploader_id', 'status', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_filename_trgm',
+            'media',
+            [sa.text("(initial_metadata ->> 'filename') gin_trgm_ops")],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name in (
+            'ix_media_filename_trgm',
+            'ix_media_uploader_status_created',
+            'ix_media_uploader_created_desc',
+        ):
+            op.drop_index(
+                index_name,
+                table_name='media',
+                postgresql_concurrently=True,
+            )
@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+import asyncio
+from datetime import date, datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
@@ -13,6 +14,7 @@ from app.api.stats_utils.kpi_hotspot_density import get_hotspot_density
 from app.api.stats_utils.kpi_processing_time import get_mean_time_to_process
 from app.api.stats_utils.kpi_temporal_trends import get_temporal_trends
 from app.api.stats_utils.kpi_trash_composition import get_trash_composition
+from app.models.stats import HotspotDensity
 
 
 class FakeAllResult:
@@ -39,34 +41,16 @@ class FakeScalarResult:
 		return self._value
 
 
-class FakeScalarsResult:
-	def __init__(self, rows):
-		self._rows = rows
-
-	def scalars(self):
-		return self
-
-	def all(self):
-		return self._rows
-
-
 @pytest.mark.asyncio
 async def test_trash_composition_math():
 	db = AsyncMock()
-	db.execute.side_effect = [
-		FakeAllResult(
-			[
-				("plastic", 4),
-				("metal", 1),
-			]
-		),
-		FakeAllResult(
-			[
-				("plastic", 2),
-				("glass", 3),
-			]
-		),
-	]
+	db.execute.return_value = FakeAllResult(
+		[
+			("plastic", 6, 60.0),
+			("glass", 3, 30.0),
+			("metal", 1, 10.0),
+		]
+	)
 
 	result = await get_trash_composition(db, "user-1")
 
@@ -92,20 +76,23 @@ async def test_environmental_footprint_math():
 @pytest.mark.asyncio
 async def test_ai_fleet_efficiency_math():
 	db = AsyncMock()
-	db.execute.side_effect = [
-		FakeAllResult(
-			[
-				SimpleNamespace(assigned_worker="Helios", successes=3, failures=1),
-				SimpleNamespace(assigned_worker="Eos", successes=0, failures=0),
-			]
+	fleet_rows = {
+		"Helios": SimpleNamespace(
+			name="Helios", successes=3, failures=1, tasks_today=7, reliability_score=0.75
 		),
-		FakeScalarsResult(
-			[
-				SimpleNamespace(name="Helios", tasks_processed_today=7),
-				SimpleNamespace(name="Eos", tasks_processed_today=2),
-			]
+		"Eos": SimpleNamespace(
+			name="Eos", successes=0, failures=0, tasks_today=2, reliability_score=1.0
 		),
-	]
+	}
+	db.execute.return_value = FakeAllResult(
+		[
+			fleet_rows.get(name)
+			or SimpleNamespace(
+				name=name, successes=0, failures=0, tasks_today=0, reliability_score=1.0
+			)
+			for name in TITAN_FLEET
+		]
+	)
 
 	result = await get_ai_fleet_efficiency(db, "user-1")
 	workers_by_name = {worker.name: worker for worker in result.workers}
@@ -127,15 +114,19 @@ async def test_ai_fleet_efficiency_math():
 @pytest.mark.asyncio
 async def test_mean_time_to_process_math():
 	db = AsyncMock()
-	db.execute.side_effect = [
-		FakeAllResult(
-			[
-				SimpleNamespace(worker_name="Helios", avg_seconds=12.3456, task_count=3),
-				SimpleNamespace(worker_name="Eos", avg_seconds=8.0, task_count=1),
-			]
-		),
-		FakeScalarResult(10.556),
-	]
+	db.execute.return_value = FakeAllResult(
+		[
+			SimpleNamespace(
+				worker_name="Helios", avg_seconds=12.3456, task_count=3, overall_avg=10.556
+			),
+			SimpleNamespace(
+				worker_name="Eos", avg_seconds=8.0, task_count=1, overall_avg=10.556
+			),
+			SimpleNamespace(
+				worker_name=None, avg_seconds=2.0, task_count=4, overall_avg=10.556
+			),
+		]
+	)
 
 	result = await get_mean_time_to_process(db, "user-1")
 	workers_by_name = {worker.worker_name: worker for worker in result.by_worker}
@@ -151,10 +142,12 @@ async def test_mean_time_to_process_math():
 @pytest.mark.asyncio
 async def test_temporal_trends_zero_fill_math():
 	db = AsyncMock()
+	# generate_series LEFT JOIN returns every day, zero-days included
 	db.execute.return_value = FakeAllResult(
 		[
-			(datetime(2026, 6, 3, tzinfo=timezone.utc), 2),
-			(datetime(2026, 6, 5, tzinfo=timezone.utc), 5),
+			SimpleNamespace(day=date(2026, 6, 3), count=2),
+			SimpleNamespace(day=date(2026, 6, 4), count=0),
+			SimpleNamespace(day=date(2026, 6, 5), count=5),
 		]
 	)
 
@@ -174,14 +167,127 @@ async def test_temporal_trends_zero_fill_math():
 
 @pytest.mark.asyncio
 async def test_hotspot_density_fallback_math():
+	from app.api.stats_utils import kpi_hotspot_density
+
 	db = AsyncMock()
-	db.execute.side_effect = [
-		FakeScalarResult(2),
-		FakeScalarResult(3),
-		Exception("PostGIS unavailable"),
-	]
+	db.execute.return_value = FakeScalarResult(5)
 
-	result = await get_hotspot_density(db, "user-1")
+	with patch.object(kpi_hotspot_density, "HAS_POSTGIS", False):
+		result = await get_hotspot_density(db, "user-1")
 
 	assert result.high_confidence_media_count == 5
 	assert result.hotspot_count == 5
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_served_while_single_refresh_runs():
+	from cachetools import TTLCache
+	from app.api.stats_utils import cache
+
+	clock = [1000.0]
+	fake_cache = TTLCache(
+		maxsize=10,
+		ttl=cache.STATS_CACHE_TTL_SECONDS + cache.STATS_CACHE_STALE_GRACE_SECONDS,
+		timer=lambda: clock[0],
+	)
+	refresh = AsyncMock()
+
+	with patch.object(cache, "_redis", None), patch.object(
+		cache, "_stats_cache", fake_cache
+	):
+		await cache.cache_stats("user-1", 7, b"{}", generation=0)
+
+		clock[0] += cache.STATS_CACHE_TTL_SECONDS + 1
+		assert await cache.get_cached_stats("user-1", 7, generation=0, refresh=refresh) == b"{}"
+		assert await cache.get_cached_stats("user-1", 7, generation=0, refresh=refresh) == b"{}"
+
+		await asyncio.sleep(0)
+		assert refresh.await_count == 1
+
+		clock[0] += cache.STATS_CACHE_STALE_GRACE_SECONDS
+		assert await cache.get_cached_stats("user-1", 7, generation=0, refresh=refresh) is None
+
+
+@pytest.mark.asyncio
+async def test_hotspot_density_single_query():
+	db = AsyncMock()
+	db.execute.return_value = FakeOneResult(
+		SimpleNamespace(point_count=5, hotspot_count=2)
+	)
+
+	result = await get_hotspot_density(db, "user-1")
+
+	assert db.execute.await_count == 1
+	assert result.high_confidence_media_count == 5
+	assert result.hotspot_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_kpi_misses_share_one_build():
+	from app.api import stats
+
+	async def build():
+		await asyncio.sleep(0.01)
+		return HotspotDensity(hotspot_count=2, high_confidence_media_count=5)
+
+	build_mock = AsyncMock(side_effect=build)
+
+	with patch.object(stats, "get_cached_kpi", AsyncMock(return_value=None)), patch.object(
+		stats, "cache_kpi", AsyncMock()
+	) as cache_kpi:
+		results = await asyncio.gather(
+			*(stats._cached_kpi_response("hotspot", "user-1", build_mock) for _ in range(3))
+		)
+
+	assert build_mock.await_count == 1
+	assert cache_kpi.await_count == 1
+	assert all(result.hotspot_count == 2 for result in results)
+	assert stats._inflight_kpis == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_first_caller_does_not_cancel_shared_build():
+	from app.api import stats
+
+	release = asyncio.Event()
+
+	async def build():
+		await release.wait()
+		return HotspotDensity(hotspot_count=1, high_confidence_media_count=1)
+
+	with patch.object(stats, "get_cached_kpi", AsyncMock(return_value=None)), patch.object(
+		stats, "cache_kpi", AsyncMock()
+	):
+		first = asyncio.create_task(stats._cached_kpi_response("hotspot", "user-1", build))
+		second = asyncio.create_task(stats._cached_kpi_response("hotspot", "user-1", build))
+		await asyncio.sleep(0)
+
+		first.cancel()
+		await asyncio.sleep(0)
+		release.set()
+
+		result = await second
+
+	assert first.cancelled()
+	assert result.hotspot_count == 1
+	assert stats._inflight_kpis == {}
+
+
+@pytest.mark.asyncio
+async def test_invalidation_retires_entries_and_late_writes():
+	from cachetools import TTLCache
+	from app.api.stats_utils import cache
+
+	with patch.object(cache, "_redis", None), patch.object(
+		cache, "_stats_cache", TTLCache(maxsize=10, ttl=60)
+	), patch.object(cache, "_local_generations", {}):
+		before = await cache.stats_generation("user-1")
+		await cache.cache_stats("user-1", 7, b"old", generation=before)
+
+		await cache.invalidate_user_stats("user-1")
+		# A build that started before the upload writes after the invalidation
+		await cache.cache_stats("user-1", 7, b"late", generation=before)
+
+		after = await cache.stats_generation("user-1")
+		assert after != before
+		assert await cache.get_cached_stats("user-1", 7, generation=after) is None
@@ -5,6 +5,12 @@ from fastapi import status
 from PIL import Image
 import io
 from datetime import datetime, timezone
+from sqlalchemy import select
+from app.models.db.Media import Media, MediaType
+from app.models.db.MediaLog import MediaLog
+from app.models.upload.MediaStatus import MediaStatus
+import os
+import tempfile
 
 
 def create_test_image():
@@ -32,6 +38,100 @@ async def test_batch_upload_success(auth_client):
         assert mock_hf_upload.called
 
 
+@pytest.mark.asyncio
+async def test_batch_upload_copy_path(auth_client, db_session):
+    """Batches at or over BULK_COPY_MIN_ROWS are written with COPY."""
+    client = auth_client["client"]
+    user = auth_client["user"]
+
+    with patch("app.api.upload_utils.bulk_insert.BULK_COPY_MIN_ROWS", 1), patch(
+        "app.api.upload.process_hf_upload"
+    ):
+        files = [
+            ("files", ("copy1.jpg", create_test_image(), "image/jpeg")),
+            ("files", ("copy2.jpg", create_test_image(), "image/jpeg")),
+        ]
+        response = await client.post("api/upload/files", files=files)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    media_ids = [uuid.UUID(media_id) for media_id in response.json()["media_ids"]]
+
+    media_rows = (
+        await db_session.execute(
+            select(Media)
+            .where(Media.id.in_(media_ids))
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().all()
+    assert len(media_rows) == 2
+    for media in media_rows:
+        assert media.uploader_id == user.id
+        # Enum columns go through COPY as member names
+        assert media.status == MediaStatus.PENDING
+        # Python-side defaults are filled in for columns the rows don't set
+        assert media.media_type == MediaType.IMAGE
+        assert media.has_trash is False
+        assert media.confidence == 0.0
+        # JSON columns are sent as JSON text
+        assert media.initial_metadata["filename"] in {"copy1.jpg", "copy2.jpg"}
+        assert media.initial_metadata["width"] == 100
+        assert len(media.content_sha256) == 64
+        # Omitted columns keep their server defaults
+        assert media.created_at is not None
+        assert media.updated_at is not None
+
+    log_rows = (
+        await db_session.execute(select(MediaLog).where(MediaLog.media_id.in_(media_ids)))
+    ).scalars().all()
+    assert len(log_rows) == 2
+    assert all(log.action == "STATUS_CHANGE" for log in log_rows)
+    assert all(log.id is not None and log.timestamp is not None for log in log_rows)
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_rejects_unknown_format(auth_client):
+    client = auth_client["client"]
+
+    with patch("app.api.upload.process_hf_upload") as mock_hf_upload:
+        files = [
+            ("files", ("good.jpg", create_test_image(), "image/jpeg")),
+            ("files", ("notes.txt", b"definitely not an image", "text/plain")),
+        ]
+        response = await client.post("api/upload/files", files=files)
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    assert "notes.txt" in response.json()["detail"]
+    assert not mock_hf_upload.called
+
+
+def _temp_upload_files():
+    return {
+        name
+        for name in os.listdir(tempfile.gettempdir())
+        if name.endswith(("_content", "_thumbnail"))
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_undecodable_image_cleans_up(auth_client):
+    client = auth_client["client"]
+    before = _temp_upload_files()
+
+    with patch("app.api.upload.process_hf_upload") as mock_hf_upload:
+        files = [
+            ("files", ("good.jpg", create_test_image(), "image/jpeg")),
+            # PNG signature, but not a decodable PNG
+            ("files", ("broken.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 64, "image/png")),
+        ]
+
+        response = await client.post("api/upload/files", files=files)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "broken.png" in response.json()["detail"]
+    assert not mock_hf_upload.called
+    assert _temp_upload_files() == before
+
+
 @pytest.mark.asyncio
 async def test_video_cancel(auth_client):
     client = auth_client["client"]
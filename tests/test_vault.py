@@ -76,3 +76,48 @@ async def test_vault_isolation(auth_client: dict, db_session: AsyncSession):
     assert data["total"] == 0
     assert len(data["image_items"]) == 0
     assert len(data["video_items"]) == 0
+
+
+async def test_vault_cursor_pagination(auth_client: dict, db_session: AsyncSession):
+    """Following next_cursor walks every item once, newest first."""
+    client: AsyncClient = auth_client["client"]
+    user = auth_client["user"]
+
+    media_ids = []
+    for i in range(3):
+        media_id = uuid.uuid4()
+        media_ids.append(media_id)
+        db_session.add(
+            Media(
+                id=media_id,
+                uploader_id=user.id,
+                status=MediaStatus.READY,
+                media_type=MediaType.IMAGE,
+                created_at=datetime(2026, 1, i + 1, tzinfo=timezone.utc),
+                updated_at=datetime(2026, 1, i + 1, tzinfo=timezone.utc),
+            )
+        )
+    await db_session.commit()
+
+    first = (await client.get("/api/vault", params={"page_size": 2})).json()
+    assert [item["id"] for item in first["image_items"]] == [
+        str(media_ids[2]),
+        str(media_ids[1]),
+    ]
+    assert first["next_cursor"] is not None
+
+    second = (
+        await client.get(
+            "/api/vault", params={"page_size": 2, "cursor": first["next_cursor"]}
+        )
+    ).json()
+    assert [item["id"] for item in second["image_items"]] == [str(media_ids[0])]
+    assert second["next_cursor"] is None
+
+
+async def test_vault_invalid_cursor(auth_client: dict):
+    client: AsyncClient = auth_client["client"]
+
+    response = await client.get("/api/vault", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400